@@ -138,5 +138,24 @@ PLUGINS_CONFIG = {
         "barchart_width": int(os.environ.get("BARCHART_WIDTH", 12)),
         "barchart_height": int(os.environ.get("BARCHART_HEIGHT", 5)),
         "enabled_metrics": [x for x in os.environ.get("NAUTOBOT_DLM_ENABLED_METRICS", "").split(",") if x],
+        "metrics_cache_ttl": int(os.environ.get("NAUTOBOT_DLM_METRICS_CACHE_TTL", 0)),
+        "metrics_cache_background_refresh": is_truthy(
+            os.environ.get("NAUTOBOT_DLM_METRICS_CACHE_BACKGROUND_REFRESH", "false")
+        ),
+        "metrics_source": os.environ.get("NAUTOBOT_DLM_METRICS_SOURCE", "live"),
+        "event_driven_validation": is_truthy(os.environ.get("NAUTOBOT_DLM_EVENT_DRIVEN_VALIDATION", "false")),
+        "event_driven_validation_delay": int(os.environ.get("NAUTOBOT_DLM_EVENT_DRIVEN_VALIDATION_DELAY", 10)),
+        "event_driven_vulnerabilities": is_truthy(os.environ.get("NAUTOBOT_DLM_EVENT_DRIVEN_VULNERABILITIES", "false")),
+        "event_driven_vulnerabilities_delay": int(
+            os.environ.get("NAUTOBOT_DLM_EVENT_DRIVEN_VULNERABILITIES_DELAY", 10)
+        ),
+        "validation_shard_size": int(os.environ.get("NAUTOBOT_DLM_VALIDATION_SHARD_SIZE", 5000)),
+        "validation_max_concurrency": int(os.environ.get("NAUTOBOT_DLM_VALIDATION_MAX_CONCURRENCY", 4)),
+        "vulnerability_partition_size": int(os.environ.get("NAUTOBOT_DLM_VULNERABILITY_PARTITION_SIZE", 5000)),
+        "vulnerability_max_concurrency": int(os.environ.get("NAUTOBOT_DLM_VULNERABILITY_MAX_CONCURRENCY", 4)),
+        "compliance_snapshot_retention_days": int(
+            os.environ.get("NAUTOBOT_DLM_COMPLIANCE_SNAPSHOT_RETENTION_DAYS", 90)
+        ),
+        "compliance_projection_cache_ttl": int(os.environ.get("NAUTOBOT_DLM_COMPLIANCE_PROJECTION_CACHE_TTL", 3600)),
     },
 }
@@ -27,6 +27,23 @@ class NautobotDeviceLifecycleManagementConfig(NautobotAppConfig):
         "barchart_width": 12,
         "barchart_height": 5,
         "enabled_metrics": [],
+        "metrics_cache_ttl": 0,
+        "metrics_cache_background_refresh": False,
+        "metrics_source": "live",
+        "event_driven_validation": False,
+        "event_driven_validation_delay": 10,
+        "event_driven_vulnerabilities": False,
+        "event_driven_vulnerabilities_delay": 10,
+        "validation_shard_size": 5000,
+        "validation_max_concurrency": 4,
+        "vulnerability_partition_size": 5000,
+        "vulnerability_max_concurrency": 4,
+        "compliance_snapshot_retention_days": 90,
+        "compliance_projection_cache_ttl": 3600,
+        "nvd_cpe_platforms": {},
+        "version_parsers": {},
+        "vulnerability_closed_statuses": [],
+        "vulnerability_risk_weights": {},
     }
     caching_config = {}
     docs_view_name = "plugins:nautobot_device_lifecycle_mgmt:docs"
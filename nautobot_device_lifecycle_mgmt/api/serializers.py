@@ -1,7 +1,9 @@
 """API serializers implementation for the LifeCycle Management app."""
 
 from nautobot.apps.api import NautobotModelSerializer, TaggedModelSerializerMixin
+from rest_framework import serializers
 
+from nautobot_device_lifecycle_mgmt import choices
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
     ContactLCM,
@@ -13,7 +15,9 @@ from nautobot_device_lifecycle_mgmt.models import (
     SoftwareImageLCM,
     SoftwareLCM,
     ValidatedSoftwareLCM,
+    VulnerabilityExposure,
     VulnerabilityLCM,
+    VulnerabilityRiskScore,
 )
 
 
@@ -97,6 +101,37 @@ class CVELCMSerializer(NautobotModelSerializer):  # pylint: disable=abstract-met
         fields = "__all__"
 
 
+class SoftwareReferenceSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """Reference to a SoftwareLCM by Platform name and version."""
+
+    platform = serializers.CharField()
+    version = serializers.CharField()
+
+    def to_internal_value(self, data):
+        """Return the reference as a `(platform name, version)` tuple."""
+        values = super().to_internal_value(data)
+        return values["platform"], values["version"]
+
+
+class CVELCMUpsertSerializer(serializers.Serializer):  # pylint: disable=abstract-method
+    """CVE item of a bulk upsert, keyed by name, with affected software referenced by Platform name and version."""
+
+    name = serializers.CharField(max_length=CVELCM._meta.get_field("name").max_length)
+    published_date = serializers.DateField(required=False)
+    link = serializers.URLField(required=False)
+    status = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    description = serializers.CharField(
+        required=False, allow_blank=True, max_length=CVELCM._meta.get_field("description").max_length
+    )
+    severity = serializers.ChoiceField(choices=choices.CVESeverityChoices, required=False)
+    cvss = serializers.FloatField(required=False, allow_null=True)
+    cvss_v2 = serializers.FloatField(required=False, allow_null=True)
+    cvss_v3 = serializers.FloatField(required=False, allow_null=True)
+    fix = serializers.CharField(required=False, allow_blank=True, max_length=CVELCM._meta.get_field("fix").max_length)
+    comments = serializers.CharField(required=False, allow_blank=True)
+    affected_softwares = SoftwareReferenceSerializer(many=True, required=False)
+
+
 class VulnerabilityLCMSerializer(NautobotModelSerializer):  # pylint: disable=abstract-method,too-few-public-methods
     """REST API serializer for VulnerabilityLCM records."""
 
@@ -134,3 +169,23 @@ class InventoryItemSoftwareValidationResultSerializer(NautobotModelSerializer):
 
         model = InventoryItemSoftwareValidationResult
         fields = "__all__"
+
+
+class VulnerabilityExposureSerializer(NautobotModelSerializer):
+    """REST API serializer for VulnerabilityExposure records."""
+
+    class Meta:
+        """Meta attributes."""
+
+        model = VulnerabilityExposure
+        fields = "__all__"
+
+
+class VulnerabilityRiskScoreSerializer(NautobotModelSerializer):
+    """REST API serializer for VulnerabilityRiskScore records."""
+
+    class Meta:
+        """Meta attributes."""
+
+        model = VulnerabilityRiskScore
+        fields = "__all__"
@@ -13,7 +13,9 @@ from nautobot_device_lifecycle_mgmt.api.views import (
     SoftwareImageLCMViewSet,
     SoftwareLCMViewSet,
     ValidatedSoftwareLCMViewSet,
+    VulnerabilityExposureViewSet,
     VulnerabilityLCMViewSet,
+    VulnerabilityRiskScoreViewSet,
 )
 
 router = routers.DefaultRouter()
@@ -29,6 +31,8 @@ router.register("cve", CVELCMViewSet)
 router.register("vulnerability", VulnerabilityLCMViewSet)
 router.register("device-validated-software-result", DeviceSoftwareValidationResultListViewSet)
 router.register("inventory-item-validated-software-result", InventoryItemSoftwareValidationResultListViewSet)
+router.register("vulnerability-exposure", VulnerabilityExposureViewSet)
+router.register("vulnerability-risk-score", VulnerabilityRiskScoreViewSet)
 
 app_name = "nautobot_device_lifecycle_mgmt"  # pylint: disable=invalid-name
 
@@ -1,7 +1,12 @@
 """API Views implementation for the Lifecycle Management app."""
 
 from nautobot.apps.api import NautobotModelViewSet
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 
+from nautobot_device_lifecycle_mgmt.cve_upsert import CVEBulkUpserter
 from nautobot_device_lifecycle_mgmt.filters import (
     ContactLCMFilterSet,
     ContractLCMFilterSet,
@@ -13,7 +18,9 @@ from nautobot_device_lifecycle_mgmt.filters import (
     SoftwareImageLCMFilterSet,
     SoftwareLCMFilterSet,
     ValidatedSoftwareLCMFilterSet,
+    VulnerabilityExposureFilterSet,
     VulnerabilityLCMFilterSet,
+    VulnerabilityRiskScoreFilterSet,
 )
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
@@ -26,13 +33,16 @@ from nautobot_device_lifecycle_mgmt.models import (
     SoftwareImageLCM,
     SoftwareLCM,
     ValidatedSoftwareLCM,
+    VulnerabilityExposure,
     VulnerabilityLCM,
+    VulnerabilityRiskScore,
 )
 
 from .serializers import (
     ContactLCMSerializer,
     ContractLCMSerializer,
     CVELCMSerializer,
+    CVELCMUpsertSerializer,
     DeviceSoftwareValidationResultSerializer,
     HardwareLCMSerializer,
     InventoryItemSoftwareValidationResultSerializer,
@@ -40,7 +50,9 @@ from .serializers import (
     SoftwareImageLCMSerializer,
     SoftwareLCMSerializer,
     ValidatedSoftwareLCMSerializer,
+    VulnerabilityExposureSerializer,
     VulnerabilityLCMSerializer,
+    VulnerabilityRiskScoreSerializer,
 )
 
 
@@ -107,6 +119,40 @@ class CVELCMViewSet(NautobotModelViewSet):
     serializer_class = CVELCMSerializer
     filterset_class = CVELCMFilterSet
 
+    def get_serializer_class(self):
+        """Return the serializer of upsert items for the bulk upsert action."""
+        if self.action == "bulk_upsert":
+            return CVELCMUpsertSerializer
+        return super().get_serializer_class()
+
+    @action(detail=False, methods=["post"], url_path="bulk-upsert")
+    def bulk_upsert(self, request):
+        """Create or update a list of CVEs keyed by name in one transaction.
+
+        Affected software is referenced by Platform name and version. Every item is reported as `created`,
+        `updated` or `unchanged`, no change is applied when any item is invalid.
+        """
+        if not request.user.has_perms(
+            ["nautobot_device_lifecycle_mgmt.add_cvelcm", "nautobot_device_lifecycle_mgmt.change_cvelcm"]
+        ):
+            raise PermissionDenied()
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        names = {item["name"] for item in serializer.validated_data}
+        # Existing CVEs outside the object permissions of the user cannot be updated
+        existing = CVELCM.objects.filter(name__in=names)
+        if existing.count() != existing.restrict(request.user, "change").count():
+            raise PermissionDenied()
+
+        results, errors = CVEBulkUpserter(serializer.validated_data).upsert()
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        counts = {result: 0 for result in ("created", "updated", "unchanged")}
+        for result in results:
+            counts[result["result"]] += 1
+
+        return Response({**counts, "results": results}, status=status.HTTP_200_OK)
+
 
 class VulnerabilityLCMViewSet(NautobotModelViewSet):
     """REST API viewset for VulnerabilityLCM records."""
@@ -139,3 +185,25 @@ class InventoryItemSoftwareValidationResultListViewSet(NautobotModelViewSet):
 
     # Disabling POST as these should only be created via Job.
     http_method_names = ["get", "head", "options"]
+
+
+class VulnerabilityExposureViewSet(NautobotModelViewSet):
+    """REST API viewset for VulnerabilityExposure records."""
+
+    queryset = VulnerabilityExposure.objects.all()
+    serializer_class = VulnerabilityExposureSerializer
+    filterset_class = VulnerabilityExposureFilterSet
+
+    # Disabling POST as these should only be created via Job.
+    http_method_names = ["get", "head", "options"]
+
+
+class VulnerabilityRiskScoreViewSet(NautobotModelViewSet):
+    """REST API viewset for VulnerabilityRiskScore records."""
+
+    queryset = VulnerabilityRiskScore.objects.all()
+    serializer_class = VulnerabilityRiskScoreSerializer
+    filterset_class = VulnerabilityRiskScoreFilterSet
+
+    # Disabling POST as these should only be created via Job.
+    http_method_names = ["get", "head", "options"]
@@ -75,10 +75,44 @@ class ReportRunTypeChoices(ChoiceSet):
 
     REPORT_SINGLE_OBJECT_RUN = "single-object-run"
     REPORT_FULL_RUN = "full-report-run"
+    REPORT_INCREMENTAL_RUN = "incremental-report-run"
+    REPORT_EVENT_RUN = "event-report-run"
 
     CHOICES = (
         (REPORT_SINGLE_OBJECT_RUN, "Single Object Run"),
         (REPORT_FULL_RUN, "Full Report Run"),
+        (REPORT_INCREMENTAL_RUN, "Incremental Report Run"),
+        (REPORT_EVENT_RUN, "Event Driven Run"),
+    )
+
+
+class ComplianceSnapshotObjectTypeChoices(ChoiceSet):
+    """Choices for the types of objects summarized by compliance snapshots."""
+
+    DEVICE = "device"
+    INVENTORY_ITEM = "inventory_item"
+
+    CHOICES = (
+        (DEVICE, "Device"),
+        (INVENTORY_ITEM, "Inventory Item"),
+    )
+
+
+class ComplianceSnapshotGroupChoices(ChoiceSet):
+    """Choices for the attributes compliance snapshot counts are grouped by."""
+
+    TOTAL = "total"
+    DEVICE_TYPE = "device_type"
+    PLATFORM = "platform"
+    LOCATION = "location"
+    MANUFACTURER = "manufacturer"
+
+    CHOICES = (
+        (TOTAL, "Total"),
+        (DEVICE_TYPE, "Device Type"),
+        (PLATFORM, "Platform"),
+        (LOCATION, "Location"),
+        (MANUFACTURER, "Manufacturer"),
     )
 
 
@@ -98,3 +132,17 @@ class CVESeverityChoices(ChoiceSet):
         (LOW, LOW),
         (NONE, NONE),
     )
+
+
+class RiskScoreScopeChoices(ChoiceSet):
+    """Choices for the objects vulnerability risk scores are computed for."""
+
+    DEVICE = "device"
+    LOCATION = "location"
+    PLATFORM = "platform"
+
+    CHOICES = (
+        (DEVICE, "Device"),
+        (LOCATION, "Location"),
+        (PLATFORM, "Platform"),
+    )
@@ -0,0 +1,219 @@
+"""Bulk create or update of CVEs keyed by name, referencing affected software by platform name and version."""
+
+from django.db import transaction
+from django.utils import timezone
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.constants import CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL
+from nautobot.extras.models import ObjectChange, Status
+from nautobot.extras.signals import change_context_state
+
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.tasks import queue_vulnerability_generation
+
+# CVELCM fields that can be set by an upsert item, in addition to `name`, `status` and `affected_softwares`
+UPSERT_FIELDS = (
+    "published_date",
+    "link",
+    "description",
+    "severity",
+    "cvss",
+    "cvss_v2",
+    "cvss_v3",
+    "fix",
+    "comments",
+)
+CREATE_REQUIRED_FIELDS = ("published_date", "link")
+
+
+class CVEBulkUpserter:
+    """Create or update many CVELCM objects in one transaction.
+
+    Items are matched to existing CVEs by `name`. Only the fields present in an item are compared and updated,
+    `affected_softwares`, when present, replaces the software linked to the CVE. Software references and status
+    names of all items are resolved with one query each before any change is made, so an invalid item leaves the
+    database untouched. CVEs are then created and updated with bulk operations, their change log entries are
+    created in bulk too.
+    """
+
+    batch_size = 1000
+
+    def __init__(self, items):
+        """Initialize CVEBulkUpserter.
+
+        Args:
+            items (list): dicts of CVELCM field values keyed by field name, `status` being a Status name and
+                `affected_softwares` a list of `(platform name, version)` tuples
+        """
+        self.items = items
+
+    def get_software_map(self):
+        """Return mapping of `(platform name, version)` to SoftwareLCM pk for the software referenced by the items."""
+        references = {tuple(reference) for item in self.items for reference in item.get("affected_softwares", ())}
+        if not references:
+            return {}
+        software = SoftwareLCM.objects.filter(
+            device_platform__name__in={platform for platform, _ in references},
+            version__in={version for _, version in references},
+        ).values_list("device_platform__name", "version", "pk")
+
+        return {(platform, version): pk for platform, version, pk in software}
+
+    def get_status_map(self):
+        """Return mapping of Status name to pk for the CVE statuses referenced by the items."""
+        names = {item["status"] for item in self.items if item.get("status")}
+        if not names:
+            return {}
+
+        return dict(Status.objects.get_for_model(CVELCM).filter(name__in=names).values_list("name", "pk"))
+
+    def validate(self, existing_names, software_map, status_map):
+        """Return list of errors, one dict per item keyed by field name, empty when all items are valid."""
+        errors, invalid, seen = [], False, set()
+        for item in self.items:
+            item_errors = {}
+            if item["name"] in seen:
+                item_errors["name"] = [f"Duplicate CVE {item['name']} in the request."]
+            seen.add(item["name"])
+            if item["name"] not in existing_names:
+                missing = [field for field in CREATE_REQUIRED_FIELDS if item.get(field) in (None, "")]
+                for field in missing:
+                    item_errors[field] = ["This field is required to create a CVE."]
+            if item.get("status") and item["status"] not in status_map:
+                item_errors["status"] = [f"Status {item['status']} not found for CVEs."]
+            unknown = [
+                f"{platform} {version}"
+                for platform, version in item.get("affected_softwares", ())
+                if (platform, version) not in software_map
+            ]
+            if unknown:
+                item_errors["affected_softwares"] = [f"Software not found: {', '.join(unknown)}."]
+            invalid = invalid or bool(item_errors)
+            errors.append(item_errors)
+
+        return errors if invalid else []
+
+    def get_values(self, item, status_map):
+        """Return the CVELCM field values set by item."""
+        values = {field: item[field] for field in UPSERT_FIELDS if field in item}
+        if "status" in item:
+            values["status_id"] = status_map.get(item["status"])
+
+        return values
+
+    def upsert(self):  # pylint: disable=too-many-locals
+        """Apply the items.
+
+        Returns:
+            tuple: list of `{"name", "id", "result"}` dicts in item order, `result` being `created`, `updated` or
+                `unchanged`, and list of errors as returned by `validate`, the changes are not applied when not empty
+        """
+        software_map = self.get_software_map()
+        status_map = self.get_status_map()
+        names = [item["name"] for item in self.items]
+        fields = ("pk", "name", "status_id", *UPSERT_FIELDS)
+        with transaction.atomic():
+            existing = {
+                cve["name"]: cve for cve in CVELCM.objects.select_for_update().filter(name__in=names).values(*fields)
+            }
+            errors = self.validate(existing, software_map, status_map)
+            if errors:
+                return [], errors
+
+            through = CVELCM.affected_softwares.through
+            links = {}
+            for cve_id, software_id in through.objects.filter(
+                cvelcm_id__in=[cve["pk"] for cve in existing.values()]
+            ).values_list("cvelcm_id", "softwarelcm_id"):
+                links.setdefault(cve_id, set()).add(software_id)
+
+            to_create, to_update, update_fields, results = [], [], set(), []
+            link_changes = {}
+            now = timezone.now()
+            for item in self.items:
+                values = self.get_values(item, status_map)
+                current = existing.get(item["name"])
+                if current is None:
+                    cve = CVELCM(name=item["name"], **values)
+                    to_create.append(cve)
+                    result = {"name": cve.name, "id": cve.pk, "result": "created"}
+                else:
+                    changed = {field for field, value in values.items() if current[field] != value}
+                    cve = CVELCM(**{field: current[field] for field in fields}, last_updated=now)
+                    result = {"name": cve.name, "id": cve.pk, "result": "unchanged"}
+                    if changed:
+                        for field in changed:
+                            setattr(cve, field, values[field])
+                        update_fields |= changed
+                        to_update.append(cve)
+                        result["result"] = "updated"
+                if "affected_softwares" in item:
+                    software_ids = {software_map[tuple(reference)] for reference in item["affected_softwares"]}
+                    if software_ids != links.get(cve.pk, set()):
+                        link_changes[cve.pk] = software_ids
+                        if result["result"] == "unchanged":
+                            to_update.append(cve)
+                            result["result"] = "updated"
+                results.append(result)
+
+            CVELCM.objects.bulk_create(to_create, batch_size=self.batch_size)
+            if to_update:
+                CVELCM.objects.bulk_update(to_update, [*update_fields, "last_updated"], batch_size=self.batch_size)
+            self.update_links(link_changes, links)
+            self.log_changes(
+                {
+                    result["id"]: ObjectChangeActionChoices.ACTION_CREATE
+                    if result["result"] == "created"
+                    else ObjectChangeActionChoices.ACTION_UPDATE
+                    for result in results
+                    if result["result"] != "unchanged"
+                }
+            )
+
+        return results, []
+
+    def log_changes(self, actions):
+        """Record ObjectChanges of the created and updated CVEs in the active change context.
+
+        Bulk operations don't send the signals Nautobot records changes from. As for regular saves, nothing is
+        recorded outside of a change context.
+
+        Args:
+            actions (dict): CVE pk => ObjectChange action
+        """
+        change_context = change_context_state.get()
+        if change_context is None or not actions:
+            return
+
+        user = change_context.get_user()
+        object_changes = []
+        for cve in CVELCM.objects.filter(pk__in=actions).select_related("status"):
+            object_change = cve.to_objectchange(actions[cve.pk])
+            object_change.user = user
+            object_change.user_name = user.username if user is not None else "Undefined"
+            object_change.request_id = change_context.change_id
+            object_change.change_context = change_context.context
+            object_change.change_context_detail = change_context.context_detail[:CHANGELOG_MAX_CHANGE_CONTEXT_DETAIL]
+            object_changes.append(object_change)
+        ObjectChange.objects.bulk_create(object_changes, batch_size=self.batch_size)
+
+    def update_links(self, link_changes, links):
+        """Replace the software linked to CVEs.
+
+        Args:
+            link_changes (dict): CVE pk => set of pks of the SoftwareLCM to link to it
+            links (dict): CVE pk => set of pks of the SoftwareLCM currently linked to it
+        """
+        through = CVELCM.affected_softwares.through
+        added = set()
+        for cve_id, software_ids in link_changes.items():
+            current = links.get(cve_id, set())
+            if current - software_ids:
+                through.objects.filter(cvelcm_id=cve_id, softwarelcm_id__in=current - software_ids).delete()
+            added.update((cve_id, software_id) for software_id in software_ids - current)
+        through.objects.bulk_create(
+            [through(cvelcm_id=cve_id, softwarelcm_id=software_id) for cve_id, software_id in added],
+            batch_size=self.batch_size,
+        )
+        # Bulk inserts don't send m2m_changed, queue the vulnerabilities the new links expose explicitly
+        if added:
+            transaction.on_commit(lambda: queue_vulnerability_generation("cve_software", added))
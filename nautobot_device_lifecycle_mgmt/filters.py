@@ -9,7 +9,7 @@ from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, Ma
 from nautobot.extras.filters.mixins import StatusFilter
 from nautobot.extras.models import Role, Tag
 
-from nautobot_device_lifecycle_mgmt.choices import CVESeverityChoices
+from nautobot_device_lifecycle_mgmt.choices import CVESeverityChoices, RiskScoreScopeChoices
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
     ContactLCM,
@@ -21,7 +21,10 @@ from nautobot_device_lifecycle_mgmt.models import (
     SoftwareImageLCM,
     SoftwareLCM,
     ValidatedSoftwareLCM,
+    VulnerabilityExposure,
     VulnerabilityLCM,
+    VulnerabilityRiskScore,
+    validity_window_q,
 )
 
 
@@ -305,6 +308,7 @@ class ValidatedSoftwareLCMFilterSet(NautobotFilterSet):
     start = django_filters.DateTimeFromToRangeFilter()
     end = django_filters.DateTimeFromToRangeFilter()
     valid = django_filters.BooleanFilter(method="valid_search", label="Currently valid")
+    valid_on = django_filters.DateFilter(method="valid_search", label="Valid on")
 
     class Meta:
         """Meta attributes for filter."""
@@ -322,12 +326,14 @@ class ValidatedSoftwareLCMFilterSet(NautobotFilterSet):
         return queryset.filter(qs_filter)
 
     def valid_search(self, queryset, name, value):  # pylint: disable=unused-argument
-        """Perform the valid_search search."""
-        today = datetime.date.today()
-        if value is True:
-            qs_filter = Q(start__lte=today, end=None) | Q(start__lte=today, end__gte=today)
-        else:
-            qs_filter = Q(start__gt=today) | Q(end__lt=today)
+        """Perform the valid_search search, evaluating validity on the `valid_on` date, today by default."""
+        valid = self.form.cleaned_data.get("valid")
+        if name == "valid_on" and valid is not None:
+            # Applied together with the `valid` filter
+            return queryset
+        qs_filter = validity_window_q(self.form.cleaned_data.get("valid_on") or datetime.date.today())
+        if valid is False:
+            return queryset.exclude(qs_filter)
         return queryset.filter(qs_filter)
 
     def device(self, queryset, name, value):
@@ -377,10 +383,8 @@ class DeviceSoftwareValidationResultFilterSet(NautobotFilterSet):
         queryset=SoftwareLCM.objects.all(),
         label="Software",
     )
-    valid = django_filters.BooleanFilter(
-        label="Valid",
-        field_name="is_validated",
-    )
+    valid = django_filters.BooleanFilter(method="valid_search", label="Valid")
+    valid_on = django_filters.DateFilter(method="valid_search", label="Valid on")
     platform = django_filters.ModelMultipleChoiceFilter(
         field_name="device__platform",
         queryset=Platform.objects.all(),
@@ -467,6 +471,20 @@ class DeviceSoftwareValidationResultFilterSet(NautobotFilterSet):
 
         return queryset
 
+    def valid_search(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Filter on validity as recorded by the last run, or evaluated on the `valid_on` date when given."""
+        valid = self.form.cleaned_data.get("valid")
+        on_date = self.form.cleaned_data.get("valid_on")
+        if on_date is None:
+            return queryset.filter(is_validated=valid)
+        if name == "valid_on" and valid is not None:
+            # Applied together with the `valid` filter
+            return queryset
+        valid_q = queryset.valid_on_q(on_date)
+        if valid is False:
+            return queryset.exclude(valid_q)
+        return queryset.filter(valid_q)
+
 
 class InventoryItemSoftwareValidationResultFilterSet(NautobotFilterSet):
     """Filter for InventoryItemSoftwareValidationResult."""
@@ -479,10 +497,8 @@ class InventoryItemSoftwareValidationResultFilterSet(NautobotFilterSet):
         queryset=SoftwareLCM.objects.all(),
         label="Software",
     )
-    valid = django_filters.BooleanFilter(
-        label="Valid",
-        field_name="is_validated",
-    )
+    valid = django_filters.BooleanFilter(method="valid_search", label="Valid")
+    valid_on = django_filters.DateFilter(method="valid_search", label="Valid on")
     manufacturer = django_filters.ModelMultipleChoiceFilter(
         field_name="inventory_item__manufacturer",
         queryset=Manufacturer.objects.all(),
@@ -592,6 +608,20 @@ class InventoryItemSoftwareValidationResultFilterSet(NautobotFilterSet):
 
         return queryset
 
+    def valid_search(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Filter on validity as recorded by the last run, or evaluated on the `valid_on` date when given."""
+        valid = self.form.cleaned_data.get("valid")
+        on_date = self.form.cleaned_data.get("valid_on")
+        if on_date is None:
+            return queryset.filter(is_validated=valid)
+        if name == "valid_on" and valid is not None:
+            # Applied together with the `valid` filter
+            return queryset
+        valid_q = queryset.valid_on_q(on_date)
+        if valid is False:
+            return queryset.exclude(valid_q)
+        return queryset.filter(valid_q)
+
 
 class ContractLCMFilterSet(NautobotFilterSet):
     """Filter for ContractLCMFilter."""
@@ -761,3 +791,123 @@ class VulnerabilityLCMFilterSet(NautobotFilterSet, StatusModelFilterSetMixin):
             | Q(inventory_item__name__icontains=value)
         )
         return queryset.filter(qs_filter)
+
+
+class VulnerabilityExposureFilterSet(NautobotFilterSet):
+    """Filter for VulnerabilityExposure."""
+
+    q = django_filters.CharFilter(method="search", label="Search")
+
+    device_id = django_filters.ModelMultipleChoiceFilter(
+        field_name="device",
+        queryset=Device.objects.all(),
+        label="Device",
+    )
+    device = django_filters.ModelMultipleChoiceFilter(
+        field_name="device__name",
+        queryset=Device.objects.all(),
+        to_field_name="name",
+        label="Device (name)",
+    )
+    inventory_item_id = django_filters.ModelMultipleChoiceFilter(
+        field_name="inventory_item",
+        queryset=InventoryItem.objects.all(),
+        label="Inventory Item",
+    )
+    location_id = django_filters.ModelMultipleChoiceFilter(
+        method="location_search",
+        queryset=Location.objects.all(),
+        label="Location",
+    )
+    location = django_filters.ModelMultipleChoiceFilter(
+        method="location_search",
+        queryset=Location.objects.all(),
+        to_field_name="name",
+        label="Location (name)",
+    )
+    severity = django_filters.ChoiceFilter(
+        method="severity_search", choices=CVESeverityChoices, label="Has open CVEs of severity"
+    )
+
+    class Meta:
+        """Meta attributes for filter."""
+
+        model = VulnerabilityExposure
+
+        fields = "__all__"
+
+    def search(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Perform the filtered search."""
+        if not value.strip():
+            return queryset
+        qs_filter = Q(device__name__icontains=value) | Q(inventory_item__name__icontains=value)
+        return queryset.filter(qs_filter)
+
+    def location_search(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Filter devices and inventory items of devices in the locations."""
+        if not value:
+            return queryset
+        return queryset.filter(Q(device__location__in=value) | Q(inventory_item__device__location__in=value))
+
+    def severity_search(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Filter objects with at least one open CVE of the severity."""
+        if not value:
+            return queryset
+        return queryset.filter(**{f"{VulnerabilityExposure.severity_fields[value]}__gt": 0})
+
+
+class VulnerabilityRiskScoreFilterSet(NautobotFilterSet):
+    """Filter for VulnerabilityRiskScore."""
+
+    q = django_filters.CharFilter(method="search", label="Search")
+
+    scope = django_filters.MultipleChoiceFilter(choices=RiskScoreScopeChoices)
+    device_id = django_filters.ModelMultipleChoiceFilter(
+        field_name="device",
+        queryset=Device.objects.all(),
+        label="Device",
+    )
+    device = django_filters.ModelMultipleChoiceFilter(
+        field_name="device__name",
+        queryset=Device.objects.all(),
+        to_field_name="name",
+        label="Device (name)",
+    )
+    location_id = django_filters.ModelMultipleChoiceFilter(
+        field_name="location",
+        queryset=Location.objects.all(),
+        label="Location",
+    )
+    location = django_filters.ModelMultipleChoiceFilter(
+        field_name="location__name",
+        queryset=Location.objects.all(),
+        to_field_name="name",
+        label="Location (name)",
+    )
+    platform_id = django_filters.ModelMultipleChoiceFilter(
+        field_name="platform",
+        queryset=Platform.objects.all(),
+        label="Platform",
+    )
+    platform = django_filters.ModelMultipleChoiceFilter(
+        field_name="platform__name",
+        queryset=Platform.objects.all(),
+        to_field_name="name",
+        label="Platform (name)",
+    )
+
+    class Meta:
+        """Meta attributes for filter."""
+
+        model = VulnerabilityRiskScore
+
+        fields = "__all__"
+
+    def search(self, queryset, name, value):  # pylint: disable=unused-argument
+        """Perform the filtered search."""
+        if not value.strip():
+            return queryset
+        qs_filter = (
+            Q(device__name__icontains=value) | Q(location__name__icontains=value) | Q(platform__name__icontains=value)
+        )
+        return queryset.filter(qs_filter)
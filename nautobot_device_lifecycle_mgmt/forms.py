@@ -39,6 +39,7 @@ from nautobot_device_lifecycle_mgmt.models import (
     SoftwareImageLCM,
     SoftwareLCM,
     ValidatedSoftwareLCM,
+    VulnerabilityExposure,
     VulnerabilityLCM,
 )
 
@@ -423,6 +424,7 @@ class ValidatedSoftwareLCMFilterForm(NautobotFilterForm):
     )
     start_before = forms.DateField(label="Valid Since Date Before", required=False, widget=DatePicker())
     start_after = forms.DateField(label="Valid Since Date After", required=False, widget=DatePicker())
+    valid_on = forms.DateField(label="Valid On", required=False, widget=DatePicker())
 
     class Meta:
         """Meta attributes."""
@@ -438,6 +440,7 @@ class ValidatedSoftwareLCMFilterForm(NautobotFilterForm):
             "object_tags",
             "preferred",
             "valid",
+            "valid_on",
             "start_before",
             "start_after",
         ]
@@ -466,6 +469,7 @@ class DeviceSoftwareValidationResultFilterForm(NautobotFilterForm):
         widget=StaticSelect2(choices=BOOLEAN_WITH_BLANK_CHOICES),
         label="Valid",
     )
+    valid_on = forms.DateField(label="Valid On", required=False, widget=DatePicker())
     location = DynamicModelMultipleChoiceField(
         queryset=Location.objects.all(),
         to_field_name="name",
@@ -503,6 +507,7 @@ class DeviceSoftwareValidationResultFilterForm(NautobotFilterForm):
             "q",
             "software",
             "valid",
+            "valid_on",
             "platform",
             "location",
             "device",
@@ -531,6 +536,7 @@ class InventoryItemSoftwareValidationResultFilterForm(NautobotFilterForm):
         widget=StaticSelect2(choices=BOOLEAN_WITH_BLANK_CHOICES),
         label="Valid",
     )
+    valid_on = forms.DateField(label="Valid On", required=False, widget=DatePicker())
     manufacturer = DynamicModelMultipleChoiceField(
         queryset=Manufacturer.objects.all(),
         label="Manufacturer",
@@ -582,6 +588,7 @@ class InventoryItemSoftwareValidationResultFilterForm(NautobotFilterForm):
             "q",
             "software",
             "valid",
+            "valid_on",
             "manufacturer",
             "location",
             "inventory_item",
@@ -988,3 +995,44 @@ class VulnerabilityLCMFilterForm(NautobotFilterForm):
             "status",
             "tags",
         ]
+
+
+class VulnerabilityExposureFilterForm(NautobotFilterForm):
+    """Filter form to filter searches for VulnerabilityExposure."""
+
+    model = VulnerabilityExposure
+    q = forms.CharField(
+        required=False,
+        label="Search",
+        help_text="Search for device or inventory item name.",
+    )
+    severity = forms.ChoiceField(
+        label="Has open CVEs of severity",
+        required=False,
+        choices=add_blank_choice(CVESeverityChoices.CHOICES),
+    )
+    location = DynamicModelMultipleChoiceField(
+        queryset=Location.objects.all(),
+        to_field_name="name",
+        required=False,
+    )
+    device = DynamicModelMultipleChoiceField(
+        queryset=Device.objects.all(),
+        to_field_name="name",
+        required=False,
+    )
+    max_cvss_v3__gte = forms.FloatField(label="Max CVSSv3 Score (min)", required=False)
+    oldest_published_date__lte = forms.DateField(label="Oldest Published Before", required=False, widget=DatePicker())
+
+    class Meta:
+        """Meta attributes."""
+
+        model = VulnerabilityExposure
+        fields = [
+            "q",
+            "severity",
+            "location",
+            "device",
+            "max_cvss_v3__gte",
+            "oldest_published_date__lte",
+        ]
@@ -0,0 +1,197 @@
+"""Instrumentation of the lifecycle jobs, stored in the cache and exposed as Prometheus metrics."""
+
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import accumulate
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from prometheus_client.core import GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+# Name in `enabled_metrics` enabling the recording and export of the job instrumentation
+JOB_INSTRUMENTATION_METRIC = "nautobot_lcm_job_instrumentation"
+JOB_INSTRUMENTATION_CACHE_KEY = "nautobot_device_lifecycle_mgmt:instrumentation:jobs"
+JOB_INSTRUMENTATION_LOCK_KEY = "nautobot_device_lifecycle_mgmt:instrumentation:lock"
+# Maximum number of seconds recording a job run may hold the lock
+JOB_INSTRUMENTATION_LOCK_TIMEOUT = 10
+
+# Upper bounds, in seconds, of the buckets of the phase duration histograms, `+Inf` excluded
+PHASE_DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800, 3600)
+
+
+class PhaseTimerMixin:
+    """Accumulate the wall-clock seconds engines spend in each phase of their runs into `phase_seconds`.
+
+    Engines initialize `phase_seconds` to a `defaultdict(float)` and wrap the parts of their runs loading data
+    from the database, computing in memory and writing back in `timed("load")`, `timed("compute")` and
+    `timed("write")` blocks.
+    """
+
+    phase_seconds = None
+
+    @contextmanager
+    def timed(self, phase):
+        """Add the seconds spent in the block to the phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[phase] += time.perf_counter() - started
+
+
+class JobRun:
+    """Phase durations, processed objects and database queries of one job run, see `instrument_job`."""
+
+    def __init__(self, job_name):
+        """Initialize JobRun.
+
+        Args:
+            job_name (str): name of the job the run is reported under
+        """
+        self.job_name = job_name
+        self.phase_seconds = defaultdict(float)
+        self.objects = 0
+        self.queries = 0
+        # Set by runs reporting failures without raising, such as parallel runs with failed tasks
+        self.failed = False
+
+    def count_query(self, execute, sql, params, many, context):  # pylint: disable=too-many-arguments
+        """Database execute wrapper counting the queries issued by the run."""
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def add_engine(self, engine, objects):
+        """Add the phase durations of the engine and the number of objects it processed to the run."""
+        for phase, seconds in engine.phase_seconds.items():
+            self.phase_seconds[phase] += seconds
+        self.objects += objects
+
+    def add_tasks(self, lane_counts):
+        """Add the phase durations, processed objects and queries collected by parallel tasks, see `instrument_task`."""
+        for counts in lane_counts:
+            for phase, seconds in counts["phase_seconds"].items():
+                self.phase_seconds[phase] += seconds
+            self.objects += counts["processed"]
+            self.queries += counts["queries"]
+
+    def record(self, duration):
+        """Add the run to the job instrumentation stored in the cache.
+
+        Args:
+            duration (float): number of seconds the run took
+        """
+        with cache.lock(JOB_INSTRUMENTATION_LOCK_KEY, timeout=JOB_INSTRUMENTATION_LOCK_TIMEOUT):
+            stats = cache.get(JOB_INSTRUMENTATION_CACHE_KEY, {})
+            job_stats = stats.setdefault(self.job_name, {"phases": {}})
+            for phase, seconds in self.phase_seconds.items():
+                observations = job_stats["phases"].setdefault(
+                    phase, {"buckets": [0] * (len(PHASE_DURATION_BUCKETS) + 1), "sum": 0.0}
+                )
+                observations["buckets"][bisect_left(PHASE_DURATION_BUCKETS, seconds)] += 1
+                observations["sum"] += seconds
+            job_stats.update(
+                objects_per_second=self.objects / duration if duration else 0.0,
+                queries=self.queries,
+                last_success=time.time(),
+            )
+            cache.set(JOB_INSTRUMENTATION_CACHE_KEY, stats, timeout=None)
+
+
+@contextmanager
+def instrument_job(job_name, started=None):
+    """Instrument the job run executed in the block.
+
+    Database queries issued in the block are counted, engines run in the block are added with `JobRun.add_engine`.
+    The run is recorded only when the block completes without exception, the run is not marked as `failed` and
+    `nautobot_lcm_job_instrumentation` is listed in the `enabled_metrics` setting.
+
+    Args:
+        job_name (str): name of the job the run is reported under
+        started (float): time the run started at, in seconds since the epoch, the start of the block when None
+
+    Yields:
+        JobRun: the instrumented run
+    """
+    run = JobRun(job_name)
+    started = time.time() if started is None else started
+    with connection.execute_wrapper(run.count_query):
+        yield run
+    if not run.failed and JOB_INSTRUMENTATION_METRIC in PLUGIN_CFG["enabled_metrics"]:
+        run.record(time.time() - started)
+
+
+@contextmanager
+def instrument_task(counts):
+    """Instrument a parallel task of a job run, the run is recorded by the chord callback with `JobRun.add_tasks`.
+
+    Database queries issued in the block and phase durations of the engines added to the yielded run are added to
+    the `queries` and `phase_seconds` of counts, which are passed along the chain of tasks.
+
+    Args:
+        counts (dict): counts of the chain of tasks
+
+    Yields:
+        JobRun: the instrumented task run
+    """
+    run = JobRun(None)
+    with connection.execute_wrapper(run.count_query):
+        yield run
+    counts["queries"] += run.queries
+    for phase, seconds in run.phase_seconds.items():
+        counts["phase_seconds"][phase] = counts["phase_seconds"].get(phase, 0.0) + seconds
+
+
+def metrics_lcm_job_instrumentation():
+    """Report the instrumentation of the lifecycle job runs recorded in the cache.
+
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+        HistogramMetricFamily: Prometheus Metrics
+    """
+    stats = cache.get(JOB_INSTRUMENTATION_CACHE_KEY, {})
+
+    phase_duration_histogram = HistogramMetricFamily(
+        "nautobot_lcm_job_phase_duration_seconds",
+        "Nautobot LCM seconds spent by job runs in each phase",
+        labels=["job", "phase"],
+    )
+    objects_per_second_gauge = GaugeMetricFamily(
+        "nautobot_lcm_job_objects_per_second",
+        "Nautobot LCM objects processed per second by the last successful job run",
+        labels=["job"],
+    )
+    queries_gauge = GaugeMetricFamily(
+        "nautobot_lcm_job_db_queries",
+        "Nautobot LCM database queries issued by the last successful job run",
+        labels=["job"],
+    )
+    last_success_gauge = GaugeMetricFamily(
+        "nautobot_lcm_job_last_success_timestamp_seconds",
+        "Nautobot LCM time the last successful job run completed at, in seconds since the epoch",
+        labels=["job"],
+    )
+    for job_name, job_stats in sorted(stats.items()):
+        for phase, observations in sorted(job_stats["phases"].items()):
+            counts = list(accumulate(observations["buckets"]))
+            phase_duration_histogram.add_metric(
+                labels=[job_name, phase],
+                buckets=[
+                    *((floatToGoString(bound), count) for bound, count in zip(PHASE_DURATION_BUCKETS, counts)),
+                    ("+Inf", counts[-1]),
+                ],
+                sum_value=observations["sum"],
+            )
+        objects_per_second_gauge.add_metric(labels=[job_name], value=job_stats["objects_per_second"])
+        queries_gauge.add_metric(labels=[job_name], value=job_stats["queries"])
+        last_success_gauge.add_metric(labels=[job_name], value=job_stats["last_success"])
+
+    yield phase_duration_histogram
+    yield objects_per_second_gauge
+    yield queries_gauge
+    yield last_success_gauge
@@ -2,8 +2,20 @@
 
 from nautobot.core.celery import register_jobs
 
-from .cve_tracking import GenerateVulnerabilities
-from .lifecycle_reporting import DeviceSoftwareValidationFullReport, InventoryItemSoftwareValidationFullReport
+from .cve_tracking import GenerateVulnerabilities, ImportNVDFeed, PlanRemediation, ScoreVulnerabilityRisk
+from .lifecycle_reporting import (
+    DeviceSoftwareValidationFullReport,
+    InventoryItemSoftwareValidationFullReport,
+    RefreshMetricsSnapshot,
+)
 
-jobs = [DeviceSoftwareValidationFullReport, InventoryItemSoftwareValidationFullReport, GenerateVulnerabilities]
+jobs = [
+    DeviceSoftwareValidationFullReport,
+    InventoryItemSoftwareValidationFullReport,
+    GenerateVulnerabilities,
+    ImportNVDFeed,
+    PlanRemediation,
+    ScoreVulnerabilityRisk,
+    RefreshMetricsSnapshot,
+]
 register_jobs(*jobs)
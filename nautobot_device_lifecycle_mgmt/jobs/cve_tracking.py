@@ -3,10 +3,22 @@
 
 from datetime import datetime
 
-from nautobot.extras.jobs import BooleanVar, Job, StringVar
-from nautobot.extras.models import Relationship
+from nautobot.dcim.models import Device, Location, Platform
+from nautobot.extras.jobs import BooleanVar, FileVar, Job, MultiObjectVar, ObjectVar, StringVar
+from nautobot.extras.models import Status
 
-from nautobot_device_lifecycle_mgmt.models import CVELCM, VulnerabilityLCM
+from nautobot_device_lifecycle_mgmt.instrumentation import instrument_job
+from nautobot_device_lifecycle_mgmt.metrics import (
+    RISK_SCORE_METRICS,
+    VULNERABILITY_METRICS,
+    write_metrics_snapshot,
+)
+from nautobot_device_lifecycle_mgmt.models import CVELCM
+from nautobot_device_lifecycle_mgmt.nvd import NVDFeedImporter, iter_feed_items, open_feed
+from nautobot_device_lifecycle_mgmt.remediation import PLAN_FIELDS, SUMMARY_FIELDS, RemediationPlanner, export_csv
+from nautobot_device_lifecycle_mgmt.risk import RiskScoringEngine
+from nautobot_device_lifecycle_mgmt.tasks import dispatch_parallel_vulnerabilities
+from nautobot_device_lifecycle_mgmt.vulnerabilities import VulnerabilityGenerationEngine
 
 name = "CVE Tracking"  # pylint: disable=invalid-name
 
@@ -24,6 +36,21 @@ class GenerateVulnerabilities(Job):
         default="1970-01-01",
         required=False,
     )
+    reconcile = BooleanVar(
+        description="Resolve vulnerabilities whose CVE no longer affects the software or whose software is no longer "
+        "assigned to the device or inventory item.",
+        default=False,
+    )
+    resolved_status = ObjectVar(
+        model=Status,
+        query_params={"content_types": "nautobot_device_lifecycle_mgmt.vulnerabilitylcm"},
+        required=False,
+        description="Status resolved vulnerabilities are set to. Resolved vulnerabilities are deleted when not set.",
+    )
+    parallel = BooleanVar(
+        description="Split CVEs into publication date windows processed by parallel Celery tasks.",
+        default=False,
+    )
     debug = BooleanVar(description="Enable for more verbose logging.")
 
     class Meta:
@@ -32,38 +59,195 @@ class GenerateVulnerabilities(Job):
         has_sensitive_variables = False
         field_order = [
             "published_after",
+            "reconcile",
+            "resolved_status",
+            "parallel",
             "_task_queue",
             "debug",
         ]
 
-    def run(self, published_after, debug=False):  # pylint: disable=too-many-locals, arguments-differ
-        """Check if software assigned to each device is valid. If no software is assigned return warning message."""
+    def run(  # pylint: disable=arguments-differ,too-many-locals
+        self, published_after, reconcile=False, resolved_status=None, parallel=False, debug=False
+    ):
+        """Generate missing vulnerabilities for every Device and InventoryItem running software affected by a CVE."""
         # Although the default is set on the class attribute for the UI, it doesn't default for the API
         published_after = published_after if published_after is not None else "1970-01-01"
-        cves = CVELCM.objects.filter(published_date__gte=datetime.fromisoformat(published_after))
-        count_before = VulnerabilityLCM.objects.count()
+        published_after = datetime.fromisoformat(published_after).date()
+        if parallel:
+            partition_count, lane_count = dispatch_parallel_vulnerabilities(
+                self.job_result.pk, self.__class__.__name__, published_after, reconcile, resolved_status
+            )
+            self.logger.info(
+                "Dispatched %d CVE partitions to %d parallel tasks, totals will be reported on completion."
+                % (partition_count, lane_count)
+            )
+            return
 
-        device_soft_rel = Relationship.objects.get(key="device_soft")
-        inv_item_soft_rel = Relationship.objects.get(key="inventory_item_soft")
+        with instrument_job(self.__class__.__name__) as job_run:
+            cves = CVELCM.objects.filter(published_date__gte=published_after)
 
-        for cve in cves:
-            if debug:
+            engine = VulnerabilityGenerationEngine(cves=cves)
+            if resolved_status:
+                engine.closed_statuses.add(resolved_status.name)
+            processed = created = resolved = reopened = 0
+            for cve_ids in engine.iter_chunks():
+                counts = engine.process(cve_ids, reconcile=reconcile, resolved_status=resolved_status)
+                if debug:
+                    self.logger.info(
+                        "Generated %d, resolved %d and reopened %d vulnerabilities for %d CVEs."
+                        % (counts["created"], counts["resolved"], counts["reopened"], len(cve_ids))
+                    )
+                processed += len(cve_ids)
+                created += counts["created"]
+                resolved += counts["resolved"]
+                reopened += counts["reopened"]
+
+            self.logger.info("Processed %d CVEs and generated %d Vulnerabilities." % (processed, created))
+            if reconcile and resolved_status:
                 self.logger.info(
-                    "Generating vulnerabilities for CVE %s" % cve,
-                    extra={"object": cve},
+                    "Resolved %d Vulnerabilities no longer exposed to status %s." % (resolved, resolved_status)
                 )
-            for software in cve.affected_softwares.all():
-                # Loop through any device relationships
-                device_rels = software.get_relationships()["source"][device_soft_rel]
-                for dev_rel in device_rels:
-                    VulnerabilityLCM.objects.get_or_create(cve=cve, software=dev_rel.source, device=dev_rel.destination)
-
-                # Loop through any inventory tem relationships
-                item_rels = software.get_relationships()["source"][inv_item_soft_rel]
-                for item_rel in item_rels:
-                    VulnerabilityLCM.objects.get_or_create(
-                        cve=cve, software=item_rel.source, inventory_item=item_rel.destination
-                    )
+                self.logger.info(
+                    "Reopened %d Vulnerabilities in status %s exposed again." % (reopened, resolved_status)
+                )
+            elif reconcile:
+                self.logger.info("Deleted %d Vulnerabilities no longer exposed." % resolved)
+            self.logger.info("Refreshed %d Vulnerability Exposure rollups." % engine.refresh_changed())
+            write_metrics_snapshot(VULNERABILITY_METRICS)
+            job_run.add_engine(engine, processed)
+
+
+class ImportNVDFeed(Job):
+    """Creates or updates CVELCM objects from an NVD JSON feed file."""
+
+    name = "Import NVD Feed"
+    description = "Imports CVEs from an NVD JSON feed file and links them to the affected software."
+    read_only = False
+    feed_file = FileVar(
+        label="Feed File",
+        description="NVD JSON 1.1 or 2.0 feed file, plain or gzip compressed.",
+        required=False,
+    )
+    feed_path = StringVar(
+        label="Feed Path",
+        description="Path of the feed file on the worker, used when no file is uploaded.",
+        required=False,
+    )
+    status = ObjectVar(
+        model=Status,
+        query_params={"content_types": "nautobot_device_lifecycle_mgmt.cvelcm"},
+        required=False,
+        description="Status of the created CVEs.",
+    )
+
+    class Meta:
+        """Meta class for the job."""
+
+        has_sensitive_variables = False
+        field_order = [
+            "feed_file",
+            "feed_path",
+            "status",
+            "_task_queue",
+        ]
+
+    def run(self, feed_file=None, feed_path="", status=None):  # pylint: disable=arguments-differ
+        """Stream the feed items and upsert CVEs in batches, reporting progress after each batch."""
+        if feed_file is None and not feed_path:
+            self.logger.error("Upload a feed file or enter the path of a feed file.")
+            raise RuntimeError("No feed file provided.")
+
+        def progress(counts, rate):
+            self.logger.info(
+                "Processed %d CVEs (%d created, %d updated, %d unchanged, %d software links added), %.1f CVEs/s."
+                % (
+                    counts["processed"],
+                    counts["created"],
+                    counts["updated"],
+                    counts["unchanged"],
+                    counts["linked"],
+                    rate,
+                )
+            )
+
+        importer = NVDFeedImporter(status=status)
+        handle = feed_file.open("rb") if feed_file is not None else open(feed_path, "rb")  # pylint: disable=consider-using-with
+        with handle, open_feed(handle) as stream:
+            counts = importer.run(iter_feed_items(stream), progress=progress)
+
+        self.logger.info(
+            "Imported %d CVEs: %d created, %d updated, %d unchanged, %d software links added."
+            % (counts["processed"], counts["created"], counts["updated"], counts["unchanged"], counts["linked"])
+        )
+
+
+class PlanRemediation(Job):
+    """Recommends the validated software clearing most open vulnerabilities of every vulnerable device."""
+
+    name = "Plan Vulnerability Remediation"
+    description = "Recommends for every vulnerable device the validated software leaving it the least exposed."
+    read_only = True
+    locations = MultiObjectVar(
+        model=Location,
+        required=False,
+        description="Only plan upgrades of devices in these locations.",
+    )
+    platforms = MultiObjectVar(
+        model=Platform,
+        required=False,
+        description="Only plan upgrades of devices of these platforms.",
+    )
+
+    class Meta:
+        """Meta class for the job."""
+
+        has_sensitive_variables = False
+        field_order = [
+            "locations",
+            "platforms",
+            "_task_queue",
+        ]
+
+    def run(self, locations=None, platforms=None):  # pylint: disable=arguments-differ
+        """Compute the upgrade plan and attach it, with totals per location and platform, as CSV files."""
+        devices = Device.objects.all()
+        if locations:
+            devices = devices.filter(location__in=locations)
+        if platforms:
+            devices = devices.filter(platform__in=platforms)
+
+        planner = RemediationPlanner(devices=devices)
+        plan = planner.plan()
+        summary = planner.summarize(plan)
+        self.logger.info(
+            "Planned upgrades of %d vulnerable devices: %d fully remediated, %d without validated software."
+            % (
+                len(plan),
+                sum(group["cleared_all"] for group in summary),
+                sum(group["no_candidate"] for group in summary),
+            )
+        )
+        self.create_file("remediation_plan.csv", export_csv(plan, PLAN_FIELDS))
+        self.create_file("remediation_summary.csv", export_csv(summary, SUMMARY_FIELDS))
+
+
+class ScoreVulnerabilityRisk(Job):
+    """Computes the vulnerability risk score of every vulnerable device and its totals per location and platform."""
+
+    name = "Score Vulnerability Risk"
+    description = "Computes vulnerability risk scores of devices, locations and platforms from their open CVEs."
+    read_only = False
+
+    class Meta:
+        """Meta class for the job."""
+
+        has_sensitive_variables = False
 
-        diff = VulnerabilityLCM.objects.count() - count_before
-        self.logger.info("Processed %d CVEs and generated %d Vulnerabilities." % (cves.count(), diff))
+    def run(self):  # pylint: disable=arguments-differ
+        """Replace the stored Vulnerability Risk Scores with newly computed ones."""
+        counts = RiskScoringEngine().run()
+        self.logger.info(
+            "Scored %d Devices, %d Locations and %d Platforms."
+            % (counts["device"], counts["location"], counts["platform"])
+        )
+        write_metrics_snapshot(RISK_SCORE_METRICS)
@@ -1,51 +1,118 @@
 # pylint: disable=logging-not-lazy, consider-using-f-string
 """Jobs for the Lifecycle Management app."""
 
-from datetime import datetime
-
+from django.conf import settings
 from nautobot.dcim.models import Device, InventoryItem
-from nautobot.extras.jobs import Job
+from nautobot.extras.jobs import BooleanVar, Job
 
 from nautobot_device_lifecycle_mgmt import choices
-from nautobot_device_lifecycle_mgmt.models import (
-    DeviceSoftwareValidationResult,
-    InventoryItemSoftwareValidationResult,
-    ValidatedSoftwareLCM,
+from nautobot_device_lifecycle_mgmt.instrumentation import instrument_job
+from nautobot_device_lifecycle_mgmt.metrics import VALIDATION_METRICS, write_metrics_snapshot
+from nautobot_device_lifecycle_mgmt.tasks import dispatch_parallel_validation
+from nautobot_device_lifecycle_mgmt.validation import (
+    DeviceSoftwareValidationEngine,
+    InventoryItemSoftwareValidationEngine,
 )
-from nautobot_device_lifecycle_mgmt.software import DeviceSoftware, InventoryItemSoftware
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
 
 name = "Device/Software Lifecycle Reporting"  # pylint: disable=invalid-name
 
 
+def log_validation_counts(job, counts):
+    """Log how many validation results were created, changed or left unchanged."""
+    job.logger.info(
+        "Validation results: %d new, %d changed, %d unchanged, %d with software removed.",
+        counts["new"],
+        counts["changed"],
+        counts["unchanged"],
+        counts["software_removed"],
+    )
+
+
+def dispatch_validation_shards(job, engine, since):
+    """Hand validation over to parallel Celery tasks, totals are logged into the job result once they complete."""
+    shard_count, lane_count = dispatch_parallel_validation(
+        engine.result_obj_field, job.job_result.pk, job.__class__.__name__, engine.run_type, engine.job_run_time, since
+    )
+    job.logger.info(
+        "Dispatched validation of %d shards to %d parallel tasks, totals will be reported on completion.",
+        shard_count,
+        lane_count,
+    )
+
+
+def start_validation(job, engine, incremental, parallel, resume):
+    """Prepare the engine for a new run or for resuming an interrupted one.
+
+    Returns:
+        tuple: `since` to pass to `engine.run`, None to validate all objects, and the checkpoint to save progress
+            into, None for parallel runs
+    """
+    verbose_name = engine.soft_obj_model._meta.verbose_name_plural
+    if resume and parallel:
+        job.logger.warning("Parallel runs can't be resumed, starting a new run.")
+    elif resume:
+        checkpoint = engine.resume_checkpoint()
+        if checkpoint is not None:
+            job.logger.info(
+                "Resuming validation run %s after %d already validated %s.",
+                checkpoint.run_id,
+                checkpoint.counts.get("processed", 0),
+                verbose_name,
+            )
+            return checkpoint.since, checkpoint
+        job.logger.info("No interrupted validation run found, starting a new run.")
+
+    since = engine.get_last_run() if incremental else None
+    if since is not None:
+        engine.run_type = choices.ReportRunTypeChoices.REPORT_INCREMENTAL_RUN
+        job.logger.info("Revalidating %s changed since %s.", verbose_name, since)
+
+    return since, None if parallel else engine.start_checkpoint(since)
+
+
 class DeviceSoftwareValidationFullReport(Job):
     """Checks if devices run validated software version."""
 
     name = "Device Software Validation Report"
     description = "Validates software version on devices."
     read_only = False
+    incremental = BooleanVar(
+        description="Only revalidate devices that changed since the last run.",
+        default=False,
+    )
+    parallel = BooleanVar(
+        description="Split devices into shards validated by parallel Celery tasks.",
+        default=False,
+    )
+    resume = BooleanVar(
+        description="Continue the last run that was interrupted before validating all devices.",
+        default=False,
+    )
 
     class Meta:
         """Meta class for the job."""
 
         has_sensitive_variables = False
 
-    def run(self) -> None:  # pylint: disable=arguments-differ
+    def run(self, incremental=False, parallel=False, resume=False) -> None:  # pylint: disable=arguments-differ
         """Check if software assigned to each device is valid. If no software is assigned return warning message."""
-        devices = Device.objects.all()
-        job_run_time = datetime.now()
+        engine = DeviceSoftwareValidationEngine(queryset=Device.objects.all())
+        since, checkpoint = start_validation(self, engine, incremental, parallel, resume)
 
-        for device in devices:
-            device_software = DeviceSoftware(device)
+        if parallel:
+            dispatch_validation_shards(self, engine, since)
+            return
 
-            validate_obj, _ = DeviceSoftwareValidationResult.objects.get_or_create(device=device)
-            validate_obj.is_validated = device_software.validate_software()
-            validate_obj.valid_software.set(ValidatedSoftwareLCM.objects.get_for_object(device))
-            validate_obj.software = device_software.software
-            validate_obj.last_run = job_run_time
-            validate_obj.run_type = choices.ReportRunTypeChoices.REPORT_FULL_RUN
-            validate_obj.validated_save()
+        with instrument_job(self.__class__.__name__) as job_run:
+            counts = engine.run(since=since, checkpoint=checkpoint)
 
-        self.logger.info("Performed validation on: %d devices.", devices.count())
+            self.logger.info("Performed validation on: %d devices.", counts["processed"])
+            log_validation_counts(self, counts)
+            engine.create_compliance_snapshot()
+            write_metrics_snapshot(VALIDATION_METRICS[engine.result_obj_field])
+            job_run.add_engine(engine, counts["processed"])
 
 
 class InventoryItemSoftwareValidationFullReport(Job):
@@ -54,26 +121,60 @@ class InventoryItemSoftwareValidationFullReport(Job):
     name = "Inventory Item Software Validation Report"
     description = "Validates software version on inventory items."
     read_only = False
+    incremental = BooleanVar(
+        description="Only revalidate inventory items that changed since the last run.",
+        default=False,
+    )
+    parallel = BooleanVar(
+        description="Split inventory items into shards validated by parallel Celery tasks.",
+        default=False,
+    )
+    resume = BooleanVar(
+        description="Continue the last run that was interrupted before validating all inventory items.",
+        default=False,
+    )
 
     class Meta:
         """Meta class for the job."""
 
         has_sensitive_variables = False
 
-    def run(self):  # pylint: disable=arguments-differ
+    def run(self, incremental=False, parallel=False, resume=False):  # pylint: disable=arguments-differ
         """Check if software assigned to each inventory item is valid. If no software is assigned return warning message."""
-        inventory_items = InventoryItem.objects.all()
-        job_run_time = datetime.now()
+        engine = InventoryItemSoftwareValidationEngine(queryset=InventoryItem.objects.all())
+        since, checkpoint = start_validation(self, engine, incremental, parallel, resume)
+
+        if parallel:
+            dispatch_validation_shards(self, engine, since)
+            return
+
+        with instrument_job(self.__class__.__name__) as job_run:
+            counts = engine.run(since=since, checkpoint=checkpoint)
+
+            self.logger.info("Performed validation on: %d inventory items." % counts["processed"])
+            log_validation_counts(self, counts)
+            engine.create_compliance_snapshot()
+            write_metrics_snapshot(VALIDATION_METRICS[engine.result_obj_field])
+            job_run.add_engine(engine, counts["processed"])
 
-        for inventoryitem in inventory_items:
-            inventoryitem_software = InventoryItemSoftware(inventoryitem)
 
-            validate_obj, _ = InventoryItemSoftwareValidationResult.objects.get_or_create(inventory_item=inventoryitem)
-            validate_obj.is_validated = inventoryitem_software.validate_software()
-            validate_obj.valid_software.set(ValidatedSoftwareLCM.objects.get_for_object(inventoryitem))
-            validate_obj.software = inventoryitem_software.software
-            validate_obj.last_run = job_run_time
-            validate_obj.run_type = choices.ReportRunTypeChoices.REPORT_FULL_RUN
-            validate_obj.validated_save()
+class RefreshMetricsSnapshot(Job):
+    """Computes the samples of the enabled metrics and stores them in the metrics snapshot."""
 
-        self.logger.info("Performed validation on: %d inventory items." % inventory_items.count())
+    name = "Refresh Metrics Snapshot"
+    description = (
+        "Computes the enabled Prometheus metrics, including hardware end of support, into the metrics snapshot."
+    )
+    read_only = False
+
+    class Meta:
+        """Meta class for the job."""
+
+        has_sensitive_variables = False
+
+    def run(self):  # pylint: disable=arguments-differ
+        """Replace the stored samples of all enabled metrics."""
+        if PLUGIN_CFG.get("metrics_source", "live") != "snapshot":
+            self.logger.warning("The metrics_source setting is not snapshot, metrics are computed on every scrape.")
+            return
+        self.logger.info("Stored %d metric samples." % write_metrics_snapshot())
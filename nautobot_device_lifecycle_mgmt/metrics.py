@@ -1,22 +1,183 @@
 """Nautobot Device LCM App application level metrics ."""
 
-from datetime import datetime
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
 from django.db.models.functions import Coalesce
+from django.utils import timezone
+from nautobot.core.celery import nautobot_task
 from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, LocationType
+from nautobot.extras.models import RelationshipAssociation
 from prometheus_client.core import GaugeMetricFamily
 
+from nautobot_device_lifecycle_mgmt.choices import CVESeverityChoices, RiskScoreScopeChoices
+from nautobot_device_lifecycle_mgmt.instrumentation import JOB_INSTRUMENTATION_METRIC, metrics_lcm_job_instrumentation
 from nautobot_device_lifecycle_mgmt.models import (
+    ContractLCM,
     DeviceSoftwareValidationResult,
     HardwareLCM,
     InventoryItemSoftwareValidationResult,
+    MetricSnapshot,
+    ProviderLCM,
+    SoftwareLCM,
+    VulnerabilityLCM,
+    VulnerabilityRiskScore,
 )
 
 PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
 
+METRICS_CACHE_PREFIX = "nautobot_device_lifecycle_mgmt:metrics"
+# Number of seconds stale samples are kept for, served while they are refreshed
+METRICS_STALE_TIMEOUT = 60 * 60
+# Maximum number of seconds a refresh may hold the lock, and a scrape waits for another scrape's refresh
+METRICS_LOCK_TIMEOUT = 120
+
+# Numbers of days ahead contracts are reported as expiring within
+CONTRACT_EXPIRY_DAYS = (30, 60, 90)
+
+# Name of the metric generator => CachedMetric serving it, used by the background refresh task
+CACHED_METRICS = {}
+
+# Metric family name => (documentation, label names)
+METRIC_FAMILIES = {
+    "nautobot_lcm_software_compliance_per_device_type": (
+        "Number of devices that have valid/invalid software by device_type",
+        ["device_type", "is_valid"],
+    ),
+    "nautobot_lcm_software_compliance_per_inventory_item": (
+        "Number of devices that have valid/invalid software by inventory item",
+        ["inventory_item", "is_valid"],
+    ),
+    "nautobot_lcm_hw_end_of_support_per_part_number": (
+        "Nautobot LCM Hardware End of Support per Part Number",
+        ["part_number"],
+    ),
+    "nautobot_lcm_hw_end_of_support_per_location": (
+        "Nautobot LCM Hardware End of Support per Location",
+        ["location"],
+    ),
+    "nautobot_lcm_vulnerability_risk_score": (
+        "Nautobot LCM Vulnerability Risk Score per Location and Platform",
+        ["scope", "name"],
+    ),
+    "nautobot_lcm_open_vulnerabilities_per_location": (
+        "Nautobot LCM open Vulnerabilities per Location and CVE severity",
+        ["location", "severity"],
+    ),
+    "nautobot_lcm_sw_end_of_support_per_software": (
+        "Nautobot LCM Devices running End of Support Software per Software",
+        ["platform", "version"],
+    ),
+    "nautobot_lcm_contracts_expiring_per_provider": (
+        "Nautobot LCM Contracts expiring within a number of days per Provider",
+        ["provider", "days"],
+    ),
+}
+
+
+def gauge_metric_family(name):
+    """Return a gauge of the metric family without samples."""
+    documentation, labels = METRIC_FAMILIES[name]
+    return GaugeMetricFamily(name, documentation, labels=labels)
+
+
+class CachedMetric:  # pylint: disable=too-many-instance-attributes
+    """Serve the metric families yielded by a metric generator from the cache.
+
+    Families are computed at most once per `metrics_cache_ttl` seconds across all Nautobot processes sharing the
+    cache and scrapes are served from the cached samples in the meantime. A lock makes the refresh single-flight:
+    while one scrape refreshes expired samples, concurrent scrapes are served the stale samples, or wait for the
+    refresh when there are none. With `metrics_cache_background_refresh`, expired samples are refreshed by a
+    background task instead and scrapes never wait for the database once the samples were computed.
+    """
+
+    def __init__(self, generator, ttl=None, background_refresh=None):
+        """Initialize CachedMetric.
+
+        Args:
+            generator (callable): metric generator function yielding GaugeMetricFamily
+            ttl (int): number of seconds samples are fresh for, the `metrics_cache_ttl` setting when None
+            background_refresh (bool): refresh expired samples in a background task, the
+                `metrics_cache_background_refresh` setting when None
+        """
+        self.generator = generator
+        self.name = generator.__name__
+        self.ttl = PLUGIN_CFG.get("metrics_cache_ttl", 0) if ttl is None else ttl
+        if background_refresh is None:
+            background_refresh = PLUGIN_CFG.get("metrics_cache_background_refresh", False)
+        self.background_refresh = background_refresh
+        prefix = f"{METRICS_CACHE_PREFIX}:{self.name}"
+        self.cache_key, self.lock_key, self.scheduled_key = f"{prefix}:samples", f"{prefix}:lock", f"{prefix}:scheduled"
+        self.__name__ = self.name
+        CACHED_METRICS[self.name] = self
+
+    def refresh(self):
+        """Compute the metric families and cache them, returning them."""
+        families = list(self.generator())
+        cache.set(self.cache_key, (time.time(), families), timeout=self.ttl + METRICS_STALE_TIMEOUT)
+
+        return families
+
+    def refresh_locked(self, blocking_timeout=None):
+        """Refresh the families unless another refresh holds the lock, returning them or None when not refreshed."""
+        lock = cache.lock(self.lock_key, timeout=METRICS_LOCK_TIMEOUT)
+        if not lock.acquire(blocking=blocking_timeout is not None, blocking_timeout=blocking_timeout):
+            return None
+        try:
+            # The samples may have been refreshed while waiting for the lock
+            computed_at, families = cache.get(self.cache_key, (0, None))
+            if families is not None and time.time() - computed_at < self.ttl:
+                return families
+            return self.refresh()
+        finally:
+            lock.release()
+
+    def schedule_refresh(self):
+        """Refresh the families in a background task, unless a refresh is already scheduled."""
+        # The flag expires on its own in case the scheduled task was lost
+        if cache.add(self.scheduled_key, True, timeout=METRICS_LOCK_TIMEOUT):
+            refresh_cached_metric.apply_async(args=(self.name,))
+
+    def __call__(self):
+        """Yield the cached metric families, refreshing them when expired.
+
+        Yields:
+            GaugeMetricFamily: Prometheus Metrics
+        """
+        computed_at, families = cache.get(self.cache_key, (0, None))
+        if families is not None and time.time() - computed_at < self.ttl:
+            yield from families
+            return
+
+        if families is not None and self.background_refresh:
+            self.schedule_refresh()
+            yield from families
+            return
+
+        refreshed = self.refresh_locked()
+        if refreshed is None and families is None:
+            # Another scrape is computing the first samples, wait for them rather than computing them too
+            refreshed = self.refresh_locked(blocking_timeout=METRICS_LOCK_TIMEOUT)
+        yield from refreshed if refreshed is not None else families or ()
+
+
+@nautobot_task
+def refresh_cached_metric(name):
+    """Refresh the cached samples of a metric, scheduled by `CachedMetric.schedule_refresh`."""
+    metric = CACHED_METRICS.get(name)
+    if metric is None:
+        return False
+    try:
+        return metric.refresh_locked() is not None
+    finally:
+        cache.delete(metric.scheduled_key)
+
 
 def metrics_lcm_validation_report_device_type():
     """Calculate number of devices with valid/invalid software by device_type.
@@ -24,11 +185,7 @@ def metrics_lcm_validation_report_device_type():
     Yields:
         GaugeMetricFamily: Prometheus Metrics
     """
-    device_software_compliance_gauge = GaugeMetricFamily(
-        "nautobot_lcm_software_compliance_per_device_type",
-        "Number of devices that have valid/invalid software by device_type",
-        labels=["device_type", "is_valid"],
-    )
+    device_software_compliance_gauge = gauge_metric_family("nautobot_lcm_software_compliance_per_device_type")
 
     device_types = DeviceType.objects.values("model")
 
@@ -74,10 +231,8 @@ def metrics_lcm_validation_report_inventory_item():
     Yields:
         GaugeMetricFamily: Prometheus Metrics
     """
-    inventory_item_software_compliance_gauge = GaugeMetricFamily(
-        "nautobot_lcm_software_compliance_per_inventory_item",
-        "Number of devices that have valid/invalid software by inventory item",
-        labels=["inventory_item", "is_valid"],
+    inventory_item_software_compliance_gauge = gauge_metric_family(
+        "nautobot_lcm_software_compliance_per_inventory_item"
     )
     inventory_item_part_ids = (
         InventoryItem.objects.exclude(part_id="").without_tree_fields().order_by().values("part_id").distinct()
@@ -118,134 +273,343 @@ def metrics_lcm_validation_report_inventory_item():
     yield inventory_item_software_compliance_gauge
 
 
-def metrics_lcm_hw_end_of_support_part_number():  # pylint: disable=too-many-locals
-    """Calculate number of End of Support devices and inventory items per Part Number.
+def get_device_location_names():
+    """Return names of the Locations that can hold Devices."""
+    device_location_types = LocationType.objects.filter(content_types=ContentType.objects.get_for_model(Device))
+
+    return Location.objects.filter(location_type__in=device_location_types).values_list("name", flat=True)
+
+
+class HardwareEndOfSupportSnapshot:
+    """Numbers of End of Support devices and inventory items per Part Number and per Location.
+
+    Counts are computed once, with one grouped query over Devices and one over InventoryItems, and shared by every
+    Hardware End of Support metric family generated from the snapshot.
+    """
+
+    def __init__(self, today=None):
+        """Initialize HardwareEndOfSupportSnapshot, computing the counts.
+
+        Args:
+            today (date): date End of Support is evaluated on, today when None
+        """
+        today = today or datetime.today().date()
+        eos_device_types, eos_part_ids = set(), set()
+        for device_type_id, part_id in HardwareLCM.objects.filter(end_of_support__lt=today).values_list(
+            "device_type_id", "inventory_item"
+        ):
+            if device_type_id is not None:
+                eos_device_types.add(device_type_id)
+            if part_id is not None:
+                eos_part_ids.add(part_id)
+
+        device_type_counts, location_counts = defaultdict(int), defaultdict(int)
+        for device_type_id, location_name, count in (
+            Device.objects.order_by()
+            .filter(device_type_id__in=eos_device_types)
+            .values("device_type_id", "location__name")
+            .annotate(count=Count("id"))
+            .values_list("device_type_id", "location__name", "count")
+        ):
+            device_type_counts[device_type_id] += count
+            location_counts[location_name] += count
+
+        # Inventory items without part_id are grouped by name, they are reported by name with a zero value
+        part_id_counts, zero_part_ids, zero_names = defaultdict(int), set(), set()
+        for part_id, blank_part_name, location_name, count in (
+            InventoryItem.objects.without_tree_fields()
+            .order_by()
+            .values(
+                "part_id",
+                blank_part_name=Case(When(part_id="", then=F("name")), default=Value("")),
+                location_name=F("device__location__name"),
+            )
+            .annotate(count=Count("id"))
+            .values_list("part_id", "blank_part_name", "location_name", "count")
+        ):
+            if part_id in eos_part_ids:
+                part_id_counts[part_id] += count
+                location_counts[location_name] += count
+            elif part_id:
+                zero_part_ids.add(part_id)
+            else:
+                zero_names.add(blank_part_name)
+
+        # Labels and values in the order of the samples: device types, then inventory items
+        self.part_number_counts = [
+            (part_number or model, device_type_counts.get(pk, 0))
+            for pk, part_number, model in DeviceType.objects.order_by().values_list("pk", "part_number", "model")
+        ]
+        self.part_number_counts.extend(part_id_counts.items())
+        self.part_number_counts.extend((label, 0) for label in (*zero_part_ids, *zero_names))
+
+        self.location_counts = [(name, location_counts.get(name, 0)) for name in get_device_location_names()]
+
+    def part_number_gauge(self):
+        """Return the End of Support devices and inventory items per Part Number gauge."""
+        hw_end_of_support_part_number_gauge = gauge_metric_family("nautobot_lcm_hw_end_of_support_per_part_number")
+        for part_number, count in self.part_number_counts:
+            hw_end_of_support_part_number_gauge.add_metric(labels=[part_number], value=count)
+
+        return hw_end_of_support_part_number_gauge
+
+    def location_gauge(self):
+        """Return the End of Support devices and inventory items per Location gauge."""
+        hw_end_of_support_location_gauge = gauge_metric_family("nautobot_lcm_hw_end_of_support_per_location")
+        for location_name, count in self.location_counts:
+            hw_end_of_support_location_gauge.add_metric(labels=[location_name], value=count)
+
+        return hw_end_of_support_location_gauge
+
+
+# Hardware End of Support metric name => HardwareEndOfSupportSnapshot method building its gauge
+HW_END_OF_SUPPORT_METRICS = {
+    "nautobot_lcm_hw_end_of_support_per_part_number": HardwareEndOfSupportSnapshot.part_number_gauge,
+    "nautobot_lcm_hw_end_of_support_per_location": HardwareEndOfSupportSnapshot.location_gauge,
+}
+
+
+def metrics_lcm_hw_end_of_support(names=None):
+    """Calculate the Hardware End of Support metrics from a single snapshot of the End of Support counts.
+
+    Args:
+        names (iterable): names of the metrics to generate, the Hardware End of Support metrics listed in the
+            `enabled_metrics` setting when None
 
     Yields:
         GaugeMetricFamily: Prometheus Metrics
     """
-    hw_end_of_support_part_number_gauge = GaugeMetricFamily(
-        "nautobot_lcm_hw_end_of_support_per_part_number",
-        "Nautobot LCM Hardware End of Support per Part Number",
-        labels=["part_number"],
-    )
+    if names is None:
+        names = [name for name in HW_END_OF_SUPPORT_METRICS if name in PLUGIN_CFG["enabled_metrics"]]
+    if not names:
+        return
 
-    today = datetime.today().date()
-    hw_end_of_support = HardwareLCM.objects.filter(end_of_support__lt=today)
-    hw_end_of_support_device_types = hw_end_of_support.exclude(device_type__isnull=True).values_list(
-        "device_type", flat=True
-    )
-    hw_end_of_support_invitems = hw_end_of_support.exclude(inventory_item__isnull=True).values_list(
-        "inventory_item", flat=True
-    )
+    snapshot = HardwareEndOfSupportSnapshot()
+    for name in names:
+        yield HW_END_OF_SUPPORT_METRICS[name](snapshot)
 
-    # Generate metrics with counts for out of support devices per device type
-    for part_number, model, device_count in (
-        DeviceType.objects.order_by()
-        .annotate(num_devices=Count("devices", filter=Q(id__in=hw_end_of_support_device_types)))
-        .values_list("part_number", "model", "num_devices")
-    ):
-        hw_end_of_support_part_number_gauge.add_metric(
-            labels=[part_number if part_number else model], value=device_count
-        )
 
-    # Generate metrics with counts for out of support inventory items per part id
-    for part_id, inv_item_count in (
-        InventoryItem.objects.without_tree_fields()
-        .order_by()
-        .filter(part_id__in=hw_end_of_support_invitems)
-        .values("part_id")
-        .annotate(inv_item_count=Count("id"))
-        .values_list("part_id", "inv_item_count")
-    ):
-        hw_end_of_support_part_number_gauge.add_metric(labels=[part_id], value=inv_item_count)
-
-    # Set metric value to 0 for inventory items that don't have corresponding HW notice
-    # Case for inventory items that have non-empty part_id attribute
-    for inv_item_part_id in (
-        InventoryItem.objects.order_by()
-        .filter(~Q(part_id__in=hw_end_of_support_invitems) & ~Q(part_id=""))
-        .values_list("part_id", flat=True)
-        .distinct()
-    ):
-        hw_end_of_support_part_number_gauge.add_metric(labels=[inv_item_part_id], value=0)
-
-    # Set metric value to 0 for inventory items that don't have corresponding HW notice
-    # Case for inventory items that have empty part_id attribute
-    for inv_item_name in (
-        InventoryItem.objects.order_by()
-        .filter(~Q(part_id__in=hw_end_of_support_invitems) & Q(part_id=""))
-        .values_list("name", flat=True)
-        .distinct()
-    ):
-        hw_end_of_support_part_number_gauge.add_metric(labels=[inv_item_name], value=0)
+def metrics_lcm_hw_end_of_support_part_number():
+    """Calculate number of End of Support devices and inventory items per Part Number.
 
-    yield hw_end_of_support_part_number_gauge
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+    """
+    yield from metrics_lcm_hw_end_of_support(["nautobot_lcm_hw_end_of_support_per_part_number"])
 
 
-def metrics_lcm_hw_end_of_support_location():  # pylint: disable=too-many-locals
+def metrics_lcm_hw_end_of_support_location():
     """Calculate number of End of Support devices and inventory items per Location.
 
     Yields:
         GaugeMetricFamily: Prometheus Metrics
     """
-    hw_end_of_support_location_gauge = GaugeMetricFamily(
-        "nautobot_lcm_hw_end_of_support_per_location",
-        "Nautobot LCM Hardware End of Support per Location",
-        labels=["location"],
-    )
+    yield from metrics_lcm_hw_end_of_support(["nautobot_lcm_hw_end_of_support_per_location"])
 
-    today = datetime.today().date()
-    hw_end_of_support = HardwareLCM.objects.filter(end_of_support__lt=today)
-    hw_end_of_support_device_types = hw_end_of_support.exclude(device_type__isnull=True).values_list(
-        "device_type", flat=True
-    )
-    hw_end_of_support_invitems = hw_end_of_support.exclude(inventory_item__isnull=True).values_list(
-        "inventory_item", flat=True
-    )
-    # Initialize per location count to 0 for all locations
-    device_location_types = LocationType.objects.filter(content_types=ContentType.objects.get_for_model(Device))
-    init_location_counts = (
-        Location.objects.filter(location_type__in=device_location_types)
-        .values(location_name=F("name"))
-        .annotate(location_count=Value(0, output_field=IntegerField()))
-    )
-    # Get count of out of hw support devices per location
-    hw_end_of_support_per_location_devices = (
-        Device.objects.order_by()
-        .filter(device_type_id__in=hw_end_of_support_device_types)
-        .values(location_name=F("location__name"))
-        .annotate(location_count=Count("id"))
-    )
-    # Get count of out of hw support inventory items per location
-    hw_end_of_support_per_location_invitems = (
-        InventoryItem.objects.without_tree_fields()
+
+def metrics_lcm_vulnerability_risk_score():
+    """Report the vulnerability risk scores per Location and Platform computed by the Score Vulnerability Risk job.
+
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+    """
+    vulnerability_risk_score_gauge = gauge_metric_family("nautobot_lcm_vulnerability_risk_score")
+
+    for scope, location_name, platform_name, score in VulnerabilityRiskScore.objects.filter(
+        scope__in=[RiskScoreScopeChoices.LOCATION, RiskScoreScopeChoices.PLATFORM]
+    ).values_list("scope", "location__name", "platform__name", "score"):
+        vulnerability_risk_score_gauge.add_metric(labels=[scope, location_name or platform_name or ""], value=score)
+
+    yield vulnerability_risk_score_gauge
+
+
+def metrics_lcm_open_vulnerabilities_location():
+    """Calculate number of open vulnerabilities per Location and CVE severity.
+
+    Vulnerabilities of inventory items count in the Location of their device. Vulnerabilities with a status listed
+    in the `vulnerability_closed_statuses` setting are not open.
+
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+    """
+    open_vulnerabilities_location_gauge = gauge_metric_family("nautobot_lcm_open_vulnerabilities_per_location")
+
+    vulnerabilities = VulnerabilityLCM.objects.filter(cve__isnull=False)
+    closed_statuses = PLUGIN_CFG.get("vulnerability_closed_statuses", [])
+    if closed_statuses:
+        vulnerabilities = vulnerabilities.exclude(status__name__in=closed_statuses)
+    counts = defaultdict(int)
+    for location_name, severity, count in (
+        vulnerabilities.order_by()
+        .values(
+            location_name=Coalesce("device__location__name", "inventory_item__device__location__name"),
+            severity=F("cve__severity"),
+        )
+        .annotate(count=Count("id"))
+        .values_list("location_name", "severity", "count")
+    ):
+        counts[location_name, severity] += count
+
+    for location_name in get_device_location_names():
+        for severity, _ in CVESeverityChoices.CHOICES:
+            open_vulnerabilities_location_gauge.add_metric(
+                labels=[location_name, severity], value=counts.get((location_name, severity), 0)
+            )
+
+    yield open_vulnerabilities_location_gauge
+
+
+def metrics_lcm_sw_end_of_support_software():
+    """Calculate number of devices running each End of Support Software.
+
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+    """
+    sw_end_of_support_software_gauge = gauge_metric_family("nautobot_lcm_sw_end_of_support_per_software")
+
+    eos_software = SoftwareLCM.objects.filter(end_of_support__lt=datetime.today().date())
+    device_counts = dict(
+        RelationshipAssociation.objects.filter(
+            relationship__key="device_soft",
+            destination_type=ContentType.objects.get_for_model(Device),
+            source_id__in=eos_software.values("pk"),
+        )
         .order_by()
-        .filter(part_id__in=hw_end_of_support_invitems)
-        .values(location_name=F("device__location__name"))
-        .annotate(location_count=Count("id"))
+        .values("source_id")
+        .annotate(count=Count("id"))
+        .values_list("source_id", "count")
     )
 
-    # Build subqueries used in the final query offloading count sum to the DB
-    hw_end_of_support_per_location_devices_sq = Subquery(
-        hw_end_of_support_per_location_devices.filter(location_name=OuterRef("location_name")).values_list(
-            "location_count"
+    for pk, platform_name, version in eos_software.order_by().values_list("pk", "device_platform__name", "version"):
+        sw_end_of_support_software_gauge.add_metric(labels=[platform_name, version], value=device_counts.get(pk, 0))
+
+    yield sw_end_of_support_software_gauge
+
+
+def metrics_lcm_contracts_expiring_provider():
+    """Calculate number of contracts expiring within 30, 60 and 90 days per Provider.
+
+    Contracts without provider are reported with an empty provider label.
+
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+    """
+    contracts_expiring_provider_gauge = gauge_metric_family("nautobot_lcm_contracts_expiring_per_provider")
+
+    today = datetime.today().date()
+    annotations = {
+        f"within_{days}": Count("id", filter=Q(end__lte=today + timedelta(days=days))) for days in CONTRACT_EXPIRY_DAYS
+    }
+    counts = {
+        provider_name: row
+        for provider_name, *row in ContractLCM.objects.filter(
+            end__gte=today, end__lte=today + timedelta(days=max(CONTRACT_EXPIRY_DAYS))
         )
-    )
-    hw_end_of_support_per_location_invitems_sq = Subquery(
-        hw_end_of_support_per_location_invitems.filter(location_name=OuterRef("location_name")).values_list(
-            "location_count"
+        .order_by()
+        .values(provider_name=Coalesce("provider__name", Value("")))
+        .annotate(**annotations)
+        .values_list("provider_name", *annotations)
+    }
+
+    provider_names = list(ProviderLCM.objects.values_list("name", flat=True))
+    if "" in counts:
+        provider_names.append("")
+    for provider_name in provider_names:
+        row = counts.get(provider_name, [0] * len(CONTRACT_EXPIRY_DAYS))
+        for days, count in zip(CONTRACT_EXPIRY_DAYS, row):
+            contracts_expiring_provider_gauge.add_metric(labels=[provider_name, str(days)], value=count)
+
+    yield contracts_expiring_provider_gauge
+
+
+# Metric family name => generator yielding it, Hardware End of Support families are generated together
+METRIC_GENERATORS = {
+    "nautobot_lcm_software_compliance_per_device_type": metrics_lcm_validation_report_device_type,
+    "nautobot_lcm_software_compliance_per_inventory_item": metrics_lcm_validation_report_inventory_item,
+    "nautobot_lcm_vulnerability_risk_score": metrics_lcm_vulnerability_risk_score,
+    "nautobot_lcm_open_vulnerabilities_per_location": metrics_lcm_open_vulnerabilities_location,
+    "nautobot_lcm_sw_end_of_support_per_software": metrics_lcm_sw_end_of_support_software,
+    "nautobot_lcm_contracts_expiring_per_provider": metrics_lcm_contracts_expiring_provider,
+}
+# Validation engine `result_obj_field` => metric families computed from its validation results
+VALIDATION_METRICS = {
+    "device": ["nautobot_lcm_software_compliance_per_device_type"],
+    "inventory_item": ["nautobot_lcm_software_compliance_per_inventory_item"],
+}
+# Metric families computed from the vulnerabilities created by the vulnerability generation
+VULNERABILITY_METRICS = ["nautobot_lcm_open_vulnerabilities_per_location"]
+# Metric families computed from the vulnerability risk scores
+RISK_SCORE_METRICS = ["nautobot_lcm_vulnerability_risk_score"]
+
+
+def write_metrics_snapshot(names=None):
+    """Compute metric families and replace their samples stored in the MetricSnapshot table.
+
+    Nothing is written unless the `metrics_source` setting is `snapshot`, families not listed in `enabled_metrics`
+    are skipped.
+
+    Args:
+        names (iterable): names of the metric families to compute, all enabled metric families when None
+
+    Returns:
+        int: number of samples written
+    """
+    enabled = PLUGIN_CFG["enabled_metrics"]
+    names = [name for name in (enabled if names is None else names) if name in enabled and name in METRIC_FAMILIES]
+    if PLUGIN_CFG.get("metrics_source", "live") != "snapshot" or not names:
+        return 0
+
+    computed_at = timezone.now()
+    families = list(metrics_lcm_hw_end_of_support([name for name in names if name in HW_END_OF_SUPPORT_METRICS]))
+    for name in names:
+        if name in METRIC_GENERATORS:
+            families.extend(METRIC_GENERATORS[name]())
+    records = [
+        MetricSnapshot(
+            family=family.name,
+            labels=[sample.labels[label] for label in METRIC_FAMILIES[family.name][1]],
+            value=sample.value,
+            computed_at=computed_at,
         )
+        for family in families
+        for sample in family.samples
+    ]
+    with transaction.atomic():
+        MetricSnapshot.objects.filter(family__in=names).delete()
+        MetricSnapshot.objects.bulk_create(records, batch_size=1000)
+
+    return len(records)
+
+
+def metrics_lcm_snapshot():
+    """Report the enabled metric families from the samples stored in the MetricSnapshot table.
+
+    The age of the samples of every family is reported by the `nautobot_lcm_metrics_snapshot_computed_at` gauge.
+
+    Yields:
+        GaugeMetricFamily: Prometheus Metrics
+    """
+    families = {name: gauge_metric_family(name) for name in METRIC_FAMILIES if name in PLUGIN_CFG["enabled_metrics"]}
+    computed = {}
+    for family, labels, value, computed_at in (
+        MetricSnapshot.objects.filter(family__in=families)
+        .order_by()
+        .values_list("family", "labels", "value", "computed_at")
+    ):
+        families[family].add_metric(labels=labels, value=value)
+        computed[family] = computed_at
+
+    yield from families.values()
+
+    snapshot_computed_at_gauge = GaugeMetricFamily(
+        "nautobot_lcm_metrics_snapshot_computed_at",
+        "Nautobot LCM time the metric family samples were computed at, in seconds since the epoch",
+        labels=["family"],
     )
-    # Build query summing counts per site and generate corresponding metrics
-    for location_name, total_count in init_location_counts.annotate(
-        total_count=F("location_count")
-        + Coalesce(hw_end_of_support_per_location_devices_sq, 0)
-        + Coalesce(hw_end_of_support_per_location_invitems_sq, 0)
-    ).values_list("location_name", "total_count"):
-        hw_end_of_support_location_gauge.add_metric(labels=[location_name], value=total_count)
+    for family, computed_at in computed.items():
+        snapshot_computed_at_gauge.add_metric(labels=[family], value=computed_at.timestamp())
 
-    yield hw_end_of_support_location_gauge
+    yield snapshot_computed_at_gauge
 
 
 metrics = []
@@ -253,7 +617,22 @@ if "nautobot_lcm_software_compliance_per_device_type" in PLUGIN_CFG["enabled_met
     metrics.append(metrics_lcm_validation_report_device_type)
 if "nautobot_lcm_software_compliance_per_inventory_item" in PLUGIN_CFG["enabled_metrics"]:
     metrics.append(metrics_lcm_validation_report_inventory_item)
-if "nautobot_lcm_hw_end_of_support_per_part_number" in PLUGIN_CFG["enabled_metrics"]:
-    metrics.append(metrics_lcm_hw_end_of_support_part_number)
-if "nautobot_lcm_hw_end_of_support_per_location" in PLUGIN_CFG["enabled_metrics"]:
-    metrics.append(metrics_lcm_hw_end_of_support_location)
+# Hardware End of Support families are generated together, from one snapshot per scrape
+if any(name in PLUGIN_CFG["enabled_metrics"] for name in HW_END_OF_SUPPORT_METRICS):
+    metrics.append(metrics_lcm_hw_end_of_support)
+if "nautobot_lcm_vulnerability_risk_score" in PLUGIN_CFG["enabled_metrics"]:
+    metrics.append(metrics_lcm_vulnerability_risk_score)
+if "nautobot_lcm_open_vulnerabilities_per_location" in PLUGIN_CFG["enabled_metrics"]:
+    metrics.append(metrics_lcm_open_vulnerabilities_location)
+if "nautobot_lcm_sw_end_of_support_per_software" in PLUGIN_CFG["enabled_metrics"]:
+    metrics.append(metrics_lcm_sw_end_of_support_software)
+if "nautobot_lcm_contracts_expiring_per_provider" in PLUGIN_CFG["enabled_metrics"]:
+    metrics.append(metrics_lcm_contracts_expiring_provider)
+# Samples are precomputed by jobs, a single query serves all families
+if metrics and PLUGIN_CFG.get("metrics_source", "live") == "snapshot":
+    metrics = [metrics_lcm_snapshot]
+if PLUGIN_CFG.get("metrics_cache_ttl", 0) > 0:
+    metrics = [CachedMetric(metric) for metric in metrics]
+# Job instrumentation is recorded by the jobs into the cache, it is served as is
+if JOB_INSTRUMENTATION_METRIC in PLUGIN_CFG["enabled_metrics"]:
+    metrics.append(metrics_lcm_job_instrumentation)
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:06
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0022_alter_softwareimagelcm_inventory_items_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ValidationComplianceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("snapshot_time", models.DateTimeField(db_index=True)),
+                ("object_type", models.CharField(max_length=255)),
+                ("run_type", models.CharField(max_length=255)),
+                ("group_by", models.CharField(max_length=255)),
+                ("group_id", models.UUIDField(blank=True, null=True)),
+                ("group_name", models.CharField(blank=True, max_length=255)),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("valid", models.PositiveIntegerField(default=0)),
+                ("invalid", models.PositiveIntegerField(default=0)),
+                ("no_software", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Validation Compliance Snapshot",
+                "ordering": ("-snapshot_time", "object_type", "group_by", "group_name"),
+                "indexes": [
+                    models.Index(
+                        fields=["object_type", "group_by", "snapshot_time"], name="nautobot_de_object__6143c8_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:14
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0023_validationcompliancesnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ValidationCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("object_type", models.CharField(max_length=255, unique=True)),
+                ("run_id", models.UUIDField(default=uuid.uuid4)),
+                ("run_type", models.CharField(max_length=255)),
+                ("job_run_time", models.DateTimeField()),
+                ("since", models.DateTimeField(blank=True, null=True)),
+                ("cursor", models.UUIDField(blank=True, null=True)),
+                ("counts", models.JSONField(blank=True, default=dict)),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Validation Checkpoint",
+                "ordering": ("object_type",),
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:46
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.module_loading import import_string
+
+# Copy of the version parsing of `nautobot_device_lifecycle_mgmt.versions` as of this migration, so that later
+# changes to the app code don't change the sort keys computed here.
+COMPONENT_PATTERN = re.compile(r"\d+|[a-z]+")
+# Platform network driver or name => (versions the parser understands, parts of the version ignored for ordering)
+VERSION_PATTERNS = {
+    "cisco_ios": (re.compile(r"^\d+\.\d+\(\d+[a-z]?\)[A-Z]*\d*[a-z]?$"), None),
+    "cisco_xe": (re.compile(r"^([A-Za-z]+-)?\d+\.\d+\.\d+"), re.compile(r"^[A-Za-z]+-")),
+    "cisco_nxos": (re.compile(r"^\d+\.\d+\(\d+[a-z]?\)([A-Z]+\d+\(\d+[a-z]?\))?$"), None),
+    "juniper_junos": (re.compile(r"^\d+\.\d+[A-Z]\d+"), None),
+    "arista_eos": (re.compile(r"^\d+\.\d+\.\d+(\.\d+)*[A-Z]*$"), re.compile(r"[A-Z]+$")),
+}
+
+
+def get_version_sort_key(platform, version):
+    """
+    Return the sort key of version on platform, parsers configured with the `version_parsers` setting take precedence.
+    """
+    pattern = ignore_pattern = None
+    version_parsers = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"].get("version_parsers", {})
+    for name in (platform.network_driver, platform.name):
+        if not name:
+            continue
+        if name in version_parsers:
+            return import_string(version_parsers[name])().sort_key(version)
+        if name in VERSION_PATTERNS:
+            pattern, ignore_pattern = VERSION_PATTERNS[name]
+            break
+
+    version = version.strip()
+    if ignore_pattern is not None and (pattern is None or pattern.match(version)):
+        version = ignore_pattern.sub("", version)
+    key = "".join(
+        f"{int(component):010d}" if component.isdigit() else component
+        for component in COMPONENT_PATTERN.findall(version.lower())
+    )
+
+    return key[:255]
+
+
+def populate_version_sort_keys(apps, schema_editor):
+    """
+    Store the version sort key of existing SoftwareLCM objects.
+    """
+    SoftwareLCM = apps.get_model("nautobot_device_lifecycle_mgmt", "SoftwareLCM")
+    softwares = list(SoftwareLCM.objects.select_related("device_platform"))
+    for software in softwares:
+        software.version_sort_key = get_version_sort_key(software.device_platform, software.version)
+    SoftwareLCM.objects.bulk_update(softwares, ["version_sort_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0024_validationcheckpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="softwarelcm",
+            name="version_sort_key",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="softwarelcm",
+            index=models.Index(fields=["device_platform", "version_sort_key"], name="nautobot_de_device__7bb813_idx"),
+        ),
+        migrations.RunPython(code=populate_version_sort_keys, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.30 on 2026-10-17 04:56
+
+import uuid
+
+import django.core.serializers.json
+import django.db.models.deletion
+import nautobot.core.models.fields
+import nautobot.extras.models.mixins
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0025_softwarelcm_version_sort_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VulnerabilityExposure",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True, null=True)),
+                ("last_updated", models.DateTimeField(auto_now=True, null=True)),
+                (
+                    "_custom_field_data",
+                    models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder),
+                ),
+                ("critical_count", models.PositiveIntegerField(default=0)),
+                ("high_count", models.PositiveIntegerField(default=0)),
+                ("medium_count", models.PositiveIntegerField(default=0)),
+                ("low_count", models.PositiveIntegerField(default=0)),
+                ("none_count", models.PositiveIntegerField(default=0)),
+                ("total_count", models.PositiveIntegerField(default=0)),
+                ("max_cvss_v3", models.FloatField(blank=True, null=True)),
+                ("oldest_published_date", models.DateField(blank=True, null=True)),
+                (
+                    "device",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vulnerability_exposure",
+                        to="dcim.device",
+                    ),
+                ),
+                (
+                    "inventory_item",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vulnerability_exposure",
+                        to="dcim.inventoryitem",
+                    ),
+                ),
+                ("tags", nautobot.core.models.fields.TagsField(through="extras.TaggedItem", to="extras.Tag")),
+            ],
+            options={
+                "verbose_name": "Vulnerability Exposure",
+                "ordering": ("-critical_count", "-high_count", "-total_count"),
+                "indexes": [
+                    models.Index(
+                        fields=["critical_count", "high_count", "total_count"], name="nautobot_de_critica_be49e4_idx"
+                    ),
+                    models.Index(fields=["high_count"], name="nautobot_de_high_co_b6a95d_idx"),
+                    models.Index(fields=["medium_count"], name="nautobot_de_medium__149ace_idx"),
+                    models.Index(fields=["low_count"], name="nautobot_de_low_cou_a106ad_idx"),
+                    models.Index(fields=["total_count"], name="nautobot_de_total_c_44c66c_idx"),
+                    models.Index(fields=["max_cvss_v3"], name="nautobot_de_max_cvs_0c826f_idx"),
+                    models.Index(fields=["oldest_published_date"], name="nautobot_de_oldest__db42a7_idx"),
+                ],
+            },
+            bases=(
+                nautobot.extras.models.mixins.DynamicGroupMixin,
+                nautobot.extras.models.mixins.NotesMixin,
+                models.Model,
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:19
+
+import uuid
+
+import django.core.serializers.json
+import django.db.models.deletion
+import nautobot.core.models.fields
+import nautobot.extras.models.mixins
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0026_vulnerabilityexposure"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VulnerabilityRiskScore",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True, null=True)),
+                ("last_updated", models.DateTimeField(auto_now=True, null=True)),
+                (
+                    "_custom_field_data",
+                    models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder),
+                ),
+                ("scope", models.CharField(max_length=255)),
+                ("score", models.FloatField(default=0)),
+                ("max_device_score", models.FloatField(default=0)),
+                ("device_count", models.PositiveIntegerField(default=0)),
+                ("vulnerability_count", models.PositiveIntegerField(default=0)),
+                ("computed_at", models.DateTimeField()),
+                (
+                    "device",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vulnerability_risk_scores",
+                        to="dcim.device",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vulnerability_risk_scores",
+                        to="dcim.location",
+                    ),
+                ),
+                (
+                    "platform",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vulnerability_risk_scores",
+                        to="dcim.platform",
+                    ),
+                ),
+                ("tags", nautobot.core.models.fields.TagsField(through="extras.TaggedItem", to="extras.Tag")),
+            ],
+            options={
+                "verbose_name": "Vulnerability Risk Score",
+                "ordering": ("scope", "-score"),
+                "indexes": [models.Index(fields=["scope", "score"], name="nautobot_de_scope_352e9f_idx")],
+            },
+            bases=(
+                nautobot.extras.models.mixins.DynamicGroupMixin,
+                nautobot.extras.models.mixins.NotesMixin,
+                models.Model,
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-17 05:32
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("nautobot_device_lifecycle_mgmt", "0027_vulnerabilityriskscore"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True
+                    ),
+                ),
+                ("family", models.CharField(db_index=True, max_length=255)),
+                ("labels", models.JSONField(blank=True, default=list)),
+                ("value", models.FloatField()),
+                ("computed_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Metric Snapshot",
+                "ordering": ("family",),
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 """Django models for the Lifecycle Management app."""
 
+import uuid
+from collections import defaultdict
 from datetime import date, datetime
 
 from django.conf import settings
@@ -13,6 +15,7 @@ try:
 except ImportError:
     CHARFIELD_MAX_LENGTH = 255
 
+from nautobot.core.models import BaseModel
 from nautobot.core.models.generics import OrganizationalModel, PrimaryModel
 from nautobot.core.models.querysets import RestrictedQuerySet
 from nautobot.dcim.models import Device, DeviceType, InventoryItem
@@ -28,6 +31,7 @@ from nautobot_device_lifecycle_mgmt.software_filters import (
     InventoryItemSoftwareImageFilter,
     InventoryItemValidatedSoftwareFilter,
 )
+from nautobot_device_lifecycle_mgmt.versions import get_version_sort_key, version_range_q
 
 
 @extras_features(
@@ -148,6 +152,45 @@ class SoftwareLCMQuerySet(RestrictedQuerySet):
 
         return qs
 
+    def match_version_ranges(self, ranges):
+        """Return pks of the `SoftwareLCM` with versions in any of the ranges, with one range query per platform.
+
+        Args:
+            ranges (iterable): dicts with `platform` (Platform) and the optional `start`, `end`, `start_inclusive`
+                and `end_inclusive` keys of `version_range_q`
+
+        Returns:
+            set: SoftwareLCM pks
+        """
+        platform_ranges = defaultdict(list)
+        for version_range in ranges:
+            platform_ranges[version_range["platform"]].append(version_range)
+
+        software_ids = set()
+        for platform, platform_version_ranges in platform_ranges.items():
+            ranges_q = models.Q()
+            for version_range in platform_version_ranges:
+                ranges_q |= version_range_q(**version_range)
+            software_ids.update(self.filter(ranges_q, device_platform=platform).values_list("pk", flat=True))
+
+        return software_ids
+
+    def update_version_sort_keys(self):
+        """Recompute the stored version sort keys, for example after the platform network driver changed.
+
+        Returns:
+            int: number of updated `SoftwareLCM`
+        """
+        to_update = []
+        for software in self.select_related("device_platform"):
+            version_sort_key = get_version_sort_key(software.device_platform, software.version)
+            if software.version_sort_key != version_sort_key:
+                software.version_sort_key = version_sort_key
+                to_update.append(software)
+        self.model.objects.bulk_update(to_update, ["version_sort_key"], batch_size=1000)
+
+        return len(to_update)
+
 
 @extras_features(
     "custom_fields",
@@ -170,6 +213,9 @@ class SoftwareLCM(PrimaryModel):
     documentation_url = models.URLField(blank=True, verbose_name="Documentation URL")
     long_term_support = models.BooleanField(verbose_name="Long Term Support", default=False)
     pre_release = models.BooleanField(verbose_name="Pre-Release", default=False)
+    version_sort_key = models.CharField(
+        max_length=CHARFIELD_MAX_LENGTH, blank=True, default="", editable=False, verbose_name="Version Sort Key"
+    )
 
     class Meta:
         """Meta attributes for SoftwareLCM."""
@@ -180,11 +226,17 @@ class SoftwareLCM(PrimaryModel):
             "device_platform",
             "version",
         )
+        indexes = [models.Index(fields=["device_platform", "version_sort_key"])]
 
     def __str__(self):
         """String representation of SoftwareLCM."""
         return f"{self.device_platform} - {self.version}"
 
+    def save(self, *args, **kwargs):
+        """Override save to store the sort key of the version."""
+        self.version_sort_key = get_version_sort_key(self.device_platform, self.version)
+        super().save(*args, **kwargs)
+
     objects = SoftwareLCMQuerySet.as_manager()
 
 
@@ -265,6 +317,22 @@ class ValidatedSoftwareLCMQuerySet(RestrictedQuerySet):
 
         return qs
 
+    def valid_on(self, on_date):
+        """Return `ValidatedSoftwareLCM` valid on the given date."""
+        return self.filter(validity_window_q(on_date))
+
+
+def validity_window_q(on_date, prefix=""):
+    """Return Q object matching `ValidatedSoftwareLCM` whose validity window contains the given date.
+
+    Args:
+        on_date (date): date to evaluate validity on
+        prefix (str): lookup prefix leading to `ValidatedSoftwareLCM` from the filtered model
+    """
+    return models.Q(**{f"{prefix}start__lte": on_date}) & (
+        models.Q(**{f"{prefix}end__isnull": True}) | models.Q(**{f"{prefix}end__gte": on_date})
+    )
+
 
 @extras_features(
     "custom_fields",
@@ -303,11 +371,14 @@ class ValidatedSoftwareLCM(PrimaryModel):
     @property
     def valid(self):
         """Return True if software is currently valid, else return False."""
-        today = date.today()
+        return self.valid_on(date.today())
+
+    def valid_on(self, on_date):
+        """Return True if software is valid on the given date, else return False."""
         if self.end:
-            return self.end >= today >= self.start
+            return self.end >= on_date >= self.start
 
-        return today >= self.start
+        return on_date >= self.start
 
     def save(self, *args, **kwargs):
         """Override save to assert a full clean."""
@@ -331,6 +402,31 @@ class ValidatedSoftwareLCM(PrimaryModel):
     objects = ValidatedSoftwareLCMQuerySet.as_manager()
 
 
+class SoftwareValidationResultQuerySet(RestrictedQuerySet):
+    """Queryset for software validation result objects."""
+
+    def valid_on_q(self, on_date):
+        """Return Q object matching results whose software is validated on the given date.
+
+        Unlike `is_validated`, which is evaluated on the day of the validation run, validity is evaluated against the
+        validity windows of the `valid_software` recorded by the last run.
+        """
+        valid_software_field = self.model._meta.get_field("valid_software")
+        return models.Q(
+            models.Exists(
+                ValidatedSoftwareLCM.objects.filter(
+                    validity_window_q(on_date),
+                    software=models.OuterRef("software"),
+                    **{valid_software_field.related_query_name(): models.OuterRef("pk")},
+                )
+            )
+        )
+
+    def valid_on(self, on_date):
+        """Return results whose software is validated on the given date."""
+        return self.filter(self.valid_on_q(on_date))
+
+
 @extras_features(
     "graphql",
 )
@@ -368,6 +464,8 @@ class DeviceSoftwareValidationResult(PrimaryModel):
             msg = f"Device: {self.device} - Not Valid"
         return msg
 
+    objects = SoftwareValidationResultQuerySet.as_manager()
+
 
 @extras_features(
     "graphql",
@@ -408,6 +506,83 @@ class InventoryItemSoftwareValidationResult(PrimaryModel):
             )
         return msg
 
+    objects = SoftwareValidationResultQuerySet.as_manager()
+
+
+class ValidationComplianceSnapshot(BaseModel):
+    """Software validation counts of a group of objects, recorded at the end of a validation run."""
+
+    snapshot_time = models.DateTimeField(db_index=True)
+    object_type = models.CharField(max_length=CHARFIELD_MAX_LENGTH, choices=choices.ComplianceSnapshotObjectTypeChoices)
+    run_type = models.CharField(max_length=CHARFIELD_MAX_LENGTH, choices=choices.ReportRunTypeChoices)
+    group_by = models.CharField(max_length=CHARFIELD_MAX_LENGTH, choices=choices.ComplianceSnapshotGroupChoices)
+    group_id = models.UUIDField(null=True, blank=True)
+    group_name = models.CharField(max_length=CHARFIELD_MAX_LENGTH, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    valid = models.PositiveIntegerField(default=0)
+    invalid = models.PositiveIntegerField(default=0)
+    no_software = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        """Meta attributes for ValidationComplianceSnapshot."""
+
+        verbose_name = "Validation Compliance Snapshot"
+        ordering = ("-snapshot_time", "object_type", "group_by", "group_name")
+        indexes = [models.Index(fields=["object_type", "group_by", "snapshot_time"])]
+
+    def __str__(self):
+        """String representation of ValidationComplianceSnapshot."""
+        return f"{self.get_object_type_display()} - {self.group_name or self.get_group_by_display()} - {self.snapshot_time}"
+
+    @property
+    def valid_percent(self):
+        """Percentage of objects running valid software."""
+        return round(self.valid / self.total * 100, 2) if self.total else 0
+
+
+class ValidationCheckpoint(BaseModel):
+    """Progress of a software validation run, saved after each chunk so that an interrupted run can be resumed."""
+
+    object_type = models.CharField(
+        max_length=CHARFIELD_MAX_LENGTH, choices=choices.ComplianceSnapshotObjectTypeChoices, unique=True
+    )
+    run_id = models.UUIDField(default=uuid.uuid4)
+    run_type = models.CharField(max_length=CHARFIELD_MAX_LENGTH, choices=choices.ReportRunTypeChoices)
+    job_run_time = models.DateTimeField()
+    since = models.DateTimeField(null=True, blank=True)
+    cursor = models.UUIDField(null=True, blank=True)
+    counts = models.JSONField(default=dict, blank=True)
+    last_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta attributes for ValidationCheckpoint."""
+
+        verbose_name = "Validation Checkpoint"
+        ordering = ("object_type",)
+
+    def __str__(self):
+        """String representation of ValidationCheckpoint."""
+        return f"{self.get_object_type_display()} - {self.run_id}"
+
+
+class MetricSnapshot(BaseModel):
+    """Sample of a Prometheus metric family, precomputed by a job and served by the metrics endpoint."""
+
+    family = models.CharField(max_length=CHARFIELD_MAX_LENGTH, db_index=True)
+    labels = models.JSONField(default=list, blank=True)
+    value = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        """Meta attributes for MetricSnapshot."""
+
+        verbose_name = "Metric Snapshot"
+        ordering = ("family",)
+
+    def __str__(self):
+        """String representation of MetricSnapshot."""
+        return f"{self.family}{{{', '.join(self.labels)}}} {self.value}"
+
 
 @extras_features(
     "custom_fields",
@@ -652,3 +827,110 @@ class VulnerabilityLCM(PrimaryModel):
         if self.cve:
             name += f" - CVE: {self.cve}"
         return name
+
+
+@extras_features(
+    "graphql",
+)
+class VulnerabilityExposure(PrimaryModel):
+    """Rollup of the open vulnerabilities of a Device or InventoryItem, refreshed by the vulnerability generation."""
+
+    device = models.OneToOneField(
+        to="dcim.Device",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="vulnerability_exposure",
+    )
+    inventory_item = models.OneToOneField(
+        to="dcim.InventoryItem",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="vulnerability_exposure",
+    )
+    critical_count = models.PositiveIntegerField(default=0, verbose_name="Critical")
+    high_count = models.PositiveIntegerField(default=0, verbose_name="High")
+    medium_count = models.PositiveIntegerField(default=0, verbose_name="Medium")
+    low_count = models.PositiveIntegerField(default=0, verbose_name="Low")
+    none_count = models.PositiveIntegerField(default=0, verbose_name="None")
+    total_count = models.PositiveIntegerField(default=0, verbose_name="Total")
+    max_cvss_v3 = models.FloatField(blank=True, null=True, verbose_name="Max CVSSv3 Score")
+    oldest_published_date = models.DateField(blank=True, null=True, verbose_name="Oldest Published Date")
+
+    # CVE severity => field holding the number of open CVEs of the severity
+    severity_fields = {
+        choices.CVESeverityChoices.CRITICAL: "critical_count",
+        choices.CVESeverityChoices.HIGH: "high_count",
+        choices.CVESeverityChoices.MEDIUM: "medium_count",
+        choices.CVESeverityChoices.LOW: "low_count",
+        choices.CVESeverityChoices.NONE: "none_count",
+    }
+
+    class Meta:
+        """Meta attributes for VulnerabilityExposure."""
+
+        verbose_name = "Vulnerability Exposure"
+        ordering = ("-critical_count", "-high_count", "-total_count")
+        indexes = [
+            models.Index(fields=["critical_count", "high_count", "total_count"]),
+            models.Index(fields=["high_count"]),
+            models.Index(fields=["medium_count"]),
+            models.Index(fields=["low_count"]),
+            models.Index(fields=["total_count"]),
+            models.Index(fields=["max_cvss_v3"]),
+            models.Index(fields=["oldest_published_date"]),
+        ]
+
+    def __str__(self):
+        """String representation of VulnerabilityExposure."""
+        if self.device_id:
+            return f"Device: {self.device}"
+        return f"Inventory Part: {self.inventory_item}"
+
+
+@extras_features(
+    "graphql",
+)
+class VulnerabilityRiskScore(PrimaryModel):
+    """Risk score of the open vulnerabilities of a Device, or of the Devices of a Location or Platform."""
+
+    scope = models.CharField(max_length=CHARFIELD_MAX_LENGTH, choices=choices.RiskScoreScopeChoices)
+    device = models.ForeignKey(
+        to="dcim.Device",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="vulnerability_risk_scores",
+    )
+    location = models.ForeignKey(
+        to="dcim.Location",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="vulnerability_risk_scores",
+    )
+    platform = models.ForeignKey(
+        to="dcim.Platform",
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="vulnerability_risk_scores",
+    )
+    score = models.FloatField(default=0)
+    max_device_score = models.FloatField(default=0, verbose_name="Max Device Score")
+    device_count = models.PositiveIntegerField(default=0, verbose_name="Devices")
+    vulnerability_count = models.PositiveIntegerField(default=0, verbose_name="Vulnerabilities")
+    computed_at = models.DateTimeField(verbose_name="Computed At")
+
+    class Meta:
+        """Meta attributes for VulnerabilityRiskScore."""
+
+        verbose_name = "Vulnerability Risk Score"
+        ordering = ("scope", "-score")
+        indexes = [models.Index(fields=["scope", "score"])]
+
+    def __str__(self):
+        """String representation of VulnerabilityRiskScore."""
+        scope_object = self.device or self.location or self.platform
+        return f"{self.get_scope_display()}: {scope_object or 'None'}"
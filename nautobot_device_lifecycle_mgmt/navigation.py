@@ -153,6 +153,13 @@ menu_items = (
                             "nautobot_device_lifecycle_mgmt.view_vulnerabilitylcm",
                         ],
                     ),
+                    NavMenuItem(
+                        link="plugins:nautobot_device_lifecycle_mgmt:vulnerabilityexposure_list",
+                        name="Vulnerability Exposure",
+                        permissions=[
+                            "nautobot_device_lifecycle_mgmt.view_vulnerabilityexposure",
+                        ],
+                    ),
                 ),
             ),
             NavMenuGroup(
@@ -274,6 +281,20 @@ menu_items = (
                             "nautobot_device_lifecycle_mgmt.view_inventoryitemsoftwarevalidationresult",
                         ],
                     ),
+                    NavMenuItem(
+                        link="plugins:nautobot_device_lifecycle_mgmt:compliance_trend",
+                        name="Software Compliance - Trend",
+                        permissions=[
+                            "nautobot_device_lifecycle_mgmt.view_validationcompliancesnapshot",
+                        ],
+                    ),
+                    NavMenuItem(
+                        link="plugins:nautobot_device_lifecycle_mgmt:compliance_projection",
+                        name="Software Compliance - Projection",
+                        permissions=[
+                            "nautobot_device_lifecycle_mgmt.view_validatedsoftwarelcm",
+                        ],
+                    ),
                 ),
             ),
         ),
@@ -0,0 +1,398 @@
+"""Import of CVEs from offline NVD JSON feed files."""
+
+import gzip
+import io
+import json
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from operator import itemgetter
+
+from django.conf import settings
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.tasks import queue_vulnerability_generation
+from nautobot_device_lifecycle_mgmt.versions import get_version_parser
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+# CPE `vendor:product` => Platform name or network driver, extended by the `nvd_cpe_platforms` setting
+DEFAULT_CPE_PLATFORMS = {
+    "cisco:ios": "cisco_ios",
+    "cisco:ios_xe": "cisco_xe",
+    "cisco:nx-os": "cisco_nxos",
+    "juniper:junos": "juniper_junos",
+    "arista:eos": "arista_eos",
+}
+NVD_DETAIL_URL = "https://nvd.nist.gov/vuln/detail/{}"
+# Start of the array holding the CVE items in NVD 1.1 (`CVE_Items`) and 2.0 (`vulnerabilities`) feeds
+FEED_ITEMS_RE = re.compile(r'"(?:CVE_Items|vulnerabilities)"\s*:\s*\[')
+SEVERITIES = {value.upper(): value for value, _ in choices.CVESeverityChoices.CHOICES}
+DESCRIPTION_MAX_LENGTH = CVELCM._meta.get_field("description").max_length
+
+
+def open_feed(handle):
+    """Return a text stream reading the feed from handle, decompressing gzip feeds.
+
+    Args:
+        handle (file): binary file object, seekable
+    """
+    is_gzip = handle.read(2) == b"\x1f\x8b"
+    handle.seek(0)
+    if is_gzip:
+        handle = gzip.GzipFile(fileobj=handle)
+
+    return io.TextIOWrapper(handle, encoding="utf-8")
+
+
+def iter_feed_items(stream, read_size=64 * 1024):
+    """Yield CVE items of an NVD JSON feed, decoding them one at a time from stream.
+
+    Only the item being decoded is held in memory, so the size of the feed is not limited by available memory.
+
+    Args:
+        stream (file): text file object reading the feed
+        read_size (int): number of characters read from stream at a time
+
+    Raises:
+        ValueError: stream is not an NVD JSON feed or is truncated
+    """
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+
+    def read_more():
+        nonlocal buffer, position, eof
+        chunk = stream.read(read_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while not eof:
+        read_more()
+        match = FEED_ITEMS_RE.search(buffer)
+        if match:
+            position = match.end()
+            break
+        # Keep the tail, the start of the array may be split across reads
+        position = max(len(buffer) - 64, 0)
+    else:
+        raise ValueError("No CVE items found, not an NVD JSON feed.")
+
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position == len(buffer):
+            if eof:
+                raise ValueError("Feed ended before the end of the CVE items.")
+            read_more()
+            continue
+        if buffer[position] == "]":
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Feed ended in the middle of a CVE item.") from None
+            read_more()
+            continue
+        yield item
+
+
+def _get_cpe_matches(nodes, match_key):
+    """Yield vulnerable CPE matches found in configuration nodes and their children."""
+    for node in nodes:
+        for cpe_match in node.get(match_key, ()):
+            if cpe_match.get("vulnerable", True):
+                yield cpe_match
+        yield from _get_cpe_matches(node.get("children", ()), match_key)
+
+
+def parse_cpe(cpe_uri):
+    """Return `(vendor:product, version)` of a CPE 2.3 URI, version being None when the URI matches any version.
+
+    Returns None when cpe_uri is not a CPE 2.3 URI.
+    """
+    # Colons escaped within a component must not split it
+    parts = re.split(r"(?<!\\):", cpe_uri)
+    if len(parts) < 6:
+        return None
+    version = parts[5].replace("\\", "").lower()
+
+    return f"{parts[3]}:{parts[4]}".lower(), None if version in ("*", "-", "") else version
+
+
+def parse_cpe_matches(cpe_matches, cpe_key):
+    """Return the specific versions and the version ranges of the CPE matches.
+
+    Returns:
+        tuple: set of `(vendor:product, version)` and set of `(vendor:product, start, start_inclusive, end,
+            end_inclusive)` tuples, start or end being None when unbounded
+    """
+    cpes, cpe_ranges = set(), set()
+    for cpe_match in cpe_matches:
+        cpe = parse_cpe(cpe_match.get(cpe_key, ""))
+        if cpe is None:
+            continue
+        product, version = cpe
+        if version is not None:
+            cpes.add(cpe)
+            continue
+        start = cpe_match.get("versionStartIncluding") or cpe_match.get("versionStartExcluding")
+        end = cpe_match.get("versionEndIncluding") or cpe_match.get("versionEndExcluding")
+        if start or end:
+            cpe_ranges.add(
+                (product, start, "versionStartIncluding" in cpe_match, end, "versionEndIncluding" in cpe_match)
+            )
+
+    return cpes, cpe_ranges
+
+
+def parse_feed_item(item):  # pylint: disable=too-many-locals
+    """Return CVELCM field values and affected CPEs of an NVD 1.1 or 2.0 feed item.
+
+    Returns:
+        dict: CVELCM field values, `cpes` and `cpe_ranges` as returned by `parse_cpe_matches`
+    """
+    if "cve" in item and "id" in item["cve"]:
+        # NVD 2.0
+        cve = item["cve"]
+        name = cve["id"]
+        published = cve.get("published", "")
+        descriptions = cve.get("descriptions", [])
+        metrics = cve.get("metrics", {})
+        metric_v3 = next(
+            (metrics[key][0] for key in ("cvssMetricV31", "cvssMetricV30") if metrics.get(key)),
+            {},
+        ).get("cvssData", {})
+        metric_v2 = (metrics.get("cvssMetricV2") or [{}])[0]
+        cvss_v3 = metric_v3.get("baseScore")
+        cvss_v2 = metric_v2.get("cvssData", {}).get("baseScore")
+        severity = metric_v3.get("baseSeverity") or metric_v2.get("baseSeverity")
+        nodes = [node for configuration in cve.get("configurations", []) for node in configuration.get("nodes", [])]
+        cpes, cpe_ranges = parse_cpe_matches(_get_cpe_matches(nodes, "cpeMatch"), "criteria")
+    else:
+        # NVD 1.1
+        cve = item["cve"]
+        name = cve["CVE_data_meta"]["ID"]
+        published = item.get("publishedDate", "")
+        descriptions = cve.get("description", {}).get("description_data", [])
+        impact = item.get("impact", {})
+        metric_v3 = impact.get("baseMetricV3", {}).get("cvssV3", {})
+        metric_v2 = impact.get("baseMetricV2", {})
+        cvss_v3 = metric_v3.get("baseScore")
+        cvss_v2 = metric_v2.get("cvssV2", {}).get("baseScore")
+        severity = metric_v3.get("baseSeverity") or metric_v2.get("severity")
+        cpes, cpe_ranges = parse_cpe_matches(
+            _get_cpe_matches(item.get("configurations", {}).get("nodes", []), "cpe_match"), "cpe23Uri"
+        )
+
+    description = next((entry["value"] for entry in descriptions if entry.get("lang") == "en"), "")
+
+    return {
+        "name": name,
+        "published_date": date.fromisoformat(published[:10]),
+        "link": NVD_DETAIL_URL.format(name),
+        "description": description[:DESCRIPTION_MAX_LENGTH],
+        "severity": SEVERITIES.get((severity or "").upper(), choices.CVESeverityChoices.NONE),
+        "cvss": cvss_v3 if cvss_v3 is not None else cvss_v2,
+        "cvss_v2": cvss_v2,
+        "cvss_v3": cvss_v3,
+        "cpes": cpes,
+        "cpe_ranges": cpe_ranges,
+    }
+
+
+class SoftwareVersionIndex:
+    """Lookup of SoftwareLCM pks by CPE `vendor:product` and version or version range.
+
+    CPE products are mapped to Platforms by name or network driver. Specific versions are compared
+    case-insensitively, version ranges are compared on the version sort keys of the Platform version parser.
+    """
+
+    def __init__(self, cpe_platforms=None):  # pylint: disable=too-many-locals
+        """Initialize SoftwareVersionIndex.
+
+        Args:
+            cpe_platforms (dict): CPE `vendor:product` => Platform name or network driver, defaults and the
+                `nvd_cpe_platforms` setting when None
+        """
+        if cpe_platforms is None:
+            cpe_platforms = {**DEFAULT_CPE_PLATFORMS, **PLUGIN_CFG.get("nvd_cpe_platforms", {})}
+        platform_products = defaultdict(set)
+        for product, platform in cpe_platforms.items():
+            platform_products[platform.lower()].add(product.lower())
+
+        self.software = defaultdict(set)
+        # vendor:product => platform pk => (version parser, sorted version sort keys, software pks in the same order)
+        self.sorted_software = defaultdict(dict)
+        for (
+            software_id,
+            version,
+            version_sort_key,
+            platform_id,
+            platform_name,
+            network_driver,
+        ) in SoftwareLCM.objects.values_list(
+            "pk",
+            "version",
+            "version_sort_key",
+            "device_platform",
+            "device_platform__name",
+            "device_platform__network_driver",
+        ):
+            for platform in {platform_name, network_driver} - {None, ""}:
+                for product in platform_products.get(platform.lower(), ()):
+                    self.software[(product, version.lower())].add(software_id)
+                    if platform_id not in self.sorted_software[product]:
+                        self.sorted_software[product][platform_id] = (
+                            get_version_parser(network_driver, platform_name),
+                            [],
+                            [],
+                        )
+                    _, keys, software_ids = self.sorted_software[product][platform_id]
+                    keys.append(version_sort_key)
+                    software_ids.append(software_id)
+        # Keys are sorted here, database collations may not order them like Python compares them in `bisect`
+        for platforms in self.sorted_software.values():
+            for platform_id, (parser, keys, software_ids) in platforms.items():
+                pairs = sorted(zip(keys, software_ids), key=itemgetter(0))
+                platforms[platform_id] = (parser, [key for key, _ in pairs], [software_id for _, software_id in pairs])
+
+    def get_range_software_ids(self, product, start, start_inclusive, end, end_inclusive):
+        """Return pks of the SoftwareLCM of the CPE product with versions in the range, None meaning unbounded."""
+        software_ids = set()
+        for parser, keys, platform_software_ids in self.sorted_software.get(product, {}).values():
+            lower, upper = 0, len(keys)
+            if start:
+                bisect = bisect_left if start_inclusive else bisect_right
+                lower = bisect(keys, parser.sort_key(start))
+            if end:
+                bisect = bisect_right if end_inclusive else bisect_left
+                upper = bisect(keys, parser.sort_key(end))
+            software_ids.update(platform_software_ids[lower:upper])
+
+        return software_ids
+
+    def get_software_ids(self, cpes, cpe_ranges=()):
+        """Return pks of the SoftwareLCM matching any of the CPEs or CPE version ranges.
+
+        Args:
+            cpes (iterable): `(vendor:product, version)` tuples
+            cpe_ranges (iterable): `(vendor:product, start, start_inclusive, end, end_inclusive)` tuples
+        """
+        software_ids = set().union(*(self.software.get(cpe, ()) for cpe in cpes))
+        for cpe_range in cpe_ranges:
+            software_ids |= self.get_range_software_ids(*cpe_range)
+
+        return software_ids
+
+
+class NVDFeedImporter:
+    """Upsert CVELCM objects from NVD JSON feed items and link them to the affected software.
+
+    Items are processed in batches of `batch_size`. For each batch, existing CVEs are loaded with one query and
+    CVEs are created or updated with bulk operations. Affected software found in the CVE configurations is
+    added to the CVEs, software already linked to the CVEs is kept.
+    """
+
+    batch_size = 1000
+    update_fields = ("published_date", "link", "description", "severity", "cvss", "cvss_v2", "cvss_v3")
+    # Fields only set on existing CVEs when blank, to keep curated values
+    fill_fields = ("link", "description")
+
+    def __init__(self, software_index=None, status=None):
+        """Initialize NVDFeedImporter.
+
+        Args:
+            software_index (SoftwareVersionIndex): index resolving CPEs to software, built when None
+            status (Status): status of created CVEs
+        """
+        self.software_index = software_index or SoftwareVersionIndex()
+        self.status = status
+        self.counts = {"processed": 0, "created": 0, "updated": 0, "unchanged": 0, "linked": 0}
+
+    def import_batch(self, records):
+        """Upsert CVEs of the parsed feed items and link them to the affected software.
+
+        Args:
+            records (list): values returned by `parse_feed_item`, later records win over earlier ones with the same name
+        """
+        records = {record["name"]: record for record in records}
+        existing = {
+            cve["name"]: cve
+            for cve in CVELCM.objects.filter(name__in=records).values("pk", "name", *self.update_fields)
+        }
+        to_create, to_update, cve_ids = [], [], {}
+        for name, record in records.items():
+            values = {field: record[field] for field in self.update_fields}
+            if name not in existing:
+                cve = CVELCM(name=name, status=self.status, **values)
+                to_create.append(cve)
+                cve_ids[name] = cve.pk
+                continue
+            cve_ids[name] = existing[name]["pk"]
+            values.update({field: existing[name][field] for field in self.fill_fields if existing[name][field]})
+            if any(existing[name][field] != value for field, value in values.items()):
+                to_update.append(CVELCM(pk=existing[name]["pk"], **values))
+            else:
+                self.counts["unchanged"] += 1
+
+        CVELCM.objects.bulk_create(to_create, batch_size=self.batch_size)
+        CVELCM.objects.bulk_update(to_update, self.update_fields, batch_size=self.batch_size)
+        self.counts["processed"] += len(records)
+        self.counts["created"] += len(to_create)
+        self.counts["updated"] += len(to_update)
+        self.link_software(
+            {
+                (cve_ids[name], software_id)
+                for name, record in records.items()
+                for software_id in self.software_index.get_software_ids(record["cpes"], record["cpe_ranges"])
+            }
+        )
+
+    def link_software(self, pairs):
+        """Add the `(cve_id, software_id)` pairs not linked yet to the CVE affected software."""
+        through = CVELCM.affected_softwares.through
+        existing = set(
+            through.objects.filter(cvelcm_id__in={cve_id for cve_id, _ in pairs}).values_list(
+                "cvelcm_id", "softwarelcm_id"
+            )
+        )
+        new_pairs = pairs - existing
+        through.objects.bulk_create(
+            [through(cvelcm_id=cve_id, softwarelcm_id=software_id) for cve_id, software_id in new_pairs],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        self.counts["linked"] += len(new_pairs)
+        # Bulk inserts don't send m2m_changed, queue the vulnerabilities the new links expose explicitly
+        queue_vulnerability_generation("cve_software", new_pairs)
+
+    def run(self, items, progress=None):
+        """Import the feed items.
+
+        Args:
+            items (iterable): NVD feed items, as yielded by `iter_feed_items`
+            progress (callable): called with the counts and the throughput in items per second after each batch
+
+        Returns:
+            dict: counts of processed, created, updated and unchanged CVEs and of new software links
+        """
+        started = time.monotonic()
+        batch = []
+        for item in items:
+            batch.append(parse_feed_item(item))
+            if len(batch) == self.batch_size:
+                self.import_batch(batch)
+                batch = []
+                if progress:
+                    progress(self.counts, self.counts["processed"] / max(time.monotonic() - started, 1e-6))
+        if batch:
+            self.import_batch(batch)
+            if progress:
+                progress(self.counts, self.counts["processed"] / max(time.monotonic() - started, 1e-6))
+
+        return self.counts
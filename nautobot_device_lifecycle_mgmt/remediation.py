@@ -0,0 +1,251 @@
+"""Planning of software upgrades clearing the open vulnerabilities of many devices at once."""
+
+import csv
+import io
+from collections import defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from nautobot.dcim.models import Device
+from nautobot.extras.models import RelationshipAssociation, TaggedItem
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM, ValidatedSoftwareLCM, VulnerabilityLCM
+from nautobot_device_lifecycle_mgmt.software_filters import ValidatedSoftwareRuleIndex
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+PLAN_FIELDS = (
+    "location",
+    "platform",
+    "device",
+    "current_software",
+    "open_cves",
+    "recommended_software",
+    "cleared_cves",
+    "remaining_cves",
+    "introduced_cves",
+    "clears_all",
+)
+SUMMARY_FIELDS = (
+    "location",
+    "platform",
+    "devices",
+    "upgrades",
+    "cleared_all",
+    "no_candidate",
+    "open_cves",
+    "cleared_cves",
+)
+
+
+class RemediationPlanner:
+    """Recommend for every vulnerable Device the validated software leaving it the least exposed.
+
+    Open vulnerabilities, applicable ValidatedSoftwareLCM (same criteria and precedence as
+    `DeviceValidatedSoftwareFilter`) and the CVEs affecting every candidate software are loaded with a handful of
+    queries, candidates are then compared with set operations in memory. The exposure of a candidate is the set of
+    CVEs affecting its software, candidates with fewer CVEs of higher severity win and ties go to the candidate
+    ranked first by the ValidatedSoftwareLCM precedence.
+    """
+
+    severities = (
+        choices.CVESeverityChoices.CRITICAL,
+        choices.CVESeverityChoices.HIGH,
+        choices.CVESeverityChoices.MEDIUM,
+        choices.CVESeverityChoices.LOW,
+        choices.CVESeverityChoices.NONE,
+    )
+
+    def __init__(self, devices=None, closed_statuses=None, valid_on=None):
+        """Initialize RemediationPlanner.
+
+        Args:
+            devices (QuerySet): devices to plan upgrades for, all devices when None
+            closed_statuses (iterable): names of the statuses of vulnerabilities that are not open, the
+                `vulnerability_closed_statuses` setting when None
+            valid_on (date): date validity of ValidatedSoftwareLCM is evaluated on, today when None
+        """
+        self.devices = devices if devices is not None else Device.objects.all()
+        if closed_statuses is None:
+            closed_statuses = PLUGIN_CFG.get("vulnerability_closed_statuses", [])
+        self.closed_statuses = set(closed_statuses)
+        self.today = valid_on or date.today()
+        self.content_type = ContentType.objects.get_for_model(Device)
+
+    def get_open_vulnerabilities(self):
+        """Return the open device vulnerabilities of the devices."""
+        vulnerabilities = VulnerabilityLCM.objects.filter(device__isnull=False, cve__isnull=False)
+        if self.closed_statuses:
+            vulnerabilities = vulnerabilities.exclude(status__name__in=self.closed_statuses)
+        if self.devices.query.has_filters():
+            vulnerabilities = vulnerabilities.filter(device__in=self.devices.order_by().values("pk"))
+
+        return vulnerabilities
+
+    def get_open_cves(self):
+        """Return mapping of device pk to the set of pks of its open CVEs."""
+        device_cves = defaultdict(set)
+        for device_id, cve_id in self.get_open_vulnerabilities().values_list("device_id", "cve_id").iterator():
+            device_cves[device_id].add(cve_id)
+
+        return device_cves
+
+    def get_devices(self):
+        """Return mapping of vulnerable device pk to `(name, device_type pk, role pk, location, platform)`."""
+        devices = self.devices.filter(pk__in=self.get_open_vulnerabilities().values("device_id"))
+        return {
+            pk: attrs
+            for pk, *attrs in devices.order_by().values_list(
+                "pk", "name", "device_type_id", "role_id", "location__name", "platform__name"
+            )
+        }
+
+    def get_device_tags(self):
+        """Return mapping of vulnerable device pk to the set of its tag pks."""
+        device_tags = defaultdict(set)
+        for object_id, tag_id in TaggedItem.objects.filter(
+            content_type=self.content_type,
+            object_id__in=self.get_open_vulnerabilities().values("device_id"),
+        ).values_list("object_id", "tag_id"):
+            device_tags[object_id].add(tag_id)
+
+        return device_tags
+
+    def get_device_software(self):
+        """Return mapping of vulnerable device pk to the pk of the SoftwareLCM assigned to it."""
+        return dict(
+            RelationshipAssociation.objects.filter(
+                relationship__key="device_soft",
+                destination_type=self.content_type,
+                destination_id__in=self.get_open_vulnerabilities().values("device_id"),
+            ).values_list("destination_id", "source_id")
+        )
+
+    @staticmethod
+    def get_software_cves(software_ids):
+        """Return mapping of SoftwareLCM pk to the frozenset of pks of the CVEs affecting it."""
+        software_cves = defaultdict(set)
+        for cve_id, software_id in CVELCM.affected_softwares.through.objects.filter(
+            softwarelcm_id__in=software_ids
+        ).values_list("cvelcm_id", "softwarelcm_id"):
+            software_cves[software_id].add(cve_id)
+
+        return {software_id: frozenset(software_cves.get(software_id, ())) for software_id in software_ids}
+
+    def get_candidates(self, rule_index, devices, device_tags):
+        """Return mapping of device pk to SoftwareLCM pks of the ValidatedSoftwareLCM valid for it, in precedence order."""
+        candidates = {}
+        for device_id, (_, device_type_id, role_id, _, _) in devices.items():
+            software_ids = []
+            for rule in rule_index.resolve_device(device_id, device_type_id, role_id, device_tags.get(device_id, ())):
+                if rule_index.is_valid(rule, self.today) and rule.software_id not in software_ids:
+                    software_ids.append(rule.software_id)
+            candidates[device_id] = software_ids
+
+        return candidates
+
+    def exposure_profile(self, cve_ids, cve_severities):
+        """Return numbers of CVEs per severity, highest severity first, comparing lower for lesser exposure."""
+        counts = dict.fromkeys(self.severities, 0)
+        for cve_id in cve_ids:
+            counts[cve_severities.get(cve_id, choices.CVESeverityChoices.NONE)] += 1
+
+        return tuple(counts[severity] for severity in self.severities)
+
+    def plan(self, rule_index=None):  # pylint: disable=too-many-locals
+        """Compute the recommended upgrade of every vulnerable device.
+
+        Args:
+            rule_index (ValidatedSoftwareRuleIndex): index of all ValidatedSoftwareLCM, built when not given
+
+        Returns:
+            list: dicts with the `PLAN_FIELDS` keys, ordered by location, platform and device
+        """
+        device_cves = self.get_open_cves()
+        devices = self.get_devices()
+        if rule_index is None:
+            rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        candidates = self.get_candidates(rule_index, devices, self.get_device_tags())
+        device_software = self.get_device_software()
+
+        software_cves = self.get_software_cves({software_id for ids in candidates.values() for software_id in ids})
+        cve_severities = dict(
+            CVELCM.objects.filter(pk__in=set().union(*software_cves.values())).values_list("pk", "severity")
+        )
+        profiles = {
+            software_id: self.exposure_profile(cve_ids, cve_severities)
+            for software_id, cve_ids in software_cves.items()
+        }
+        versions = dict(
+            SoftwareLCM.objects.filter(pk__in={*software_cves, *device_software.values()}).values_list("pk", "version")
+        )
+
+        plan = []
+        for device_id, (name, _, _, location, platform) in devices.items():
+            open_cves = device_cves[device_id]
+            ranked = sorted(
+                enumerate(candidates[device_id]), key=lambda candidate: (profiles[candidate[1]], candidate[0])
+            )
+            row = {
+                "location": location or "",
+                "platform": platform or "",
+                "device": name or "",
+                "current_software": versions.get(device_software.get(device_id), ""),
+                "open_cves": len(open_cves),
+                "recommended_software": "",
+                "cleared_cves": 0,
+                "remaining_cves": len(open_cves),
+                "introduced_cves": 0,
+                "clears_all": False,
+            }
+            if ranked:
+                software_id = ranked[0][1]
+                remaining = open_cves & software_cves[software_id]
+                row.update(
+                    recommended_software=versions[software_id],
+                    cleared_cves=len(open_cves) - len(remaining),
+                    remaining_cves=len(remaining),
+                    introduced_cves=len(software_cves[software_id] - open_cves),
+                    clears_all=not remaining,
+                )
+            plan.append(row)
+
+        plan.sort(key=lambda row: (row["location"], row["platform"], row["device"]))
+
+        return plan
+
+    @staticmethod
+    def summarize(plan):
+        """Return plan totals grouped by location and platform, as dicts with the `SUMMARY_FIELDS` keys."""
+        groups = {}
+        for row in plan:
+            group = groups.setdefault(
+                (row["location"], row["platform"]),
+                {
+                    "location": row["location"],
+                    "platform": row["platform"],
+                    **dict.fromkeys(SUMMARY_FIELDS[2:], 0),
+                },
+            )
+            group["devices"] += 1
+            group["upgrades"] += bool(row["recommended_software"]) and (
+                row["recommended_software"] != row["current_software"]
+            )
+            group["cleared_all"] += row["clears_all"]
+            group["no_candidate"] += not row["recommended_software"]
+            group["open_cves"] += row["open_cves"]
+            group["cleared_cves"] += row["cleared_cves"]
+
+        return [groups[key] for key in sorted(groups)]
+
+
+def export_csv(rows, fields):
+    """Return rows, dicts keyed by fields, as CSV text."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(rows)
+
+    return output.getvalue()
@@ -0,0 +1,191 @@
+"""Vulnerability risk scores of devices, locations and platforms, computed with NumPy."""
+
+from datetime import date
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from nautobot.dcim.models import Device
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.models import CVELCM, VulnerabilityLCM, VulnerabilityRiskScore
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+# Scoring weights, overridden key by key by the `vulnerability_risk_weights` setting
+DEFAULT_RISK_WEIGHTS = {
+    # CVE severity => multiplier of the CVE CVSS score
+    "severity": {
+        choices.CVESeverityChoices.CRITICAL: 1.0,
+        choices.CVESeverityChoices.HIGH: 0.75,
+        choices.CVESeverityChoices.MEDIUM: 0.5,
+        choices.CVESeverityChoices.LOW: 0.25,
+        choices.CVESeverityChoices.NONE: 0.1,
+    },
+    # CVSS score of CVEs without CVSSv3, CVSS or CVSSv2 score
+    "default_cvss": 5.0,
+    # Increase of the CVE score per year since the CVE was published, up to `max_age_years`
+    "age_per_year": 0.1,
+    "max_age_years": 5,
+}
+
+
+def factorize(values):
+    """Return the distinct values in order of first appearance and the array of the index of every value in them."""
+    codes = {}
+    indexes = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.intp, count=len(values))
+
+    return list(codes), indexes
+
+
+class RiskScoringEngine:
+    """Compute the vulnerability risk score of every Device and aggregate it by Location and Platform.
+
+    A vulnerable Device scores the sum, over the distinct CVEs of its open vulnerabilities and the vulnerabilities
+    of its Inventory Items, of the CVE CVSS score weighted by the CVE severity and age. Location and Platform score
+    the sum of the scores of their Devices. Vulnerability and CVE columns are loaded once into NumPy arrays and all
+    scores and aggregates are computed on these arrays, without per-object Python loops.
+    """
+
+    batch_size = 1000
+
+    def __init__(self, weights=None, closed_statuses=None, today=None):
+        """Initialize RiskScoringEngine.
+
+        Args:
+            weights (dict): scoring weights overriding `DEFAULT_RISK_WEIGHTS`, the `vulnerability_risk_weights`
+                setting when None
+            closed_statuses (iterable): names of the statuses of vulnerabilities that are not open, the
+                `vulnerability_closed_statuses` setting when None
+            today (date): date CVE ages are computed on, today when None
+        """
+        if weights is None:
+            weights = PLUGIN_CFG.get("vulnerability_risk_weights", {})
+        self.weights = {
+            **DEFAULT_RISK_WEIGHTS,
+            **weights,
+            "severity": {**DEFAULT_RISK_WEIGHTS["severity"], **weights.get("severity", {})},
+        }
+        if closed_statuses is None:
+            closed_statuses = PLUGIN_CFG.get("vulnerability_closed_statuses", [])
+        self.closed_statuses = set(closed_statuses)
+        self.today = today or date.today()
+
+    def get_device_cves(self):
+        """Return distinct `(device pk, CVE pk)` pairs of open vulnerabilities, Inventory Items counting on their Device."""
+        vulnerabilities = VulnerabilityLCM.objects.filter(cve__isnull=False)
+        if self.closed_statuses:
+            vulnerabilities = vulnerabilities.exclude(status__name__in=self.closed_statuses)
+
+        return list(
+            vulnerabilities.annotate(owner_id=Coalesce("device_id", "inventory_item__device_id"))
+            .filter(owner_id__isnull=False)
+            .order_by()
+            .values_list("owner_id", "cve_id")
+            .distinct()
+        )
+
+    def get_cve_scores(self, cve_ids):
+        """Return array of the weighted scores of the CVEs, in cve_ids order."""
+        columns = {
+            pk: row
+            for pk, *row in CVELCM.objects.filter(pk__in=cve_ids).values_list(
+                "pk", "cvss_v3", "cvss", "cvss_v2", "severity", "published_date"
+            )
+        }
+        rows = [columns[cve_id] for cve_id in cve_ids]
+        count = len(rows)
+        # Missing scores are loaded as NaN and filled from the next score column
+        cvss = np.fromiter((np.nan if row[0] is None else row[0] for row in rows), dtype=float, count=count)
+        for column in (1, 2):
+            fallback = np.fromiter((np.nan if row[column] is None else row[column] for row in rows), float, count)
+            cvss = np.where(np.isnan(cvss), fallback, cvss)
+        cvss = np.where(np.isnan(cvss), float(self.weights["default_cvss"]), cvss)
+
+        severities, severity_codes = factorize([row[3] for row in rows])
+        severity_weights = np.array([float(self.weights["severity"].get(severity, 0)) for severity in severities])
+        published = np.array([row[4] for row in rows], dtype="datetime64[D]")
+        age_years = (np.datetime64(self.today, "D") - published).astype(float) / 365.25
+        age_years = np.clip(age_years, 0, self.weights["max_age_years"])
+
+        return cvss * severity_weights[severity_codes] * (1 + self.weights["age_per_year"] * age_years)
+
+    def compute(self):  # pylint: disable=too-many-locals
+        """Compute the scores.
+
+        Returns:
+            dict: scope => list of `(object pk, score, max device score, device count, vulnerability count)` tuples
+        """
+        pairs = self.get_device_cves()
+        device_ids, device_codes = factorize([device_id for device_id, _ in pairs])
+        cve_ids, cve_codes = factorize([cve_id for _, cve_id in pairs])
+        if not pairs:
+            return {scope: [] for scope, _ in choices.RiskScoreScopeChoices.CHOICES}
+
+        pair_scores = self.get_cve_scores(cve_ids)[cve_codes]
+        device_scores = np.bincount(device_codes, weights=pair_scores, minlength=len(device_ids))
+        device_vulnerabilities = np.bincount(device_codes, minlength=len(device_ids))
+
+        groups = {
+            pk: (location_id, platform_id)
+            for pk, location_id, platform_id in Device.objects.filter(pk__in=device_ids).values_list(
+                "pk", "location_id", "platform_id"
+            )
+        }
+        scores = {
+            choices.RiskScoreScopeChoices.DEVICE: list(
+                zip(
+                    device_ids,
+                    device_scores.tolist(),
+                    device_scores.tolist(),
+                    [1] * len(device_ids),
+                    device_vulnerabilities.tolist(),
+                )
+            )
+        }
+        for scope, column in ((choices.RiskScoreScopeChoices.LOCATION, 0), (choices.RiskScoreScopeChoices.PLATFORM, 1)):
+            group_ids, group_codes = factorize([groups[device_id][column] for device_id in device_ids])
+            max_scores = np.zeros(len(group_ids))
+            np.maximum.at(max_scores, group_codes, device_scores)
+            scores[scope] = list(
+                zip(
+                    group_ids,
+                    np.bincount(group_codes, weights=device_scores, minlength=len(group_ids)).tolist(),
+                    max_scores.tolist(),
+                    np.bincount(group_codes, minlength=len(group_ids)).tolist(),
+                    np.bincount(group_codes, weights=device_vulnerabilities, minlength=len(group_ids))
+                    .astype(int)
+                    .tolist(),
+                )
+            )
+
+        return scores
+
+    def run(self):
+        """Compute the scores and replace the stored VulnerabilityRiskScore objects with them.
+
+        Returns:
+            dict: scope => number of scored objects
+        """
+        computed_at = timezone.now()
+        scores = self.compute()
+        records = [
+            VulnerabilityRiskScore(
+                scope=scope,
+                **{f"{scope}_id": object_id},
+                score=round(score, 2),
+                max_device_score=round(max_device_score, 2),
+                device_count=device_count,
+                vulnerability_count=vulnerability_count,
+                computed_at=computed_at,
+            )
+            for scope, rows in scores.items()
+            for object_id, score, max_device_score, device_count, vulnerability_count in rows
+        ]
+        with transaction.atomic():
+            VulnerabilityRiskScore.objects.all().delete()
+            VulnerabilityRiskScore.objects.bulk_create(records, batch_size=self.batch_size)
+
+        return {scope: len(rows) for scope, rows in scores.items()}
@@ -1,10 +1,23 @@
 """Custom signals for the Lifecycle Management app."""
 
 from django.apps import apps as global_apps
-from django.db.models.signals import pre_delete
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from nautobot.extras.choices import RelationshipTypeChoices
-from nautobot.extras.models import Relationship, RelationshipAssociation
+from nautobot.extras.models import Relationship, RelationshipAssociation, TaggedItem
+
+from nautobot_device_lifecycle_mgmt.models import CVELCM, ValidatedSoftwareLCM
+from nautobot_device_lifecycle_mgmt.tasks import queue_software_validation, queue_vulnerability_generation
+from nautobot_device_lifecycle_mgmt.validation import VALIDATION_ENGINES
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+SOFT_RELATIONSHIP_KINDS = {"device_soft": "device", "inventory_item_soft": "inventory_item"}
+VALIDATED_MODEL_KINDS = {"dcim.device": "device", "dcim.inventoryitem": "inventory_item"}
+# Device fields whose change revalidates the Device
+DEVICE_VALIDATION_FIELDS = ("device_type_id", "role_id", "platform_id")
 
 
 def post_migrate_create_relationships(sender, apps=global_apps, **kwargs):  # pylint: disable=unused-argument
@@ -69,3 +82,122 @@ def delete_inventory_item_software_relationship(sender, instance, **kwargs):  #
     """Delete InventoryItem relationship to SoftwareLCM object."""
     soft_relationships = Relationship.objects.filter(key__in=("device_soft", "inventory_item_soft"))
     RelationshipAssociation.objects.filter(relationship__in=soft_relationships, destination_id=instance.pk).delete()
+
+
+@receiver(post_save, sender="dcim.Platform")
+def platform_saved(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Recompute version sort keys of the Platform software, its network driver or name may have changed."""
+    if not kwargs.get("raw"):
+        instance.softwarelcm_set.update_version_sort_keys()
+
+
+def queue_validation_on_commit(kind, pks):
+    """Queue objects for software revalidation once the current transaction is committed."""
+    pks = set(pks)
+    if pks:
+        transaction.on_commit(lambda: queue_software_validation(kind, pks))
+
+
+@receiver(post_save, sender=RelationshipAssociation)
+@receiver(post_delete, sender=RelationshipAssociation)
+def software_relationship_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Revalidate Device or InventoryItem whose software assignment changed."""
+    if kwargs.get("raw"):
+        return
+    kind = SOFT_RELATIONSHIP_KINDS.get(instance.relationship.key)
+    if kind:
+        queue_validation_on_commit(kind, [instance.destination_id])
+
+
+def queue_vulnerabilities_on_commit(kind, pairs):
+    """Queue pairs exposing new vulnerabilities once the current transaction is committed."""
+    pairs = set(pairs)
+    if pairs:
+        transaction.on_commit(lambda: queue_vulnerability_generation(kind, pairs))
+
+
+@receiver(post_save, sender=RelationshipAssociation)
+def software_relationship_saved(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Generate vulnerabilities exposed by a Device or InventoryItem software assignment."""
+    if kwargs.get("raw"):
+        return
+    kind = SOFT_RELATIONSHIP_KINDS.get(instance.relationship.key)
+    if kind:
+        queue_vulnerabilities_on_commit(kind, [(instance.source_id, instance.destination_id)])
+
+
+@receiver(m2m_changed, sender=CVELCM.affected_softwares.through)
+def cve_affected_softwares_changed(sender, instance, action, reverse, pk_set, **kwargs):  # pylint: disable=unused-argument
+    """Generate vulnerabilities exposed by software added to CVEs."""
+    if action != "post_add":
+        return
+    if reverse:
+        queue_vulnerabilities_on_commit("cve_software", [(cve_pk, instance.pk) for cve_pk in pk_set])
+    else:
+        queue_vulnerabilities_on_commit("cve_software", [(instance.pk, software_pk) for software_pk in pk_set])
+
+
+@receiver(pre_save, sender="dcim.Device")
+def device_pre_save(sender, instance, **kwargs):
+    """Record the validation fields of an existing Device before it is saved, see `device_saved`."""
+    if kwargs.get("raw") or instance._state.adding:  # pylint: disable=protected-access
+        return
+    instance._lcm_validation_values = (  # pylint: disable=protected-access
+        sender.objects.filter(pk=instance.pk).values_list(*DEVICE_VALIDATION_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender="dcim.Device")
+def device_saved(sender, instance, created=False, **kwargs):  # pylint: disable=unused-argument
+    """Revalidate Device created or whose device type, role or platform changed."""
+    if kwargs.get("raw"):
+        return
+    old_values = instance.__dict__.pop("_lcm_validation_values", None)
+    if created or old_values != tuple(getattr(instance, field) for field in DEVICE_VALIDATION_FIELDS):
+        queue_validation_on_commit("device", [instance.pk])
+
+
+@receiver(post_save, sender="dcim.InventoryItem")
+def inventory_item_saved(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Revalidate newly created InventoryItem."""
+    if kwargs.get("created") and not kwargs.get("raw"):
+        queue_validation_on_commit("inventory_item", [instance.pk])
+
+
+@receiver(m2m_changed, sender=TaggedItem)
+def object_tags_changed(sender, instance, action, **kwargs):  # pylint: disable=unused-argument
+    """Revalidate Device or InventoryItem whose tags changed."""
+    kind = VALIDATED_MODEL_KINDS.get(instance._meta.label_lower)
+    if kind and action in ("post_add", "post_remove", "post_clear"):
+        queue_validation_on_commit(kind, [instance.pk])
+
+
+def queue_validated_software_objects(rule):
+    """Revalidate objects that had or have the ValidatedSoftwareLCM assigned."""
+    if not PLUGIN_CFG.get("event_driven_validation", False):
+        return
+    for kind, engine_class in VALIDATION_ENGINES.items():
+        queue_validation_on_commit(kind, engine_class().get_rule_item_pks(rule))
+
+
+@receiver(post_save, sender=ValidatedSoftwareLCM)
+@receiver(pre_delete, sender=ValidatedSoftwareLCM)
+def validated_software_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Revalidate objects affected by a created, updated or deleted ValidatedSoftwareLCM."""
+    if not kwargs.get("raw"):
+        queue_validated_software_objects(instance)
+
+
+def validated_software_assignments_changed(sender, instance, action, **kwargs):  # pylint: disable=unused-argument
+    """Revalidate objects affected by changed ValidatedSoftwareLCM assignments."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        queue_validated_software_objects(instance)
+
+
+# Through models of the ValidatedSoftwareLCM assignments, only changed from the ValidatedSoftwareLCM side
+VALIDATED_SOFTWARE_M2M_THROUGH = tuple(
+    getattr(ValidatedSoftwareLCM, field_name).through
+    for field_name in ("devices", "device_types", "device_roles", "inventory_items", "object_tags")
+)
+for _through in VALIDATED_SOFTWARE_M2M_THROUGH:
+    m2m_changed.connect(validated_software_assignments_changed, sender=_through)
@@ -4,8 +4,8 @@ from django.contrib.contenttypes.models import ContentType
 from nautobot.dcim.models import Device, InventoryItem
 from nautobot.extras.models import RelationshipAssociation
 
-from nautobot_device_lifecycle_mgmt.filters import ValidatedSoftwareLCMFilterSet
 from nautobot_device_lifecycle_mgmt.models import SoftwareLCM, ValidatedSoftwareLCM
+from nautobot_device_lifecycle_mgmt.software_filters import ValidatedSoftwareRuleIndex
 from nautobot_device_lifecycle_mgmt.tables import ValidatedSoftwareLCMTable
 
 
@@ -15,10 +15,17 @@ class ItemSoftware:
     soft_relation_name = None
     soft_obj_model = None
 
-    def __init__(self, item_obj):
-        """Initalize ItemSoftware object."""
+    def __init__(self, item_obj, rule_index=None):
+        """Initalize ItemSoftware object.
+
+        Args:
+            item_obj: Device or InventoryItem object
+            rule_index: optional `ValidatedSoftwareRuleIndex`, allows sharing one index across many objects
+        """
         self.item_obj = item_obj
-        self.validated_software_qs = ValidatedSoftwareLCM.objects.get_for_object(self.item_obj)
+        if rule_index is None:
+            rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        self.validated_software = rule_index.resolve_many([self.item_obj])[self.item_obj.pk]
 
         if self.soft_relation_name:
             self.software = self.get_software()
@@ -41,11 +48,11 @@ class ItemSoftware:
 
     def get_validated_software_table(self):
         """Returns table of validated software linked to the object."""
-        if not self.validated_software_qs:
+        if not self.validated_software:
             return None
 
         return ValidatedSoftwareLCMTable(
-            list(self.validated_software_qs),
+            self.validated_software,
             orderable=False,
             exclude=(
                 "software",
@@ -56,16 +63,15 @@ class ItemSoftware:
 
     def validate_software(self, preferred_only=False):
         """Validate software against the validated software objects."""
-        if not (self.software and self.validated_software_qs.exists()):
+        if not self.software:
             return False
 
-        validated_software_versions = ValidatedSoftwareLCMFilterSet(
-            {"valid": True}, self.validated_software_qs.filter(software=self.software)
-        ).qs
-        if preferred_only:
-            validated_software_versions = validated_software_versions.filter(preferred_only=True)
-
-        return validated_software_versions.exists()
+        return any(
+            validated_software.software_id == self.software.pk
+            and ValidatedSoftwareRuleIndex.is_valid(validated_software)
+            and (validated_software.preferred or not preferred_only)
+            for validated_software in self.validated_software
+        )
 
 
 class DeviceSoftware(ItemSoftware):
@@ -1,9 +1,13 @@
 """Filters for Software Lifecycle QuerySets."""
 
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Case, IntegerField, Q, Subquery, Value, When
 from nautobot.dcim.models import Device, InventoryItem
-from nautobot.extras.models import RelationshipAssociation
+from nautobot.extras.models import RelationshipAssociation, TaggedItem
 
 
 class BaseSoftwareFilter:
@@ -126,6 +130,188 @@ class InventoryItemValidatedSoftwareFilter:
         )
 
 
+class ValidatedSoftwareRuleIndex:  # pylint: disable=too-many-instance-attributes
+    """Compiled in-memory index of ValidatedSoftwareLCM assignments.
+
+    Resolves applicable ValidatedSoftwareLCM objects for many Device or InventoryItem objects without issuing
+    per-object queries. Matching criteria and weights mirror `DeviceValidatedSoftwareFilter` and
+    `InventoryItemValidatedSoftwareFilter`.
+    """
+
+    m2m_fields = ("devices", "device_types", "device_roles", "inventory_items", "object_tags")
+
+    def __init__(self, qs):  # pylint: disable=invalid-name
+        """Initalize ValidatedSoftwareRuleIndex, loading all assignments of the ValidatedSoftwareLCM query set."""
+        self.rules = {rule.pk: rule for rule in qs.select_related("software", "software__device_platform")}
+        self.assignments = {field: defaultdict(set) for field in self.m2m_fields}
+        for field in self.m2m_fields:
+            m2m_field = qs.model._meta.get_field(field)
+            for rule_id, target_id in m2m_field.remote_field.through.objects.filter(
+                **{f"{m2m_field.m2m_column_name()}__in": list(self.rules)}
+            ).values_list(m2m_field.m2m_column_name(), m2m_field.m2m_reverse_name()):
+                self.assignments[field][rule_id].add(target_id)
+
+        self.by_device = defaultdict(set)
+        self.by_device_type_role = defaultdict(set)
+        self.by_device_type = defaultdict(set)
+        self.by_device_role = defaultdict(set)
+        self.by_inventory_item = defaultdict(set)
+        self.by_tag = defaultdict(set)
+        for rule_id in self.rules:
+            device_types = self.assignments["device_types"][rule_id]
+            device_roles = self.assignments["device_roles"][rule_id]
+            for device_id in self.assignments["devices"][rule_id]:
+                self.by_device[device_id].add(rule_id)
+            for device_type_id in device_types:
+                if not device_roles:
+                    self.by_device_type[device_type_id].add(rule_id)
+                for role_id in device_roles:
+                    self.by_device_type_role[(device_type_id, role_id)].add(rule_id)
+            if not device_types:
+                for role_id in device_roles:
+                    self.by_device_role[role_id].add(rule_id)
+            for item_id in self.assignments["inventory_items"][rule_id]:
+                self.by_inventory_item[item_id].add(rule_id)
+            for tag_id in self.assignments["object_tags"][rule_id]:
+                self.by_tag[tag_id].add(rule_id)
+
+    def _tag_rules(self, tag_ids):
+        """Return ids of rules assigned to any of the given tags."""
+        return set().union(*(self.by_tag.get(tag_id, ()) for tag_id in tag_ids))
+
+    def device_rule_ids(self, device_id, device_type_id, role_id, tag_ids=()):
+        """Return ids of ValidatedSoftwareLCM objects applicable to a Device."""
+        return (
+            self.by_device.get(device_id, set())
+            | self.by_device_type_role.get((device_type_id, role_id), set())
+            | self.by_device_type.get(device_type_id, set())
+            | self.by_device_role.get(role_id, set())
+            | self._tag_rules(tag_ids)
+        )
+
+    def inventory_item_rule_ids(self, item_id, tag_ids=()):
+        """Return ids of ValidatedSoftwareLCM objects applicable to an InventoryItem."""
+        return self.by_inventory_item.get(item_id, set()) | self._tag_rules(tag_ids)
+
+    def device_weight(self, rule_id, device_id, device_type_id, role_id):
+        """Return weight of the ValidatedSoftwareLCM assignment, as computed by `DeviceValidatedSoftwareFilter`."""
+        preferred = self.rules[rule_id].preferred
+        device_types = self.assignments["device_types"][rule_id]
+        device_roles = self.assignments["device_roles"][rule_id]
+        if device_id in self.assignments["devices"][rule_id]:
+            return 10 if preferred else 1000
+        if device_type_id in device_types and role_id in device_roles:
+            return 20 if preferred else 1010
+        if device_type_id in device_types and not device_roles:
+            return 30 if preferred else 1030
+        if role_id in device_roles:
+            return 40 if preferred else 1040
+        return 990 if preferred else 1990
+
+    def inventory_item_weight(self, rule_id):
+        """Return weight of the ValidatedSoftwareLCM assignment, as computed by `InventoryItemValidatedSoftwareFilter`."""
+        # Directly assigned inventory items weigh the same as tagged ones
+        return 20 if self.rules[rule_id].preferred else 1010
+
+    def _ordered(self, weighted_rule_ids):
+        """Return ValidatedSoftwareLCM objects ordered by weight and start date."""
+        return [
+            self.rules[rule_id]
+            for _, _, rule_id in sorted(
+                (weight, self.rules[rule_id].start, rule_id) for weight, rule_id in weighted_rule_ids
+            )
+        ]
+
+    def resolve_device(self, device_id, device_type_id, role_id, tag_ids=()):
+        """Return weighted and ordered list of ValidatedSoftwareLCM objects applicable to a Device."""
+        return self._ordered(
+            (self.device_weight(rule_id, device_id, device_type_id, role_id), rule_id)
+            for rule_id in self.device_rule_ids(device_id, device_type_id, role_id, tag_ids)
+        )
+
+    def resolve_inventory_item(self, item_id, tag_ids=()):
+        """Return weighted and ordered list of ValidatedSoftwareLCM objects applicable to an InventoryItem."""
+        return self._ordered(
+            (self.inventory_item_weight(rule_id), rule_id) for rule_id in self.inventory_item_rule_ids(item_id, tag_ids)
+        )
+
+    def resolve_many(self, items):
+        """Return mapping of object pk to the ordered list of applicable ValidatedSoftwareLCM objects.
+
+        Args:
+            items: iterable of Device or InventoryItem objects (mixing of both types is not supported)
+        """
+        items = list(items)
+        if not items:
+            return {}
+        item_tags = defaultdict(set)
+        for object_id, tag_id in TaggedItem.objects.filter(
+            content_type=ContentType.objects.get_for_model(items[0]),
+            object_id__in=[item.pk for item in items],
+        ).values_list("object_id", "tag_id"):
+            item_tags[object_id].add(tag_id)
+        if isinstance(items[0], Device):
+            return {
+                item.pk: self.resolve_device(item.pk, item.device_type_id, item.role_id, item_tags[item.pk])
+                for item in items
+            }
+        return {item.pk: self.resolve_inventory_item(item.pk, item_tags[item.pk]) for item in items}
+
+    @staticmethod
+    def is_valid(rule, on_date=None):
+        """Return True if the ValidatedSoftwareLCM object is valid on the given date, today by default."""
+        on_date = on_date or date.today()
+        if rule.end:
+            return rule.end >= on_date >= rule.start
+
+        return on_date >= rule.start
+
+
+class ValidityWindowIndex:
+    """Interval index of ValidatedSoftwareLCM validity windows over a list of target dates.
+
+    Each `start`/`end` window is translated once into the range of target dates it contains, validity of any set of
+    ValidatedSoftwareLCM objects on all target dates is then resolved by merging ranges, without comparing dates.
+    """
+
+    def __init__(self, rules, dates):
+        """Initialize ValidityWindowIndex.
+
+        Args:
+            rules: iterable of ValidatedSoftwareLCM objects
+            dates: iterable of target dates, stored sorted and without duplicates in `dates`
+        """
+        self.dates = sorted(set(dates))
+        self.ranges = {}
+        for rule in rules:
+            lower = bisect_left(self.dates, rule.start)
+            upper = bisect_right(self.dates, rule.end) if rule.end else len(self.dates)
+            if lower < upper:
+                self.ranges[rule.pk] = (lower, upper)
+
+    def valid_ranges(self, rule_ids):
+        """Return sorted and disjoint `(lower, upper)` ranges of indexes in `dates` on which any rule is valid.
+
+        Lower index is inclusive, upper index is exclusive.
+        """
+        merged = []
+        for lower, upper in sorted(self.ranges[rule_id] for rule_id in rule_ids if rule_id in self.ranges):
+            if merged and lower <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], upper))
+            else:
+                merged.append((lower, upper))
+
+        return merged
+
+    def valid_on_dates(self, rule_ids):
+        """Return list of booleans, one per date in `dates`, True when any of the rules is valid on the date."""
+        valid = [False] * len(self.dates)
+        for lower, upper in self.valid_ranges(rule_ids):
+            valid[lower:upper] = [True] * (upper - lower)
+
+        return valid
+
+
 class DeviceSoftwareImageFilter:
     """Filter SoftwareImageLCM objects based on the Device object."""
 
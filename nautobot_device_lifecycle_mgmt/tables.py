@@ -17,6 +17,7 @@ from nautobot_device_lifecycle_mgmt.models import (
     SoftwareImageLCM,
     SoftwareLCM,
     ValidatedSoftwareLCM,
+    VulnerabilityExposure,
     VulnerabilityLCM,
 )
 
@@ -614,3 +615,47 @@ class VulnerabilityLCMTable(StatusTableMixin, BaseTable):
             "status",
             "actions",
         )
+
+
+class VulnerabilityExposureTable(BaseTable):
+    """Table for a list of device and inventory item vulnerability exposure rollups."""
+
+    device = tables.Column(linkify=True)
+    inventory_item = tables.Column(linkify=True, verbose_name="Inventory Item")
+    critical_count = tables.Column(verbose_name="Critical")
+    high_count = tables.Column(verbose_name="High")
+    medium_count = tables.Column(verbose_name="Medium")
+    low_count = tables.Column(verbose_name="Low")
+    none_count = tables.Column(verbose_name="None")
+    total_count = tables.Column(verbose_name="Total")
+    max_cvss_v3 = tables.Column(verbose_name="Max CVSSv3")
+    oldest_published_date = tables.DateColumn(verbose_name="Oldest Published")
+
+    class Meta(BaseTable.Meta):
+        """Meta attributes."""
+
+        model = VulnerabilityExposure
+        fields = (
+            "device",
+            "inventory_item",
+            "critical_count",
+            "high_count",
+            "medium_count",
+            "low_count",
+            "none_count",
+            "total_count",
+            "max_cvss_v3",
+            "oldest_published_date",
+            "last_updated",
+        )
+        default_columns = (
+            "device",
+            "inventory_item",
+            "critical_count",
+            "high_count",
+            "medium_count",
+            "low_count",
+            "total_count",
+            "max_cvss_v3",
+            "oldest_published_date",
+        )
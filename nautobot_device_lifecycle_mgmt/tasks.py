@@ -0,0 +1,472 @@
+"""Background tasks for the Lifecycle Management app."""
+
+import hashlib
+import logging
+import uuid
+from datetime import date, datetime
+
+from celery import chain, chord
+from django.conf import settings
+from django.core.cache import cache
+from nautobot.core.celery import nautobot_task
+from nautobot.extras.choices import JobResultStatusChoices, LogLevelChoices
+from nautobot.extras.models import JobResult, Status
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.instrumentation import instrument_job, instrument_task
+from nautobot_device_lifecycle_mgmt.metrics import VALIDATION_METRICS, VULNERABILITY_METRICS, write_metrics_snapshot
+from nautobot_device_lifecycle_mgmt.models import CVELCM
+from nautobot_device_lifecycle_mgmt.validation import VALIDATION_ENGINES
+from nautobot_device_lifecycle_mgmt.vulnerabilities import VulnerabilityGenerationEngine
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+VALIDATION_CACHE_PREFIX = "nautobot_device_lifecycle_mgmt:validation"
+VULNERABILITY_CACHE_PREFIX = "nautobot_device_lifecycle_mgmt:vulnerabilities"
+PROJECTION_CACHE_PREFIX = "nautobot_device_lifecycle_mgmt:projection"
+PENDING_TIMEOUT = 60 * 60 * 24
+# Maximum number of seconds a compliance projection is expected to take, a lost task is requeued after it
+PROJECTION_PENDING_TIMEOUT = 60 * 30
+VALIDATION_COUNTS = ("processed", "new", "changed", "unchanged", "software_removed")
+VULNERABILITY_COUNTS = ("processed", "created", "skipped", "resolved", "reopened")
+
+
+def _pending_cache_keys(prefix, kind):
+    """Return cache keys holding the pending items, the pending items lock and the scheduled task flag."""
+    prefix = f"{prefix}:{kind}"
+    return f"{prefix}:pending", f"{prefix}:lock", f"{prefix}:scheduled"
+
+
+def _validation_cache_keys(kind):
+    """Return cache keys holding the pending pks, the pending pks lock and the scheduled task flag."""
+    return _pending_cache_keys(VALIDATION_CACHE_PREFIX, kind)
+
+
+def _vulnerability_cache_keys(kind):
+    """Return cache keys holding the pending pairs, the pending pairs lock and the scheduled task flag."""
+    return _pending_cache_keys(VULNERABILITY_CACHE_PREFIX, kind)
+
+
+def _queue_pending(cache_keys, items, task, kind, delay):
+    """Add items to the pending items, scheduling task to process them after delay unless already scheduled."""
+    pending_key, lock_key, scheduled_key = cache_keys
+    with cache.lock(lock_key, timeout=60):
+        pending = cache.get(pending_key, set())
+        pending.update(items)
+        cache.set(pending_key, pending, timeout=PENDING_TIMEOUT)
+
+    # The flag expires on its own in case the scheduled task was lost
+    if cache.add(scheduled_key, True, timeout=delay + 300):
+        task.apply_async(args=(kind,), countdown=delay)
+
+
+def _pop_pending(cache_keys):
+    """Return and clear the pending items, allowing a new task to be scheduled for items queued from now on."""
+    pending_key, lock_key, scheduled_key = cache_keys
+    # Clear the flag first, changes queued from now on schedule a new task
+    cache.delete(scheduled_key)
+    with cache.lock(lock_key, timeout=60):
+        pending = cache.get(pending_key, set())
+        cache.delete(pending_key)
+
+    return pending
+
+
+def queue_software_validation(kind, pks):
+    """Queue objects for revalidation, coalescing changes made within the configured delay into one task.
+
+    Args:
+        kind (str): type of the objects, key of `VALIDATION_ENGINES`
+        pks (iterable): pks of the objects to revalidate
+    """
+    pks = {str(pk) for pk in pks}
+    if not pks or not PLUGIN_CFG.get("event_driven_validation", False):
+        return
+
+    _queue_pending(
+        _validation_cache_keys(kind),
+        pks,
+        validate_pending_software,
+        kind,
+        PLUGIN_CFG.get("event_driven_validation_delay", 10),
+    )
+
+
+@nautobot_task
+def validate_pending_software(kind):
+    """Revalidate software of the objects queued by `queue_software_validation`."""
+    pending = _pop_pending(_validation_cache_keys(kind))
+    if not pending:
+        return {"processed": 0}
+
+    engine_class = VALIDATION_ENGINES[kind]
+    engine = engine_class(
+        queryset=engine_class.soft_obj_model.objects.filter(pk__in=pending),
+        run_type=choices.ReportRunTypeChoices.REPORT_EVENT_RUN,
+    )
+    counts = engine.run()
+    logger.info("Revalidated software on %d %s objects.", counts["processed"], kind)
+
+    return counts
+
+
+def queue_vulnerability_generation(kind, pairs):
+    """Queue pairs exposing new vulnerabilities, coalescing changes made within the configured delay into one task.
+
+    Args:
+        kind (str): `cve_software` for CVE affected software, `device` or `inventory_item` for software assignments
+        pairs (iterable): `(cve_id, software_id)` or `(software_id, obj_id)` tuples
+    """
+    pairs = {(str(first), str(second)) for first, second in pairs}
+    if not pairs or not PLUGIN_CFG.get("event_driven_vulnerabilities", False):
+        return
+
+    _queue_pending(
+        _vulnerability_cache_keys(kind),
+        pairs,
+        generate_pending_vulnerabilities,
+        kind,
+        PLUGIN_CFG.get("event_driven_vulnerabilities_delay", 10),
+    )
+
+
+@nautobot_task
+def generate_pending_vulnerabilities(kind):
+    """Create missing vulnerabilities exposed by the pairs queued by `queue_vulnerability_generation`."""
+    pending = sorted(_pop_pending(_vulnerability_cache_keys(kind)))
+    engine = VulnerabilityGenerationEngine()
+    counts = {"processed": len(pending), "created": 0}
+    for offset in range(0, len(pending), engine.chunk_size):
+        counts["created"] += engine.generate_for_pairs(
+            kind,
+            [(uuid.UUID(first), uuid.UUID(second)) for first, second in pending[offset : offset + engine.chunk_size]],
+        )
+    counts["refreshed"] = engine.refresh_changed()
+    if pending:
+        logger.info("Generated %d vulnerabilities for %d changed %s pairs.", counts["created"], len(pending), kind)
+
+    return counts
+
+
+def _projection_cache_key(object_type, dates):
+    """Return cache key of the compliance projection of the object type on the dates, as of the last validation run."""
+    last_run = VALIDATION_ENGINES[object_type]().get_last_run()
+    digest = hashlib.sha256(",".join([str(last_run), *(on_date.isoformat() for on_date in dates)]).encode()).hexdigest()
+
+    return f"{PROJECTION_CACHE_PREFIX}:{object_type}:{digest}"
+
+
+def get_compliance_projection(object_type, dates):
+    """Return the cached compliance projection, queuing a task computing it when not cached.
+
+    Projections are cached per validation run, a new run makes them computed again.
+
+    Args:
+        object_type (str): type of the objects, key of `VALIDATION_ENGINES`
+        dates (list): dates to evaluate compliance on
+
+    Returns:
+        dict: projection as returned by `ItemSoftwareValidationEngine.project`, None while being computed
+    """
+    cache_key = _projection_cache_key(object_type, dates)
+    projection = cache.get(cache_key)
+    if projection is None and cache.add(f"{cache_key}:pending", True, timeout=PROJECTION_PENDING_TIMEOUT):
+        compute_compliance_projection.apply_async(
+            args=(object_type, [on_date.isoformat() for on_date in dates], cache_key)
+        )
+
+    return projection
+
+
+@nautobot_task
+def compute_compliance_projection(object_type, dates, cache_key):
+    """Compute the compliance projection of the objects on the ISO formatted dates and store it in the cache."""
+    projection = VALIDATION_ENGINES[object_type]().project([date.fromisoformat(on_date) for on_date in dates])
+    cache.set(cache_key, projection, timeout=PLUGIN_CFG.get("compliance_projection_cache_ttl", 3600))
+    cache.delete(f"{cache_key}:pending")
+
+
+def get_validation_shards(queryset, shard_size):
+    """Split the pk space of queryset into ranges holding at most shard_size objects.
+
+    Returns:
+        list: `(lower, upper)` tuples, lower pk inclusive, upper pk exclusive, None meaning unbounded
+    """
+    boundaries = [
+        str(pk)
+        for index, pk in enumerate(queryset.order_by("pk").values_list("pk", flat=True).iterator())
+        if index and index % shard_size == 0
+    ]
+
+    return list(zip([None, *boundaries], [*boundaries, None]))
+
+
+def dispatch_parallel_validation(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    kind, job_result_id, job_name, run_type, job_run_time, since=None
+):
+    """Validate objects in shards processed by parallel Celery tasks, reporting totals into the JobResult.
+
+    Shards are spread over at most `validation_max_concurrency` chains of tasks, a chord callback aggregates
+    the counts once all chains are done and records the run instrumentation under job_name.
+
+    Returns:
+        tuple: number of shards and number of parallel chains
+    """
+    engine_class = VALIDATION_ENGINES[kind]
+    shards = get_validation_shards(engine_class().queryset, PLUGIN_CFG.get("validation_shard_size", 5000))
+    max_concurrency = max(PLUGIN_CFG.get("validation_max_concurrency", 4), 1)
+    lanes = [shards[offset::max_concurrency] for offset in range(min(max_concurrency, len(shards)))]
+    options = {
+        "kind": kind,
+        "run_type": run_type,
+        "job_run_time": job_run_time.isoformat(),
+        "since": since.isoformat() if since else None,
+    }
+
+    chord(
+        chain(
+            validate_software_shard.s(None, lane[0], options),
+            *(validate_software_shard.s(shard, options) for shard in lane[1:]),
+        )
+        for lane in lanes
+    )(aggregate_software_validation.s(kind, str(job_result_id), job_name, run_type))
+
+    return len(shards), len(lanes)
+
+
+@nautobot_task
+def validate_software_shard(counts, shard, options):
+    """Validate objects of a shard, adding the outcome to counts of the previous shard in the chain.
+
+    Args:
+        counts (dict): counts of the previous shard in the chain, None for the first shard
+        shard (list): lower (inclusive) and upper (exclusive) pk of the shard, None meaning unbounded
+        options (dict): kind of the objects, run type, job run time and since (ISO formatted)
+    """
+    counts = counts or {
+        **dict.fromkeys(VALIDATION_COUNTS, 0),
+        "shards": 0,
+        "failed": [],
+        "phase_seconds": {},
+        "queries": 0,
+    }
+    lower, upper = shard
+    kind = options["kind"]
+    engine_class = VALIDATION_ENGINES[kind]
+    queryset = engine_class.soft_obj_model.objects.all()
+    if lower:
+        queryset = queryset.filter(pk__gte=lower)
+    if upper:
+        queryset = queryset.filter(pk__lt=upper)
+
+    with instrument_task(counts) as task_run:
+        try:
+            engine = engine_class(
+                queryset=queryset,
+                run_type=options["run_type"],
+                job_run_time=datetime.fromisoformat(options["job_run_time"]),
+            )
+            shard_counts = engine.run(since=datetime.fromisoformat(options["since"]) if options["since"] else None)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.exception("Validation of %s shard [%s, %s) failed.", kind, lower, upper)
+            counts["failed"].append({"lower": lower, "upper": upper, "error": str(err)})
+        else:
+            for key in VALIDATION_COUNTS:
+                counts[key] += shard_counts[key]
+            task_run.add_engine(engine, shard_counts["processed"])
+    counts["shards"] += 1
+
+    return counts
+
+
+@nautobot_task
+def aggregate_software_validation(
+    lane_counts, kind, job_result_id, job_name, run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN
+):
+    """Report totals of the parallel validation into the JobResult that dispatched it and record a compliance snapshot.
+
+    The run is instrumented under job_name, like serial runs, with the phase durations and queries of all shards.
+    """
+    totals = {**dict.fromkeys(VALIDATION_COUNTS, 0), "shards": 0, "failed": []}
+    for counts in lane_counts:
+        for key in totals:
+            totals[key] += counts[key]
+
+    job_result = JobResult.objects.get(pk=job_result_id)
+    with instrument_job(job_name, started=job_result.date_created.timestamp()) as job_run:
+        job_run.add_tasks(lane_counts)
+        verbose_name = VALIDATION_ENGINES[kind].soft_obj_model._meta.verbose_name_plural
+        job_result.log(
+            f"Performed validation on: {totals['processed']} {verbose_name} in {totals['shards']} shards.",
+            grouping="parallel validation",
+        )
+        job_result.log(
+            f"Validation results: {totals['new']} new, {totals['changed']} changed, {totals['unchanged']} unchanged, "
+            f"{totals['software_removed']} with software removed.",
+            grouping="parallel validation",
+        )
+        for failure in totals["failed"]:
+            job_result.log(
+                f"Validation of shard [{failure['lower']}, {failure['upper']}) failed: {failure['error']}",
+                level_choice=LogLevelChoices.LOG_ERROR,
+                grouping="parallel validation",
+            )
+        if totals["failed"]:
+            job_result.set_status(JobResultStatusChoices.STATUS_FAILURE)
+            job_result.save()
+            job_run.failed = True
+        VALIDATION_ENGINES[kind](run_type=run_type).create_compliance_snapshot()
+        write_metrics_snapshot(VALIDATION_METRICS[kind])
+
+    return totals
+
+
+def get_cve_partitions(queryset, partition_size):
+    """Split the CVEs of queryset into `published_date` windows holding about partition_size CVEs.
+
+    CVEs published on the same day are kept in the same window, which may hence hold more CVEs.
+
+    Returns:
+        list: `(lower, upper)` ISO formatted dates, lower inclusive, upper exclusive, None meaning unbounded
+    """
+    boundaries = []
+    count = 0
+    previous = None
+    for published_date in queryset.order_by("published_date").values_list("published_date", flat=True).iterator():
+        if count >= partition_size and published_date != previous:
+            boundaries.append(published_date.isoformat())
+            count = 0
+        count += 1
+        previous = published_date
+
+    return list(zip([None, *boundaries], [*boundaries, None]))
+
+
+def dispatch_parallel_vulnerabilities(job_result_id, job_name, published_after, reconcile=False, resolved_status=None):
+    """Generate vulnerabilities in CVE partitions processed by parallel Celery tasks, reporting totals into the JobResult.
+
+    Partitions are spread over at most `vulnerability_max_concurrency` chains of tasks, a chord callback aggregates
+    the counts, refreshes the exposure rollups and records the run instrumentation under job_name once all chains
+    are done.
+
+    Returns:
+        tuple: number of partitions and number of parallel chains
+    """
+    cves = CVELCM.objects.filter(published_date__gte=published_after)
+    partitions = get_cve_partitions(cves, PLUGIN_CFG.get("vulnerability_partition_size", 5000))
+    max_concurrency = max(PLUGIN_CFG.get("vulnerability_max_concurrency", 4), 1)
+    lanes = [partitions[offset::max_concurrency] for offset in range(min(max_concurrency, len(partitions)))]
+    closed_statuses = {*PLUGIN_CFG.get("vulnerability_closed_statuses", [])}
+    if resolved_status is not None:
+        closed_statuses.add(resolved_status.name)
+    options = {
+        "published_after": published_after.isoformat(),
+        "reconcile": reconcile,
+        "resolved_status": str(resolved_status.pk) if resolved_status is not None else None,
+        "closed_statuses": sorted(closed_statuses),
+    }
+
+    chord(
+        chain(
+            generate_vulnerabilities_partition.s(None, lane[0], options),
+            *(generate_vulnerabilities_partition.s(partition, options) for partition in lane[1:]),
+        )
+        for lane in lanes
+    )(aggregate_vulnerability_generation.s(str(job_result_id), job_name, options["closed_statuses"]))
+
+    return len(partitions), len(lanes)
+
+
+@nautobot_task
+def generate_vulnerabilities_partition(counts, partition, options):  # pylint: disable=too-many-locals
+    """Generate vulnerabilities of the CVEs of a partition, adding the outcome to counts of the previous partition.
+
+    Exposure rollups are not refreshed, objects with created or resolved vulnerabilities are collected into counts
+    and refreshed once by `aggregate_vulnerability_generation`, after all partitions are written.
+
+    Args:
+        counts (dict): counts of the previous partition in the chain, None for the first partition
+        partition (list): lower (inclusive) and upper (exclusive) published date, None meaning unbounded
+        options (dict): published after date (ISO formatted), reconcile, resolved status pk and closed statuses
+    """
+    counts = counts or {
+        **dict.fromkeys(VULNERABILITY_COUNTS, 0),
+        "partitions": 0,
+        "failed": [],
+        "changed": {field_name: [] for field_name in VulnerabilityGenerationEngine.targets},
+        "phase_seconds": {},
+        "queries": 0,
+    }
+    lower, upper = partition
+    cves = CVELCM.objects.filter(published_date__gte=options["published_after"])
+    if lower:
+        cves = cves.filter(published_date__gte=lower)
+    if upper:
+        cves = cves.filter(published_date__lt=upper)
+    resolved_status = Status.objects.get(pk=options["resolved_status"]) if options["resolved_status"] else None
+
+    engine = VulnerabilityGenerationEngine(cves=cves, closed_statuses=options["closed_statuses"])
+    with instrument_task(counts) as task_run:
+        try:
+            for cve_ids in engine.iter_chunks():
+                chunk_counts = engine.process(cve_ids, reconcile=options["reconcile"], resolved_status=resolved_status)
+                for key, value in chunk_counts.items():
+                    counts[key] += value
+                counts["processed"] += len(cve_ids)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            logger.exception("Vulnerability generation of partition [%s, %s) failed.", lower, upper)
+            counts["failed"].append({"lower": lower, "upper": upper, "error": str(err)})
+        task_run.add_engine(engine, 0)
+    for field_name, obj_ids in engine.changed.items():
+        counts["changed"][field_name] = sorted({*counts["changed"][field_name], *(str(pk) for pk in obj_ids)})
+    counts["partitions"] += 1
+
+    return counts
+
+
+@nautobot_task
+def aggregate_vulnerability_generation(lane_counts, job_result_id, job_name, closed_statuses=()):
+    """Report totals of the parallel vulnerability generation into the JobResult that dispatched it.
+
+    Exposure rollups of the objects collected by the partitions are refreshed here, once. The run is instrumented
+    under job_name, like serial runs, with the phase durations and queries of all partitions.
+    """
+    totals = {**dict.fromkeys(VULNERABILITY_COUNTS, 0), "partitions": 0, "failed": []}
+    engine = VulnerabilityGenerationEngine(closed_statuses=closed_statuses)
+    for counts in lane_counts:
+        for key in totals:
+            totals[key] += counts[key]
+        for field_name, obj_ids in counts["changed"].items():
+            engine.changed[field_name].update(uuid.UUID(pk) for pk in obj_ids)
+
+    job_result = JobResult.objects.get(pk=job_result_id)
+    with instrument_job(job_name, started=job_result.date_created.timestamp()) as job_run:
+        job_run.add_tasks(lane_counts)
+        totals["refreshed"] = engine.refresh_changed()
+        job_result.log(
+            f"Processed {totals['processed']} CVEs in {totals['partitions']} partitions: {totals['created']} "
+            f"Vulnerabilities created, {totals['skipped']} already existing, {totals['resolved']} resolved, "
+            f"{totals['reopened']} reopened.",
+            grouping="parallel generation",
+        )
+        job_result.log(
+            f"Refreshed {totals['refreshed']} Vulnerability Exposure rollups.",
+            grouping="parallel generation",
+        )
+        for failure in totals["failed"]:
+            job_result.log(
+                f"Vulnerability generation of partition [{failure['lower']}, {failure['upper']}) failed: "
+                f"{failure['error']}",
+                level_choice=LogLevelChoices.LOG_ERROR,
+                grouping="parallel generation",
+            )
+        if totals["failed"]:
+            job_result.set_status(JobResultStatusChoices.STATUS_FAILURE)
+            job_result.save()
+            job_run.failed = True
+        write_metrics_snapshot(VULNERABILITY_METRICS)
+        job_run.add_engine(engine, 0)
+
+    return totals
@@ -142,7 +142,7 @@ class InventoryItemSoftwareLCMAndValidatedSoftwareLCM(
     def right_page(self):
         """Display table on right side of page."""
         extra_context = {
-            "validsoft_table": self.inventory_item_software.get_validated_software_table,
+            "validsoft_table": self.inventory_item_software.get_validated_software_table(),
             "obj_soft": self.inventory_item_software.software,
             "obj_soft_valid": self.inventory_item_software.validate_software(),
         }
@@ -6,9 +6,11 @@ from unittest import skip
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from nautobot.apps.testing import APIViewTestCases
+from django.urls import reverse
+from nautobot.apps.testing import APITestCase, APIViewTestCases
 from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, LocationType, Manufacturer, Platform
-from nautobot.extras.models import Role, Status, Tag
+from nautobot.extras.choices import ObjectChangeActionChoices
+from nautobot.extras.models import ObjectChange, Role, Status, Tag
 
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
@@ -18,7 +20,9 @@ from nautobot_device_lifecycle_mgmt.models import (
     SoftwareImageLCM,
     SoftwareLCM,
     ValidatedSoftwareLCM,
+    VulnerabilityExposure,
     VulnerabilityLCM,
+    VulnerabilityRiskScore,
 )
 from nautobot_device_lifecycle_mgmt.tests.conftest import create_cves, create_devices, create_softwares
 
@@ -460,6 +464,120 @@ class CVELCMAPITest(APIViewTestCases.APIViewTestCase):
         pass
 
 
+class CVELCMBulkUpsertAPITest(APITestCase):
+    """Test the CVELCM bulk upsert API."""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("plugins-api:nautobot_device_lifecycle_mgmt-api:cvelcm-bulk-upsert")
+        self.add_permissions(
+            "nautobot_device_lifecycle_mgmt.add_cvelcm", "nautobot_device_lifecycle_mgmt.change_cvelcm"
+        )
+        self.software_1, self.software_2, *_ = create_softwares()
+        self.cve = CVELCM.objects.create(
+            name="CVE-2021-1391",
+            published_date=datetime.date(2021, 3, 24),
+            link="https://www.cvedetails.com/cve/CVE-2021-1391/",
+            severity="High",
+        )
+        self.cve.affected_softwares.set([self.software_1])
+
+    def test_bulk_upsert(self):
+        data = [
+            {
+                "name": "CVE-2021-1391",
+                "severity": "High",
+                "affected_softwares": [{"platform": "cisco_ios", "version": "15.1(2)M"}],
+            },
+            {
+                "name": "CVE-2021-44228",
+                "published_date": "2021-12-10",
+                "link": "https://www.cvedetails.com/cve/CVE-2021-44228/",
+                "severity": "Critical",
+                "cvss_v3": 10.0,
+                "affected_softwares": [
+                    {"platform": "cisco_ios", "version": "15.1(2)M"},
+                    {"platform": "cisco_ios", "version": "4.22.9M"},
+                ],
+            },
+        ]
+
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual((response.data["created"], response.data["updated"], response.data["unchanged"]), (1, 0, 1))
+        self.assertEqual(
+            [(result["name"], result["result"]) for result in response.data["results"]],
+            [("CVE-2021-1391", "unchanged"), ("CVE-2021-44228", "created")],
+        )
+        cve = CVELCM.objects.get(name="CVE-2021-44228")
+        self.assertEqual(response.data["results"][1]["id"], cve.pk)
+        self.assertEqual((cve.severity, cve.cvss_v3), ("Critical", 10.0))
+        self.assertEqual(set(cve.affected_softwares.all()), {self.software_1, self.software_2})
+
+    def test_bulk_upsert_updates_fields_and_software(self):
+        data = [
+            {
+                "name": "CVE-2021-1391",
+                "severity": "Critical",
+                "affected_softwares": [{"platform": "cisco_ios", "version": "4.22.9M"}],
+            }
+        ]
+
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.data["results"][0]["result"], "updated")
+        self.cve.refresh_from_db()
+        self.assertEqual(self.cve.severity, "Critical")
+        self.assertEqual(self.cve.link, "https://www.cvedetails.com/cve/CVE-2021-1391/")
+        self.assertEqual(list(self.cve.affected_softwares.all()), [self.software_2])
+
+    def test_bulk_upsert_records_changes(self):
+        data = [
+            {"name": "CVE-2021-1391", "severity": "Critical"},
+            {"name": "CVE-2021-44228", "published_date": "2021-12-10", "link": "https://nvd.nist.gov/"},
+            {"name": "CVE-2021-1392", "published_date": "2021-03-24", "link": "https://nvd.nist.gov/"},
+        ]
+        CVELCM.objects.create(name="CVE-2021-1392", published_date="2021-03-24", link="https://nvd.nist.gov/")
+        changes = ObjectChange.objects.filter(changed_object_type=ContentType.objects.get_for_model(CVELCM))
+        changes.delete()
+
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(
+            set(changes.values_list("object_repr", "action", "user")),
+            {
+                ("CVE-2021-1391", ObjectChangeActionChoices.ACTION_UPDATE, self.user.pk),
+                ("CVE-2021-44228", ObjectChangeActionChoices.ACTION_CREATE, self.user.pk),
+            },
+        )
+        self.assertEqual(changes.get(object_repr="CVE-2021-1391").object_data["severity"], "Critical")
+
+    def test_bulk_upsert_invalid_items_apply_nothing(self):
+        data = [
+            {"name": "CVE-2021-1391", "severity": "Critical"},
+            {"name": "CVE-2021-44228", "affected_softwares": [{"platform": "cisco_ios", "version": "99.9"}]},
+        ]
+
+        response = self.client.post(self.url, data, format="json", **self.header)
+
+        self.assertHttpStatus(response, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(set(response.data[1]), {"published_date", "link", "affected_softwares"})
+        self.cve.refresh_from_db()
+        self.assertEqual(self.cve.severity, "High")
+        self.assertFalse(CVELCM.objects.filter(name="CVE-2021-44228").exists())
+
+    def test_bulk_upsert_without_permission(self):
+        self.user.object_permissions.all().delete()
+
+        response = self.client.post(self.url, [{"name": "CVE-2021-1391"}], format="json", **self.header)
+
+        self.assertHttpStatus(response, 403)
+
+
 class VulnerabilityLCMAPITest(
     # Not inheriting CreateObjectViewTestCase
     APIViewTestCases.GetObjectViewTestCase,
@@ -750,3 +868,50 @@ class ProviderLCMAPITest(APIViewTestCases.APIViewTestCase):
     @skip("Not implemented")
     def test_bulk_delete_objects(self):
         pass
+
+
+class VulnerabilityExposureAPITest(
+    # Read only, created by the vulnerability generation
+    APIViewTestCases.GetObjectViewTestCase,
+    APIViewTestCases.ListObjectsViewTestCase,
+):
+    """Test the VulnerabilityExposure API."""
+
+    model = VulnerabilityExposure
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=invalid-name
+        """Set up test objects."""
+        for index, device in enumerate(create_devices()):
+            VulnerabilityExposure.objects.create(device=device, high_count=index, total_count=index + 1)
+
+    @skip("Not implemented")
+    def test_options_returns_expected_choices(self):
+        pass
+
+
+class VulnerabilityRiskScoreAPITest(
+    # Read only, created by the Score Vulnerability Risk job
+    APIViewTestCases.GetObjectViewTestCase,
+    APIViewTestCases.ListObjectsViewTestCase,
+):
+    """Test the VulnerabilityRiskScore API."""
+
+    model = VulnerabilityRiskScore
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=invalid-name
+        """Set up test objects."""
+        computed_at = datetime.datetime.now(datetime.timezone.utc)
+        devices = create_devices()
+        for index, device in enumerate(devices):
+            VulnerabilityRiskScore.objects.create(
+                scope="device", device=device, score=index, vulnerability_count=index, computed_at=computed_at
+            )
+        VulnerabilityRiskScore.objects.create(
+            scope="platform", platform=devices[0].platform, score=3, device_count=3, computed_at=computed_at
+        )
+
+    @skip("Not implemented")
+    def test_options_returns_expected_choices(self):
+        pass
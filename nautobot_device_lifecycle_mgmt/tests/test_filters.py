@@ -6,6 +6,7 @@ from datetime import date
 import time_machine
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from django.utils import timezone
 from nautobot.dcim.models import Device, DeviceType, Location, LocationType, Manufacturer, Platform
 from nautobot.extras.models import Role, Status
 
@@ -18,7 +19,9 @@ from nautobot_device_lifecycle_mgmt.filters import (
     SoftwareImageLCMFilterSet,
     SoftwareLCMFilterSet,
     ValidatedSoftwareLCMFilterSet,
+    VulnerabilityExposureFilterSet,
     VulnerabilityLCMFilterSet,
+    VulnerabilityRiskScoreFilterSet,
 )
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
@@ -28,7 +31,9 @@ from nautobot_device_lifecycle_mgmt.models import (
     SoftwareImageLCM,
     SoftwareLCM,
     ValidatedSoftwareLCM,
+    VulnerabilityExposure,
     VulnerabilityLCM,
+    VulnerabilityRiskScore,
 )
 
 from .conftest import create_cves, create_devices, create_inventory_items, create_softwares
@@ -335,6 +340,15 @@ class ValidatedSoftwareLCMFilterSetTestCase(TestCase):
             params = {"valid": False}
             self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
 
+    def test_valid_on(self):
+        """Test valid filter evaluated on the valid_on date."""
+        params = {"valid_on": "2019-06-11"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+        params = {"valid_on": "2019-06-11", "valid": False}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+        params = {"valid_on": "2021-01-04", "valid": True}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 3)
+
 
 class DeviceSoftwareValidationResultFilterSetTestCase(TestCase):
     """Tests for the DeviceSoftwareValidationResult model."""
@@ -431,6 +445,27 @@ class DeviceSoftwareValidationResultFilterSetTestCase(TestCase):
         params = {"location": [self.location.name]}
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
 
+    def test_valid(self):
+        """Test valid filter."""
+        params = {"valid": True}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+        params = {"valid": False}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+
+    def test_valid_on(self):
+        """Test valid filter evaluated on the valid_on date."""
+        validated_software = ValidatedSoftwareLCM.objects.create(
+            software=self.software, start=date(2019, 1, 10), end=date(2023, 5, 14)
+        )
+        validated_software.device_software_validation_results.set(self.queryset.exclude(software=None))
+
+        params = {"valid_on": "2020-01-01"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+        params = {"valid_on": "2024-01-01", "valid": True}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 0)
+        params = {"valid_on": "2024-01-01", "valid": False}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 3)
+
 
 class InventoryItemSoftwareValidationResultFilterSetTestCase(TestCase):
     """Tests for the DeviceSoftwareValidationResult model."""
@@ -811,3 +846,88 @@ class SoftwareImageLCMFilterSetTestCase(TestCase):
         """Test device_types filter."""
         params = {"device_types": [self.devicetype_2.model]}
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
+
+class VulnerabilityExposureFilterSetTestCase(TestCase):
+    """Tests for the VulnerabilityExposure model."""
+
+    queryset = VulnerabilityExposure.objects.all()
+    filterset = VulnerabilityExposureFilterSet
+
+    def setUp(self):
+        """Set up test objects."""
+        item_1, _, item_3 = create_inventory_items()
+        VulnerabilityExposure.objects.create(
+            device=item_1.device, critical_count=2, high_count=1, total_count=3, max_cvss_v3=9.8
+        )
+        VulnerabilityExposure.objects.create(device=item_3.device, low_count=1, total_count=1, max_cvss_v3=3.1)
+        VulnerabilityExposure.objects.create(inventory_item=item_3, high_count=1, total_count=1, max_cvss_v3=7.5)
+
+    def test_q_device_name(self):
+        """Test q filter to find single record based on the device name."""
+        params = {"q": "sw1"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
+    def test_q_inventory_item_name(self):
+        """Test q filter to find single record based on the inventory item name."""
+        params = {"q": "Line Card"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
+    def test_location(self):
+        """Test location filter matching devices and inventory items of devices."""
+        params = {"location": ["Location2"]}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+
+    def test_severity(self):
+        """Test severity filter."""
+        params = {"severity": CVESeverityChoices.HIGH}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+        params = {"severity": CVESeverityChoices.CRITICAL}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
+    def test_max_cvss_v3(self):
+        """Test max_cvss_v3 range filter."""
+        params = {"max_cvss_v3__gte": [7.0]}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+
+
+class VulnerabilityRiskScoreFilterSetTestCase(TestCase):
+    """Tests for the VulnerabilityRiskScore model."""
+
+    queryset = VulnerabilityRiskScore.objects.all()
+    filterset = VulnerabilityRiskScoreFilterSet
+
+    def setUp(self):
+        """Set up test objects."""
+        device_1, _, device_3 = create_devices()
+        computed_at = timezone.now()
+        VulnerabilityRiskScore.objects.create(scope="device", device=device_1, score=12.5, computed_at=computed_at)
+        VulnerabilityRiskScore.objects.create(scope="device", device=device_3, score=0.5, computed_at=computed_at)
+        VulnerabilityRiskScore.objects.create(
+            scope="location", location=device_1.location, score=12.5, computed_at=computed_at
+        )
+        VulnerabilityRiskScore.objects.create(
+            scope="platform", platform=device_1.platform, score=13.0, computed_at=computed_at
+        )
+
+    def test_q(self):
+        """Test q filter matching device, location and platform names."""
+        params = {"q": "sw1"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+        params = {"q": "Location1"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
+    def test_scope(self):
+        """Test scope filter."""
+        params = {"scope": ["device"]}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+
+    def test_platform(self):
+        """Test platform filter."""
+        params = {"platform": ["cisco_ios"]}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
+    def test_score(self):
+        """Test score range filter."""
+        params = {"score__gte": [10]}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 3)
@@ -0,0 +1,128 @@
+"""nautobot_device_lifecycle_mgmt test class for the job instrumentation."""
+
+import time
+from collections import defaultdict
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from nautobot.dcim.models import Device
+
+from nautobot_device_lifecycle_mgmt.instrumentation import (
+    JOB_INSTRUMENTATION_CACHE_KEY,
+    instrument_job,
+    instrument_task,
+    metrics_lcm_job_instrumentation,
+)
+from nautobot_device_lifecycle_mgmt.validation import DeviceSoftwareValidationEngine
+from nautobot_device_lifecycle_mgmt.vulnerabilities import VulnerabilityGenerationEngine
+
+from .conftest import create_cves, create_devices
+
+
+class FakeEngine:  # pylint: disable=too-few-public-methods
+    """Engine with fixed phase durations."""
+
+    def __init__(self, **phase_seconds):
+        self.phase_seconds = defaultdict(float, phase_seconds)
+
+
+@mock.patch.dict(
+    "nautobot_device_lifecycle_mgmt.instrumentation.PLUGIN_CFG", enabled_metrics=["nautobot_lcm_job_instrumentation"]
+)
+class JobInstrumentationTestCase(TestCase):
+    """Tests for the job instrumentation."""
+
+    def setUp(self):
+        cache.delete(JOB_INSTRUMENTATION_CACHE_KEY)
+
+    def get_families(self):
+        """Return mapping of metric family name to `{label values: value}` of its samples."""
+        return {
+            family.name: {(*sample.labels.values(), sample.name): sample.value for sample in family.samples}
+            for family in metrics_lcm_job_instrumentation()
+        }
+
+    def test_engines_time_phases(self):
+        create_devices()
+        create_cves()
+
+        validation_engine = DeviceSoftwareValidationEngine()
+        validation_engine.run()
+        vulnerability_engine = VulnerabilityGenerationEngine()
+        vulnerability_engine.run(reconcile=True)
+
+        self.assertEqual(set(validation_engine.phase_seconds), {"load", "compute", "write"})
+        self.assertEqual(set(vulnerability_engine.phase_seconds), {"load", "compute", "write"})
+        self.assertTrue(all(seconds >= 0 for seconds in validation_engine.phase_seconds.values()))
+
+    def test_instrument_job_records_run(self):
+        for load_seconds in (0.05, 7):
+            with instrument_job("TestJob") as job_run:
+                Device.objects.count()
+                Device.objects.exists()
+                job_run.add_engine(FakeEngine(load=load_seconds, write=0.2), 10)
+
+        families = self.get_families()
+
+        histogram = families["nautobot_lcm_job_phase_duration_seconds"]
+        self.assertEqual(histogram["TestJob", "load", "0.1", "nautobot_lcm_job_phase_duration_seconds_bucket"], 1)
+        self.assertEqual(histogram["TestJob", "load", "5.0", "nautobot_lcm_job_phase_duration_seconds_bucket"], 1)
+        self.assertEqual(histogram["TestJob", "load", "10.0", "nautobot_lcm_job_phase_duration_seconds_bucket"], 2)
+        self.assertEqual(histogram["TestJob", "load", "+Inf", "nautobot_lcm_job_phase_duration_seconds_bucket"], 2)
+        self.assertAlmostEqual(histogram["TestJob", "load", "nautobot_lcm_job_phase_duration_seconds_sum"], 7.05)
+        self.assertEqual(histogram["TestJob", "write", "+Inf", "nautobot_lcm_job_phase_duration_seconds_bucket"], 2)
+        self.assertEqual(families["nautobot_lcm_job_db_queries"], {("TestJob", "nautobot_lcm_job_db_queries"): 2})
+        self.assertGreater(
+            families["nautobot_lcm_job_objects_per_second"]["TestJob", "nautobot_lcm_job_objects_per_second"], 0
+        )
+        self.assertIn(
+            ("TestJob", "nautobot_lcm_job_last_success_timestamp_seconds"),
+            families["nautobot_lcm_job_last_success_timestamp_seconds"],
+        )
+
+    def test_failed_run_not_recorded(self):
+        with self.assertRaises(ValueError):
+            with instrument_job("TestJob") as job_run:
+                job_run.add_engine(FakeEngine(load=1), 10)
+                raise ValueError
+
+        self.assertIsNone(cache.get(JOB_INSTRUMENTATION_CACHE_KEY))
+        self.assertEqual(self.get_families()["nautobot_lcm_job_db_queries"], {})
+
+    def test_parallel_run_records_tasks(self):
+        lane_counts = []
+        for load_seconds in (0.05, 0.2):
+            counts = {"processed": 5, "phase_seconds": {}, "queries": 0}
+            with instrument_task(counts) as task_run:
+                Device.objects.count()
+                task_run.add_engine(FakeEngine(load=load_seconds), 5)
+            lane_counts.append(counts)
+
+        with instrument_job("TestJob", started=time.time() - 10) as job_run:
+            job_run.add_tasks(lane_counts)
+
+        families = self.get_families()
+        histogram = families["nautobot_lcm_job_phase_duration_seconds"]
+        self.assertEqual(histogram["TestJob", "load", "0.1", "nautobot_lcm_job_phase_duration_seconds_bucket"], 0)
+        self.assertEqual(histogram["TestJob", "load", "0.5", "nautobot_lcm_job_phase_duration_seconds_bucket"], 1)
+        self.assertEqual(families["nautobot_lcm_job_db_queries"], {("TestJob", "nautobot_lcm_job_db_queries"): 2})
+        self.assertAlmostEqual(
+            families["nautobot_lcm_job_objects_per_second"]["TestJob", "nautobot_lcm_job_objects_per_second"],
+            1,
+            places=1,
+        )
+
+    def test_failed_parallel_run_not_recorded(self):
+        with instrument_job("TestJob") as job_run:
+            job_run.add_tasks([{"processed": 5, "phase_seconds": {"load": 1}, "queries": 1}])
+            job_run.failed = True
+
+        self.assertIsNone(cache.get(JOB_INSTRUMENTATION_CACHE_KEY))
+
+    def test_run_not_recorded_when_disabled(self):
+        with mock.patch.dict("nautobot_device_lifecycle_mgmt.instrumentation.PLUGIN_CFG", enabled_metrics=[]):
+            with instrument_job("TestJob"):
+                Device.objects.count()
+
+        self.assertIsNone(cache.get(JOB_INSTRUMENTATION_CACHE_KEY))
@@ -1,16 +1,49 @@
 """nautobot_device_lifecycle_mgmt test class for metrics."""
 
-from django.db import ProgrammingError
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import ProgrammingError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from nautobot.core.testing import TestCase
+from nautobot.dcim.models import Device, DeviceType, InventoryItem
+from nautobot.extras.models import Relationship, RelationshipAssociation, Status
+from prometheus_client.core import GaugeMetricFamily
 
 from nautobot_device_lifecycle_mgmt.metrics import (
+    CachedMetric,
+    metrics_lcm_contracts_expiring_provider,
+    metrics_lcm_hw_end_of_support,
     metrics_lcm_hw_end_of_support_location,
     metrics_lcm_hw_end_of_support_part_number,
+    metrics_lcm_open_vulnerabilities_location,
+    metrics_lcm_snapshot,
+    metrics_lcm_sw_end_of_support_software,
     metrics_lcm_validation_report_device_type,
     metrics_lcm_validation_report_inventory_item,
+    metrics_lcm_vulnerability_risk_score,
+    refresh_cached_metric,
+    write_metrics_snapshot,
+)
+from nautobot_device_lifecycle_mgmt.models import (
+    ContractLCM,
+    HardwareLCM,
+    MetricSnapshot,
+    ProviderLCM,
+    VulnerabilityLCM,
+    VulnerabilityRiskScore,
 )
 
-from .conftest import create_devices, create_inventory_item_hardware_notices, create_inventory_items
+from .conftest import (
+    create_cves,
+    create_devices,
+    create_inventory_item_hardware_notices,
+    create_inventory_items,
+    create_softwares,
+)
 
 
 class MetricsTest(TestCase):
@@ -99,3 +132,245 @@ class MetricsTest(TestCase):
         for sample in metric.samples:
             sample_labels = tuple(sample.labels.items())[0]
             self.assertEqual(expected_ts_samples[sample_labels], sample.value)
+
+    def test_metrics_lcm_hw_end_of_support_shares_snapshot(self):
+        """Test both hardware end of support gauges are generated from one snapshot."""
+        device_type = DeviceType.objects.get(model="6509-E")
+        HardwareLCM.objects.create(device_type=device_type, end_of_support=date(2020, 1, 1))
+        InventoryItem.objects.create(device=Device.objects.get(name="sw3"), name="Fan Tray")
+
+        with CaptureQueriesContext(connection) as queries:
+            part_number_gauge, location_gauge = metrics_lcm_hw_end_of_support(
+                ["nautobot_lcm_hw_end_of_support_per_part_number", "nautobot_lcm_hw_end_of_support_per_location"]
+            )
+
+        self.assertLessEqual(len(queries), 6)
+        self.assertEqual(
+            {sample.labels["part_number"]: sample.value for sample in part_number_gauge.samples},
+            {"6509-E": 3, "VS-S2T-10G": 1, "QSFP-100G-SR4-S": 1, "WS-X6548-GE-TX": 0, "Fan Tray": 0},
+        )
+        self.assertEqual(
+            {sample.labels["location"]: sample.value for sample in location_gauge.samples},
+            {"Location1": 4, "Location2": 1},
+        )
+
+    def test_metrics_lcm_vulnerability_risk_score(self):
+        """Test metric vulnerability_risk_score_gauge."""
+        device = Device.objects.get(name="sw1")
+        computed_at = timezone.now()
+        for scope, value in (("device", device), ("location", device.location), ("platform", device.platform)):
+            VulnerabilityRiskScore.objects.create(scope=scope, score=12.5, computed_at=computed_at, **{scope: value})
+
+        metric = next(metrics_lcm_vulnerability_risk_score())
+
+        # Device scores are only available from the REST API
+        self.assertEqual(
+            {tuple(sample.labels.items()): sample.value for sample in metric.samples},
+            {
+                (("scope", "location"), ("name", "Location1")): 12.5,
+                (("scope", "platform"), ("name", "cisco_ios")): 12.5,
+            },
+        )
+
+    def test_metrics_lcm_open_vulnerabilities_location(self):
+        """Test metric open_vulnerabilities_location_gauge."""
+        cve_1, cve_2, _ = create_cves()
+        cve_1.severity = "Critical"
+        cve_1.save()
+        item_1 = InventoryItem.objects.get(part_id="VS-S2T-10G")
+        device_3 = Device.objects.get(name="sw3")
+        resolved = Status.objects.get(name="Resolved")
+        resolved.content_types.add(ContentType.objects.get_for_model(VulnerabilityLCM))
+        VulnerabilityLCM.objects.create(cve=cve_1, device=item_1.device)
+        VulnerabilityLCM.objects.create(cve=cve_1, inventory_item=item_1)
+        VulnerabilityLCM.objects.create(cve=cve_2, device=item_1.device)
+        VulnerabilityLCM.objects.create(cve=cve_2, device=device_3, status=resolved)
+
+        with mock.patch.dict(
+            "nautobot_device_lifecycle_mgmt.metrics.PLUGIN_CFG", vulnerability_closed_statuses=["Resolved"]
+        ):
+            metric = next(metrics_lcm_open_vulnerabilities_location())
+
+        samples = {tuple(sample.labels.values()): sample.value for sample in metric.samples}
+        self.assertEqual(len(samples), 10)
+        self.assertEqual(samples["Location1", "Critical"], 2)
+        self.assertEqual(samples["Location1", "None"], 1)
+        self.assertEqual(samples["Location2", "None"], 0)
+
+    def test_metrics_lcm_sw_end_of_support_software(self):
+        """Test metric sw_end_of_support_software_gauge."""
+        software_1, software_2, *_ = create_softwares()
+        software_1.end_of_support = date(2020, 1, 1)
+        software_1.save()
+        software_2.end_of_support = date(2021, 1, 1)
+        software_2.save()
+        device_soft = Relationship.objects.get(key="device_soft")
+        for device in Device.objects.filter(name__in=["sw1", "sw2"]):
+            RelationshipAssociation.objects.create(relationship=device_soft, source=software_1, destination=device)
+
+        with CaptureQueriesContext(connection) as queries:
+            metric = next(metrics_lcm_sw_end_of_support_software())
+
+        self.assertLessEqual(len(queries), 3)
+        self.assertEqual(
+            {tuple(sample.labels.values()): sample.value for sample in metric.samples},
+            {("cisco_ios", "15.1(2)M"): 2, ("cisco_ios", "4.22.9M"): 0},
+        )
+
+    def test_metrics_lcm_contracts_expiring_provider(self):
+        """Test metric contracts_expiring_provider_gauge."""
+        today = date.today()
+        cisco = ProviderLCM.objects.create(name="Cisco")
+        ProviderLCM.objects.create(name="Arista")
+        for name, provider, days in (
+            ("Expiring", cisco, 10),
+            ("Expiring Later", cisco, 75),
+            ("Expired", cisco, -1),
+            ("Not Expiring", cisco, 120),
+            ("No Provider", None, 45),
+        ):
+            ContractLCM.objects.create(name=name, provider=provider, end=today + timedelta(days=days))
+
+        metric = next(metrics_lcm_contracts_expiring_provider())
+
+        self.assertEqual(
+            {tuple(sample.labels.values()): sample.value for sample in metric.samples},
+            {
+                ("Cisco", "30"): 1,
+                ("Cisco", "60"): 1,
+                ("Cisco", "90"): 2,
+                ("Arista", "30"): 0,
+                ("Arista", "60"): 0,
+                ("Arista", "90"): 0,
+                ("", "30"): 0,
+                ("", "60"): 1,
+                ("", "90"): 1,
+            },
+        )
+
+
+def metrics_lcm_test_counter():
+    """Yield a gauge holding the number of times the generator was run."""
+    metrics_lcm_test_counter.runs += 1
+    gauge = GaugeMetricFamily("nautobot_lcm_test_counter", "Number of runs")
+    gauge.add_metric(labels=[], value=metrics_lcm_test_counter.runs)
+    yield gauge
+
+
+class CachedMetricTest(TestCase):
+    """Test class for metrics served from the cache."""
+
+    def setUp(self):
+        metrics_lcm_test_counter.runs = 0
+        self.metric = CachedMetric(metrics_lcm_test_counter, ttl=60, background_refresh=False)
+        cache.delete_many([self.metric.cache_key, self.metric.lock_key, self.metric.scheduled_key])
+
+    def get_value(self, metric):
+        """Return the value of the single sample yielded by metric."""
+        return next(metric()).samples[0].value
+
+    def expire(self):
+        """Make the cached samples expired."""
+        computed_at, families = cache.get(self.metric.cache_key)
+        cache.set(self.metric.cache_key, (computed_at - 61, families))
+
+    def test_served_from_cache_within_ttl(self):
+        self.assertEqual(self.get_value(self.metric), 1)
+        self.assertEqual(self.get_value(self.metric), 1)
+        self.assertEqual(metrics_lcm_test_counter.runs, 1)
+
+    def test_refreshed_when_expired(self):
+        self.get_value(self.metric)
+        self.expire()
+
+        self.assertEqual(self.get_value(self.metric), 2)
+
+    def test_concurrent_refresh_serves_stale_samples(self):
+        self.get_value(self.metric)
+        self.expire()
+        lock = cache.lock(self.metric.lock_key, timeout=10)
+        lock.acquire()
+        try:
+            self.assertEqual(self.get_value(self.metric), 1)
+        finally:
+            lock.release()
+        self.assertEqual(metrics_lcm_test_counter.runs, 1)
+
+    @mock.patch.object(refresh_cached_metric, "apply_async")
+    def test_background_refresh(self, mock_apply_async):
+        metric = CachedMetric(metrics_lcm_test_counter, ttl=60, background_refresh=True)
+        self.assertEqual(self.get_value(metric), 1)
+        self.expire()
+
+        # Expired samples are served while a single refresh task is scheduled
+        self.assertEqual(self.get_value(metric), 1)
+        self.assertEqual(self.get_value(metric), 1)
+        mock_apply_async.assert_called_once_with(args=("metrics_lcm_test_counter",))
+
+        self.assertTrue(refresh_cached_metric("metrics_lcm_test_counter"))
+        self.assertIsNone(cache.get(metric.scheduled_key))
+        self.assertEqual(self.get_value(metric), 2)
+
+
+@mock.patch.dict(
+    "nautobot_device_lifecycle_mgmt.metrics.PLUGIN_CFG",
+    metrics_source="snapshot",
+    enabled_metrics=[
+        "nautobot_lcm_software_compliance_per_device_type",
+        "nautobot_lcm_hw_end_of_support_per_part_number",
+        "nautobot_lcm_hw_end_of_support_per_location",
+    ],
+)
+class MetricSnapshotTest(TestCase):
+    """Test class for metrics precomputed into the MetricSnapshot table."""
+
+    def setUp(self):
+        create_inventory_items()
+        create_inventory_item_hardware_notices()
+
+    @staticmethod
+    def get_samples(families):
+        """Return mapping of family name to the set of its `(labels, value)` samples."""
+        return {
+            family.name: {(tuple(sample.labels.values()), sample.value) for sample in family.samples}
+            for family in families
+        }
+
+    def test_snapshot_serves_live_samples(self):
+        live = self.get_samples(
+            [
+                *metrics_lcm_validation_report_device_type(),
+                *metrics_lcm_hw_end_of_support_part_number(),
+                *metrics_lcm_hw_end_of_support_location(),
+            ]
+        )
+
+        self.assertEqual(write_metrics_snapshot(), 8)
+        with CaptureQueriesContext(connection) as queries:
+            *families, computed_at_gauge = list(metrics_lcm_snapshot())
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(self.get_samples(families), live)
+        self.assertEqual(
+            {sample.labels["family"] for sample in computed_at_gauge.samples},
+            set(live),
+        )
+
+    def test_write_replaces_only_given_families(self):
+        write_metrics_snapshot()
+        MetricSnapshot.objects.update(value=42)
+        HardwareLCM.objects.filter(inventory_item="QSFP-100G-SR4-S").delete()
+
+        self.assertEqual(write_metrics_snapshot(["nautobot_lcm_hw_end_of_support_per_location"]), 2)
+
+        samples = self.get_samples(metrics_lcm_snapshot())
+        self.assertEqual(
+            samples["nautobot_lcm_hw_end_of_support_per_location"], {(("Location1",), 1), (("Location2",), 0)}
+        )
+        self.assertEqual({value for _, value in samples["nautobot_lcm_hw_end_of_support_per_part_number"]}, {42})
+
+    def test_write_skipped_for_live_metrics(self):
+        with mock.patch.dict("nautobot_device_lifecycle_mgmt.metrics.PLUGIN_CFG", metrics_source="live"):
+            self.assertEqual(write_metrics_snapshot(), 0)
+        self.assertEqual(write_metrics_snapshot(["nautobot_lcm_vulnerability_risk_score"]), 0)
+        self.assertFalse(MetricSnapshot.objects.exists())
@@ -0,0 +1,293 @@
+# pylint: disable=no-member
+"""nautobot_device_lifecycle_mgmt test class for the NVD JSON feed importer."""
+
+import gzip
+import io
+import json
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from nautobot.core.testing import TransactionTestCase, create_job_result_and_run_job
+from nautobot.dcim.models import Platform
+from nautobot.extras.choices import JobResultStatusChoices
+from nautobot.extras.models import FileProxy
+
+from nautobot_device_lifecycle_mgmt.jobs import ImportNVDFeed
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM
+from nautobot_device_lifecycle_mgmt.nvd import (
+    NVDFeedImporter,
+    SoftwareVersionIndex,
+    iter_feed_items,
+    open_feed,
+    parse_cpe,
+    parse_feed_item,
+)
+
+FEED_V1_ITEM = {
+    "cve": {
+        "CVE_data_meta": {"ID": "CVE-2021-1391"},
+        "description": {"description_data": [{"lang": "en", "value": "A vulnerability in Cisco IOS"}]},
+    },
+    "configurations": {
+        "nodes": [
+            {
+                "operator": "OR",
+                "cpe_match": [
+                    {"vulnerable": True, "cpe23Uri": "cpe:2.3:o:cisco:ios:15.2\\(4\\)m7:*:*:*:*:*:*:*"},
+                    {"vulnerable": False, "cpe23Uri": "cpe:2.3:o:cisco:ios:15.2\\(4\\)m8:*:*:*:*:*:*:*"},
+                    {"vulnerable": True, "cpe23Uri": "cpe:2.3:o:cisco:ios:*:*:*:*:*:*:*:*"},
+                ],
+            }
+        ]
+    },
+    "impact": {
+        "baseMetricV3": {"cvssV3": {"baseScore": 7.8, "baseSeverity": "HIGH"}},
+        "baseMetricV2": {"cvssV2": {"baseScore": 7.2}, "severity": "HIGH"},
+    },
+    "publishedDate": "2021-03-24T21:15Z",
+}
+FEED_V2_ITEM = {
+    "cve": {
+        "id": "CVE-2021-44228",
+        "published": "2021-12-10T10:15:09.143",
+        "descriptions": [{"lang": "es", "value": "Log4j"}, {"lang": "en", "value": "Apache Log4j2"}],
+        "metrics": {"cvssMetricV2": [{"cvssData": {"baseScore": 9.3}, "baseSeverity": "HIGH"}]},
+        "configurations": [
+            {
+                "nodes": [
+                    {
+                        "cpeMatch": [
+                            {"vulnerable": True, "criteria": "cpe:2.3:o:arista:eos:4.22.9m:*:*:*:*:*:*:*"},
+                            {
+                                "vulnerable": True,
+                                "criteria": "cpe:2.3:o:cisco:ios:*:*:*:*:*:*:*:*",
+                                "versionStartIncluding": "15.2(4)M8",
+                                "versionEndExcluding": "15.2(5)M1",
+                            },
+                        ]
+                    }
+                ]
+            }
+        ],
+    }
+}
+
+
+def make_feed(items, items_key="CVE_Items"):
+    """Return an NVD feed holding items as a JSON string."""
+    return json.dumps({"CVE_data_type": "CVE", "CVE_data_numberOfCVEs": str(len(items)), items_key: items}, indent=1)
+
+
+class NVDFeedParserTestCase(TestCase):
+    """Tests for the NVD feed streaming parser."""
+
+    def test_iter_feed_items_across_reads(self):
+        items = [FEED_V1_ITEM, {**FEED_V1_ITEM, "publishedDate": "2022-01-01T00:00Z"}]
+        for read_size in (1, 7, 64 * 1024):
+            self.assertEqual(list(iter_feed_items(io.StringIO(make_feed(items)), read_size=read_size)), items)
+
+    def test_iter_feed_items_v2(self):
+        feed = make_feed([FEED_V2_ITEM], items_key="vulnerabilities")
+
+        self.assertEqual(list(iter_feed_items(io.StringIO(feed), read_size=5)), [FEED_V2_ITEM])
+
+    def test_iter_feed_items_empty(self):
+        self.assertEqual(list(iter_feed_items(io.StringIO(make_feed([])))), [])
+
+    def test_iter_feed_items_invalid(self):
+        with self.assertRaises(ValueError):
+            list(iter_feed_items(io.StringIO('{"foo": []}')))
+        with self.assertRaises(ValueError):
+            list(iter_feed_items(io.StringIO(make_feed([FEED_V1_ITEM])[:-200])))
+
+    def test_open_feed_gzip(self):
+        feed = make_feed([FEED_V1_ITEM])
+        for content in (feed.encode(), gzip.compress(feed.encode())):
+            with open_feed(io.BytesIO(content)) as stream:
+                self.assertEqual(list(iter_feed_items(stream)), [FEED_V1_ITEM])
+
+    def test_parse_cpe(self):
+        self.assertEqual(
+            parse_cpe("cpe:2.3:o:cisco:ios:15.2\\(4\\)M7:*:*:*:*:*:*:*"),
+            ("cisco:ios", "15.2(4)m7"),
+        )
+        self.assertEqual(parse_cpe("cpe:2.3:o:cisco:ios:*:*:*:*:*:*:*:*"), ("cisco:ios", None))
+        self.assertEqual(parse_cpe("cpe:2.3:o:cisco:ios:-:*:*:*:*:*:*:*"), ("cisco:ios", None))
+        self.assertIsNone(parse_cpe("cisco:ios"))
+
+    def test_parse_feed_item_v1(self):
+        self.assertEqual(
+            parse_feed_item(FEED_V1_ITEM),
+            {
+                "name": "CVE-2021-1391",
+                "published_date": date(2021, 3, 24),
+                "link": "https://nvd.nist.gov/vuln/detail/CVE-2021-1391",
+                "description": "A vulnerability in Cisco IOS",
+                "severity": "High",
+                "cvss": 7.8,
+                "cvss_v2": 7.2,
+                "cvss_v3": 7.8,
+                "cpes": {("cisco:ios", "15.2(4)m7")},
+                "cpe_ranges": set(),
+            },
+        )
+
+    def test_parse_feed_item_v2(self):
+        record = parse_feed_item(FEED_V2_ITEM)
+
+        self.assertEqual(record["name"], "CVE-2021-44228")
+        self.assertEqual(record["published_date"], date(2021, 12, 10))
+        self.assertEqual(record["description"], "Apache Log4j2")
+        self.assertEqual(record["severity"], "High")
+        self.assertEqual((record["cvss"], record["cvss_v2"], record["cvss_v3"]), (9.3, 9.3, None))
+        self.assertEqual(record["cpes"], {("arista:eos", "4.22.9m")})
+        self.assertEqual(record["cpe_ranges"], {("cisco:ios", "15.2(4)M8", True, "15.2(5)M1", False)})
+
+
+@mock.patch("nautobot_device_lifecycle_mgmt.nvd.queue_vulnerability_generation")
+class NVDFeedImporterTestCase(TestCase):
+    """Tests for NVDFeedImporter."""
+
+    def setUp(self):
+        platform_ios, _ = Platform.objects.get_or_create(name="cisco_ios")
+        platform_eos, _ = Platform.objects.get_or_create(name="Arista EOS", defaults={"network_driver": "arista_eos"})
+        self.software_ios = SoftwareLCM.objects.create(device_platform=platform_ios, version="15.2(4)M7")
+        self.software_eos = SoftwareLCM.objects.create(device_platform=platform_eos, version="4.22.9M")
+        SoftwareLCM.objects.create(device_platform=platform_eos, version="15.2(4)M7")
+
+    def test_software_version_index(self, _):
+        index = SoftwareVersionIndex()
+
+        self.assertEqual(index.get_software_ids({("cisco:ios", "15.2(4)m7")}), {self.software_ios.pk})
+        self.assertEqual(
+            index.get_software_ids({("cisco:ios", "15.2(4)m7"), ("arista:eos", "4.22.9m")}),
+            {self.software_ios.pk, self.software_eos.pk},
+        )
+        self.assertEqual(index.get_software_ids({("cisco:ios_xe", "15.2(4)m7")}), set())
+        self.assertEqual(
+            SoftwareVersionIndex(cpe_platforms={"cisco:ios_xe": "cisco_ios"}).get_software_ids(
+                {("cisco:ios_xe", "15.2(4)m7")}
+            ),
+            {self.software_ios.pk},
+        )
+
+    def test_software_version_index_ranges(self, _):
+        software_m10 = SoftwareLCM.objects.create(
+            device_platform=self.software_ios.device_platform, version="15.2(4)M10"
+        )
+        SoftwareLCM.objects.create(device_platform=self.software_ios.device_platform, version="15.2(5)M1")
+        index = SoftwareVersionIndex()
+
+        self.assertEqual(
+            index.get_software_ids(set(), {("cisco:ios", "15.2(4)M8", True, "15.2(5)M1", False)}),
+            {software_m10.pk},
+        )
+        self.assertEqual(
+            index.get_software_ids(set(), {("cisco:ios", None, True, "15.2(4)M10", True)}),
+            {self.software_ios.pk, software_m10.pk},
+        )
+        self.assertEqual(
+            index.get_software_ids(set(), {("cisco:ios", "15.2(4)M7", False, None, True)}),
+            {
+                software_m10.pk,
+                *SoftwareLCM.objects.filter(version="15.2(5)M1").values_list("pk", flat=True),
+            },
+        )
+
+    def test_import_creates_and_links_cves(self, mock_queue):
+        counts = NVDFeedImporter().run([FEED_V1_ITEM, FEED_V2_ITEM])
+
+        self.assertEqual(counts, {"processed": 2, "created": 2, "updated": 0, "unchanged": 0, "linked": 2})
+        cve = CVELCM.objects.get(name="CVE-2021-1391")
+        self.assertEqual((cve.severity, cve.cvss, cve.cvss_v2, cve.cvss_v3), ("High", 7.8, 7.2, 7.8))
+        self.assertEqual(list(cve.affected_softwares.all()), [self.software_ios])
+        self.assertEqual(
+            list(CVELCM.objects.get(name="CVE-2021-44228").affected_softwares.all()),
+            [self.software_eos],
+        )
+        mock_queue.assert_called()
+
+    def test_import_updates_existing_cves(self, _):
+        existing = CVELCM.objects.create(name="CVE-2021-1391", published_date="2021-03-24", description="Curated")
+        existing.affected_softwares.add(self.software_eos)
+        importer = NVDFeedImporter()
+        importer.batch_size = 1
+
+        counts = importer.run([FEED_V1_ITEM, FEED_V2_ITEM])
+
+        self.assertEqual(counts, {"processed": 2, "created": 1, "updated": 1, "unchanged": 0, "linked": 2})
+        existing.refresh_from_db()
+        self.assertEqual((existing.severity, existing.cvss_v3), ("High", 7.8))
+        # Blank link is filled, curated description is kept
+        self.assertEqual(existing.link, "https://nvd.nist.gov/vuln/detail/CVE-2021-1391")
+        self.assertEqual(existing.description, "Curated")
+        self.assertEqual(set(existing.affected_softwares.all()), {self.software_ios, self.software_eos})
+
+        counts = NVDFeedImporter().run([FEED_V1_ITEM, FEED_V2_ITEM])
+        self.assertEqual(counts, {"processed": 2, "created": 0, "updated": 0, "unchanged": 2, "linked": 0})
+
+    def test_import_reports_progress(self, _):
+        progress = mock.Mock()
+        importer = NVDFeedImporter()
+        importer.batch_size = 1
+
+        importer.run([FEED_V1_ITEM, FEED_V2_ITEM], progress=progress)
+
+        self.assertEqual(progress.call_count, 2)
+        self.assertEqual(progress.call_args[0][0]["processed"], 2)
+
+
+@mock.patch("nautobot_device_lifecycle_mgmt.nvd.queue_vulnerability_generation")
+class ImportNVDFeedJobTestCase(TransactionTestCase):
+    """Tests for the ImportNVDFeed job."""
+
+    def setUp(self):
+        super().setUp()
+        platform_ios, _ = Platform.objects.get_or_create(name="cisco_ios")
+        self.software_ios = SoftwareLCM.objects.create(device_platform=platform_ios, version="15.2(4)M7")
+        self.existing = CVELCM.objects.create(name="CVE-2021-44228", published_date="2021-12-01")
+
+    def run_job(self, **kwargs):
+        """Run the job with serialized kwargs, as submitted from the job form."""
+        return create_job_result_and_run_job(
+            "nautobot_device_lifecycle_mgmt.jobs.cve_tracking", "ImportNVDFeed", **ImportNVDFeed.serialize_data(kwargs)
+        )
+
+    def test_import_uploaded_feed(self, _):
+        feed = gzip.compress(make_feed([FEED_V1_ITEM, FEED_V2_ITEM]).encode())
+
+        job_result = self.run_job(feed_file=SimpleUploadedFile("nvdcve.json.gz", feed))
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertTrue(
+            job_result.job_log_entries.filter(
+                message="Imported 2 CVEs: 1 created, 1 updated, 0 unchanged, 1 software links added."
+            ).exists()
+        )
+        self.assertEqual(list(CVELCM.objects.get(name="CVE-2021-1391").affected_softwares.all()), [self.software_ios])
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.published_date, date(2021, 12, 10))
+        # Uploaded files are deleted once the job completes
+        self.assertFalse(FileProxy.objects.exists())
+
+    def test_import_feed_path(self, _):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json") as feed:
+            feed.write(make_feed([FEED_V1_ITEM], items_key="vulnerabilities"))
+            feed.flush()
+
+            job_result = self.run_job(feed_path=feed.name)
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_SUCCESS)
+        self.assertTrue(CVELCM.objects.filter(name="CVE-2021-1391").exists())
+
+    def test_no_feed_fails(self, _):
+        job_result = self.run_job()
+
+        self.assertEqual(job_result.status, JobResultStatusChoices.STATUS_FAILURE)
+        self.assertTrue(
+            job_result.job_log_entries.filter(message="Upload a feed file or enter the path of a feed file.").exists()
+        )
+        self.assertEqual(CVELCM.objects.count(), 1)
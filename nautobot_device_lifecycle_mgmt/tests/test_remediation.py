@@ -0,0 +1,129 @@
+# pylint: disable=no-member
+"""nautobot_device_lifecycle_mgmt test class for the remediation planner."""
+
+import csv
+import io
+from datetime import date, timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from nautobot.dcim.models import Device
+from nautobot.extras.models import Status
+
+from nautobot_device_lifecycle_mgmt.models import SoftwareLCM, ValidatedSoftwareLCM, VulnerabilityLCM
+from nautobot_device_lifecycle_mgmt.remediation import PLAN_FIELDS, RemediationPlanner, export_csv
+
+from .conftest import create_cves, create_devices
+
+
+class RemediationPlannerTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Tests for RemediationPlanner."""
+
+    def setUp(self):
+        self.device_1, self.device_2, self.device_3 = create_devices()
+        platform = self.device_1.platform
+        self.software_current = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        self.software_fixed = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M10")
+        self.software_clean = SoftwareLCM.objects.create(device_platform=platform, version="15.9(3)M4")
+        self.cve_1, self.cve_2, _ = create_cves()
+        self.cve_1.severity = "Critical"
+        self.cve_1.save()
+        self.cve_2.severity = "High"
+        self.cve_2.save()
+        self.cve_1.affected_softwares.set([self.software_current])
+        self.cve_2.affected_softwares.set([self.software_current, self.software_fixed])
+        for device in (self.device_1, self.device_2):
+            for cve in (self.cve_1, self.cve_2):
+                VulnerabilityLCM.objects.create(cve=cve, software=self.software_current, device=device)
+
+        start = date.today() - timedelta(days=10)
+        # Preferred for the device type, ranked before the device assignment
+        device_type_rule = ValidatedSoftwareLCM(software=self.software_fixed, start=start, preferred=True)
+        device_type_rule.save()
+        device_type_rule.device_types.set([self.device_1.device_type])
+        device_rule = ValidatedSoftwareLCM(software=self.software_clean, start=start)
+        device_rule.save()
+        device_rule.devices.set([self.device_1])
+        expired_rule = ValidatedSoftwareLCM(
+            software=self.software_clean, start=start, end=date.today() - timedelta(days=1)
+        )
+        expired_rule.save()
+        expired_rule.devices.set([self.device_2])
+
+    def test_plan_picks_least_exposed_candidate(self):
+        plan = {row["device"]: row for row in RemediationPlanner().plan()}
+
+        self.assertEqual(set(plan), {"sw1", "sw2"})
+        self.assertEqual(
+            plan["sw1"],
+            {
+                "location": "Location1",
+                "platform": "cisco_ios",
+                "device": "sw1",
+                "current_software": "",
+                "open_cves": 2,
+                "recommended_software": "15.9(3)M4",
+                "cleared_cves": 2,
+                "remaining_cves": 0,
+                "introduced_cves": 0,
+                "clears_all": True,
+            },
+        )
+        self.assertEqual(plan["sw2"]["recommended_software"], "15.2(4)M10")
+        self.assertEqual((plan["sw2"]["cleared_cves"], plan["sw2"]["remaining_cves"]), (1, 1))
+        self.assertFalse(plan["sw2"]["clears_all"])
+
+    def test_plan_ties_follow_validated_software_precedence(self):
+        self.cve_2.affected_softwares.add(self.software_clean)
+
+        plan = {row["device"]: row for row in RemediationPlanner().plan()}
+
+        self.assertEqual(plan["sw1"]["recommended_software"], "15.2(4)M10")
+
+    def test_plan_without_candidates(self):
+        VulnerabilityLCM.objects.create(cve=self.cve_1, software=self.software_current, device=self.device_3)
+        ValidatedSoftwareLCM.objects.all().delete()
+
+        plan = RemediationPlanner(devices=Device.objects.filter(pk=self.device_3.pk)).plan()
+
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(
+            (plan[0]["device"], plan[0]["recommended_software"], plan[0]["remaining_cves"]), ("sw3", "", 1)
+        )
+
+    def test_plan_skips_closed_vulnerabilities(self):
+        status, _ = Status.objects.get_or_create(name="Resolved")
+        status.content_types.add(ContentType.objects.get_for_model(VulnerabilityLCM))
+        VulnerabilityLCM.objects.filter(device=self.device_2).update(status=status)
+
+        plan = RemediationPlanner(closed_statuses=["Resolved"]).plan()
+
+        self.assertEqual([row["device"] for row in plan], ["sw1"])
+
+    def test_summarize_groups_by_location_and_platform(self):
+        planner = RemediationPlanner()
+        summary = planner.summarize(planner.plan())
+
+        self.assertEqual(
+            summary,
+            [
+                {
+                    "location": "Location1",
+                    "platform": "cisco_ios",
+                    "devices": 2,
+                    "upgrades": 2,
+                    "cleared_all": 1,
+                    "no_candidate": 0,
+                    "open_cves": 4,
+                    "cleared_cves": 3,
+                }
+            ],
+        )
+
+    def test_export_csv(self):
+        plan = RemediationPlanner().plan()
+
+        rows = list(csv.DictReader(io.StringIO(export_csv(plan, PLAN_FIELDS))))
+
+        self.assertEqual([row["device"] for row in rows], ["sw1", "sw2"])
+        self.assertEqual(rows[0]["clears_all"], "True")
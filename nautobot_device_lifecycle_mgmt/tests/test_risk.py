@@ -0,0 +1,95 @@
+# pylint: disable=no-member
+"""nautobot_device_lifecycle_mgmt test class for the vulnerability risk scoring."""
+
+from datetime import date
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+from nautobot.extras.models import Status
+
+from nautobot_device_lifecycle_mgmt.models import VulnerabilityLCM, VulnerabilityRiskScore
+from nautobot_device_lifecycle_mgmt.risk import RiskScoringEngine
+
+from .conftest import create_cves, create_inventory_items
+
+
+class RiskScoringEngineTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Tests for RiskScoringEngine."""
+
+    def setUp(self):
+        self.item_1, item_2, self.item_3 = create_inventory_items()
+        self.device_1, self.device_2, self.device_3 = (self.item_1.device, item_2.device, self.item_3.device)
+        self.cve_1, self.cve_2, self.cve_3 = create_cves()
+        self.cve_1.severity, self.cve_1.cvss_v3 = "Critical", 8.0
+        self.cve_1.save()
+        self.cve_2.severity, self.cve_2.cvss = "High", 6.0
+        self.cve_2.save()
+        status, _ = Status.objects.get_or_create(name="Resolved")
+        status.content_types.add(ContentType.objects.get_for_model(VulnerabilityLCM))
+
+        VulnerabilityLCM.objects.create(cve=self.cve_1, device=self.device_1)
+        # Counted once with the vulnerability of the Device
+        VulnerabilityLCM.objects.create(cve=self.cve_1, inventory_item=self.item_1)
+        VulnerabilityLCM.objects.create(cve=self.cve_2, device=self.device_1)
+        VulnerabilityLCM.objects.create(cve=self.cve_3, device=self.device_2)
+        VulnerabilityLCM.objects.create(cve=self.cve_2, device=self.device_3, status=status)
+        VulnerabilityLCM.objects.create(cve=self.cve_1, inventory_item=self.item_3)
+
+    def get_scores(self, engine):
+        """Return computed scores keyed by scope and object pk."""
+        return {scope: {row[0]: tuple(row[1:]) for row in rows} for scope, rows in engine.compute().items()}
+
+    def test_compute(self):
+        scores = self.get_scores(RiskScoringEngine(weights={"age_per_year": 0}, closed_statuses=["Resolved"]))
+
+        # CVE-2021-1391 scores 8.0, CVE-2021-44228 6.0 * 0.75 and CVE-2020-27134 the default 5.0 * 0.1
+        self.assertEqual(
+            scores["device"],
+            {
+                self.device_1.pk: (12.5, 12.5, 1, 2),
+                self.device_2.pk: (0.5, 0.5, 1, 1),
+                self.device_3.pk: (8.0, 8.0, 1, 1),
+            },
+        )
+        self.assertEqual(
+            scores["location"],
+            {self.device_1.location_id: (13.0, 12.5, 2, 3), self.device_3.location_id: (8.0, 8.0, 1, 1)},
+        )
+        self.assertEqual(scores["platform"], {self.device_1.platform_id: (21.0, 12.5, 3, 4)})
+
+    def test_compute_weights(self):
+        engine = RiskScoringEngine(
+            weights={"severity": {"High": 1.0}, "default_cvss": 0, "age_per_year": 0}, closed_statuses=[]
+        )
+
+        scores = self.get_scores(engine)
+
+        self.assertEqual(scores["device"][self.device_1.pk], (14.0, 14.0, 1, 2))
+        self.assertEqual(scores["device"][self.device_2.pk], (0.0, 0.0, 1, 1))
+        self.assertEqual(scores["device"][self.device_3.pk], (14.0, 14.0, 1, 2))
+
+    def test_compute_age(self):
+        engine = RiskScoringEngine(closed_statuses=["Resolved"], today=date(2023, 3, 24))
+        self.assertAlmostEqual(self.get_scores(engine)["device"][self.device_3.pk][0], 8.0 * (1 + 0.1 * 730 / 365.25))
+
+        # Age is capped at max_age_years
+        engine = RiskScoringEngine(closed_statuses=["Resolved"], today=date(2041, 1, 1))
+        self.assertAlmostEqual(self.get_scores(engine)["device"][self.device_3.pk][0], 12.0)
+
+    def test_compute_without_vulnerabilities(self):
+        VulnerabilityLCM.objects.all().delete()
+
+        self.assertEqual(RiskScoringEngine().compute(), {"device": [], "location": [], "platform": []})
+
+    def test_run_replaces_scores(self):
+        engine = RiskScoringEngine(weights={"age_per_year": 0}, closed_statuses=["Resolved"])
+        engine.run()
+        VulnerabilityLCM.objects.filter(device=self.device_2).delete()
+
+        counts = engine.run()
+
+        self.assertEqual(counts, {"device": 2, "location": 2, "platform": 1})
+        self.assertEqual(VulnerabilityRiskScore.objects.count(), 5)
+        score = VulnerabilityRiskScore.objects.get(scope="location", location=self.device_1.location)
+        self.assertEqual((score.score, score.max_device_score, score.device_count), (12.5, 12.5, 1))
+        self.assertFalse(VulnerabilityRiskScore.objects.filter(device=self.device_2).exists())
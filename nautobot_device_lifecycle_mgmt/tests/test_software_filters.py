@@ -1,13 +1,21 @@
 # pylint: disable=no-member
 """nautobot_device_lifecycle_mgmt test class for software queryset filters."""
 
+from datetime import date
+
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 from nautobot.dcim.models import Device, DeviceType, InventoryItem, Location, LocationType, Manufacturer, Platform
 from nautobot.extras.models import Relationship, RelationshipAssociation, Role, Status, Tag
 
-from nautobot_device_lifecycle_mgmt.models import SoftwareImageLCM, SoftwareLCM
-from nautobot_device_lifecycle_mgmt.software_filters import DeviceSoftwareImageFilter, InventoryItemSoftwareImageFilter
+from nautobot_device_lifecycle_mgmt.models import SoftwareImageLCM, SoftwareLCM, ValidatedSoftwareLCM
+from nautobot_device_lifecycle_mgmt.software_filters import (
+    DeviceSoftwareImageFilter,
+    InventoryItemSoftwareImageFilter,
+    InventoryItemValidatedSoftwareFilter,
+    ValidatedSoftwareRuleIndex,
+    ValidityWindowIndex,
+)
 
 
 class DeviceSoftwareImageFilterTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
@@ -302,3 +310,146 @@ class InventoryItemSoftwareImageFilterTestCase(TestCase):  # pylint: disable=too
 
         self.assertEqual(soft_image_filterd_qs.count(), 1)
         self.assertEqual(soft_image_filterd_qs[0], self.soft_image_ot_win)
+
+
+class ValidatedSoftwareRuleIndexTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Tests for ValidatedSoftwareRuleIndex."""
+
+    def setUp(self):
+        manufacturer_arista, _ = Manufacturer.objects.get_or_create(name="Arista")
+        device_platform_arista, _ = Platform.objects.get_or_create(name="arista_eos", manufacturer=manufacturer_arista)
+        softwares = [
+            SoftwareLCM.objects.create(device_platform=device_platform_arista, version=version)
+            for version in ("4.25M", "4.26M", "4.27M", "4.28M", "4.29M")
+        ]
+
+        self.devicetype_1, _ = DeviceType.objects.get_or_create(manufacturer=manufacturer_arista, model="7124")
+        self.devicetype_2, _ = DeviceType.objects.get_or_create(manufacturer=manufacturer_arista, model="7150S")
+        self.role_switch, _ = Role.objects.get_or_create(name="switch", color="ff0000")
+        self.role_router, _ = Role.objects.get_or_create(name="router", color="00ff00")
+        for role in (self.role_switch, self.role_router):
+            role.content_types.add(ContentType.objects.get_for_model(Device))
+        device_status = Status.objects.get_for_model(Device).first()
+        location_type_location_a, _ = LocationType.objects.get_or_create(name="LocationA")
+        location_type_location_a.content_types.add(ContentType.objects.get_for_model(Device))
+        location1, _ = Location.objects.get_or_create(
+            name="Location1",
+            location_type=location_type_location_a,
+            status=Status.objects.get_for_model(Location).first(),
+        )
+        self.tag, _ = Tag.objects.get_or_create(name="lcm")
+
+        self.device_1 = Device.objects.create(
+            name="Device1",
+            device_type=self.devicetype_1,
+            role=self.role_switch,
+            location=location1,
+            status=device_status,
+        )
+        self.device_1.tags.add(self.tag)
+        self.device_2 = Device.objects.create(
+            name="Device2",
+            device_type=self.devicetype_2,
+            role=self.role_router,
+            location=location1,
+            status=device_status,
+        )
+        self.inventoryitem_1 = InventoryItem.objects.create(device=self.device_1, name="SwitchModule1")
+        self.inventoryitem_1.tags.add(self.tag)
+
+        assignments = (
+            ({"devices": [self.device_1]}, False),
+            ({"device_types": [self.devicetype_1], "device_roles": [self.role_switch]}, True),
+            ({"device_types": [self.devicetype_1]}, False),
+            ({"device_roles": [self.role_router]}, True),
+            ({"object_tags": [self.tag], "inventory_items": [self.inventoryitem_1]}, False),
+        )
+        for software, (m2m_assignments, preferred) in zip(softwares, assignments):
+            validated_software = ValidatedSoftwareLCM(software=software, start=date(2020, 1, 1), preferred=preferred)
+            validated_software.save()
+            for field, values in m2m_assignments.items():
+                getattr(validated_software, field).set(values)
+
+    def test_resolve_device_matches_queryset_filter(self):
+        rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        with self.assertNumQueries(0):
+            resolved = {
+                device.pk: rule_index.resolve_device(device.pk, device.device_type_id, device.role_id, tag_ids)
+                for device, tag_ids in ((self.device_1, [self.tag.pk]), (self.device_2, []))
+            }
+
+        for device in (self.device_1, self.device_2):
+            expected = list(dict.fromkeys(ValidatedSoftwareLCM.objects.get_for_object(device)))
+            self.assertEqual(resolved[device.pk], expected)
+        self.assertEqual(len(resolved[self.device_1.pk]), 4)
+        self.assertEqual(resolved[self.device_1.pk][0].software.version, "4.26M")
+
+    def test_resolve_inventory_item(self):
+        rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        resolved = rule_index.resolve_inventory_item(self.inventoryitem_1.pk, [self.tag.pk])
+
+        self.assertEqual(set(resolved), set(ValidatedSoftwareLCM.objects.get_for_object(self.inventoryitem_1)))
+
+    def test_resolve_many(self):
+        rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        with self.assertNumQueries(2):
+            resolved_devices = rule_index.resolve_many([self.device_1, self.device_2])
+            resolved_items = rule_index.resolve_many([self.inventoryitem_1])
+
+        for device in (self.device_1, self.device_2):
+            self.assertEqual(
+                resolved_devices[device.pk], list(dict.fromkeys(ValidatedSoftwareLCM.objects.get_for_object(device)))
+            )
+        self.assertEqual(
+            set(resolved_items[self.inventoryitem_1.pk]),
+            set(ValidatedSoftwareLCM.objects.get_for_object(self.inventoryitem_1)),
+        )
+        self.assertEqual(rule_index.resolve_many([]), {})
+
+    def test_inventory_item_weight_matches_queryset_filter(self):
+        validated_software = ValidatedSoftwareLCM.objects.get(inventory_items=self.inventoryitem_1)
+        validated_software.preferred = True
+        validated_software.save()
+        rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        weights = InventoryItemValidatedSoftwareFilter(  # pylint: disable=protected-access
+            ValidatedSoftwareLCM.objects.all(), self.inventoryitem_1
+        )._add_weights()
+
+        # Directly assigned inventory items weigh the same as tagged ones, as in the queryset filter
+        for validated_software in weights:
+            self.assertEqual(
+                rule_index.inventory_item_weight(validated_software.pk),
+                validated_software.weight,
+            )
+
+
+class ValidityWindowIndexTestCase(TestCase):
+    """Tests for ValidityWindowIndex."""
+
+    def setUp(self):
+        platform, _ = Platform.objects.get_or_create(name="cisco_ios")
+        software = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        self.rule_1 = ValidatedSoftwareLCM.objects.create(
+            software=software, start=date(2024, 1, 1), end=date(2024, 6, 30)
+        )
+        self.rule_2 = ValidatedSoftwareLCM.objects.create(
+            software=software, start=date(2024, 6, 1), end=date(2024, 9, 30)
+        )
+        self.rule_3 = ValidatedSoftwareLCM.objects.create(software=software, start=date(2025, 1, 1))
+        self.dates = [date(2023, 12, 31), date(2024, 1, 1), date(2024, 7, 1), date(2024, 12, 1), date(2025, 1, 1)]
+
+    def test_valid_on_dates_matches_per_date_validity(self):
+        rules = [self.rule_1, self.rule_2, self.rule_3]
+        window_index = ValidityWindowIndex(rules, reversed(self.dates))
+
+        self.assertEqual(window_index.dates, self.dates)
+        for rule in rules:
+            self.assertEqual(window_index.valid_on_dates([rule.pk]), [rule.valid_on(on_date) for on_date in self.dates])
+        self.assertEqual(window_index.valid_on_dates([rule.pk for rule in rules]), [False, True, True, False, True])
+
+    def test_valid_ranges_are_merged(self):
+        window_index = ValidityWindowIndex([self.rule_1, self.rule_2, self.rule_3], self.dates)
+
+        self.assertEqual(window_index.valid_ranges([self.rule_1.pk, self.rule_2.pk]), [(1, 3)])
+        self.assertEqual(window_index.valid_ranges([self.rule_1.pk, self.rule_3.pk]), [(1, 2), (4, 5)])
+        self.assertEqual(window_index.valid_ranges([]), [])
@@ -0,0 +1,564 @@
+# pylint: disable=no-member
+"""nautobot_device_lifecycle_mgmt test class for the bulk software validation engine."""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from nautobot.dcim.models import Device, InventoryItem, Platform
+from nautobot.extras.models import JobResult, Relationship, RelationshipAssociation, Role, Tag
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.instrumentation import JOB_INSTRUMENTATION_CACHE_KEY, JOB_INSTRUMENTATION_METRIC
+from nautobot_device_lifecycle_mgmt.models import (
+    DeviceSoftwareValidationResult,
+    InventoryItemSoftwareValidationResult,
+    SoftwareLCM,
+    ValidatedSoftwareLCM,
+    ValidationCheckpoint,
+    ValidationComplianceSnapshot,
+)
+from nautobot_device_lifecycle_mgmt.software import DeviceSoftware, InventoryItemSoftware
+from nautobot_device_lifecycle_mgmt.tasks import (
+    _validation_cache_keys,
+    aggregate_software_validation,
+    dispatch_parallel_validation,
+    generate_pending_vulnerabilities,
+    get_validation_shards,
+    validate_pending_software,
+    validate_software_shard,
+)
+from nautobot_device_lifecycle_mgmt.validation import (
+    DeviceSoftwareValidationEngine,
+    InventoryItemSoftwareValidationEngine,
+)
+
+from .conftest import create_devices, create_inventory_items
+
+
+class DeviceSoftwareValidationEngineTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Tests for DeviceSoftwareValidationEngine."""
+
+    def setUp(self):
+        self.device_1, self.device_2, self.device_3 = create_devices()
+        self.device_4 = Device.objects.create(
+            name="sw4",
+            platform=self.device_1.platform,
+            device_type=self.device_1.device_type,
+            role=self.device_1.role,
+            location=self.device_1.location,
+            status=self.device_1.status,
+        )
+        platform = Platform.objects.get(name="cisco_ios")
+        self.software_1 = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        self.software_2 = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M8")
+        self.tag, _ = Tag.objects.get_or_create(name="lcm-validation")
+        self.tag.content_types.add(ContentType.objects.get_for_model(Device))
+        self.device_3.tags.add(self.tag)
+
+        device_soft_rel = Relationship.objects.get(key="device_soft")
+        for device, software in (
+            (self.device_1, self.software_1),
+            (self.device_2, self.software_2),
+            (self.device_3, self.software_1),
+        ):
+            RelationshipAssociation.objects.create(source=software, destination=device, relationship=device_soft_rel)
+
+        today = date.today()
+        device_type_rule = ValidatedSoftwareLCM(software=self.software_1, start=today - timedelta(days=10))
+        device_type_rule.save()
+        device_type_rule.device_types.set([self.device_1.device_type])
+        device_type_rule.device_roles.set([self.device_1.role])
+
+        expired_rule = ValidatedSoftwareLCM(
+            software=self.software_2, start=today - timedelta(days=10), end=today - timedelta(days=1)
+        )
+        expired_rule.save()
+        expired_rule.devices.set([self.device_2])
+
+        role_rule = ValidatedSoftwareLCM(software=self.software_2, start=today - timedelta(days=5))
+        role_rule.save()
+        role_rule.device_roles.set([Role.objects.get(name="router")])
+
+        tag_rule = ValidatedSoftwareLCM(software=self.software_1, start=today + timedelta(days=5))
+        tag_rule.save()
+        tag_rule.object_tags.set([self.tag])
+
+    def assertMatchesPerDevicePath(self):  # pylint: disable=invalid-name
+        """Compare stored results with the per-device computation."""
+        for device in Device.objects.all():
+            device_software = DeviceSoftware(device)
+            result = DeviceSoftwareValidationResult.objects.get(device=device)
+            self.assertEqual(result.is_validated, device_software.validate_software(), device.name)
+            self.assertEqual(result.software, device_software.software, device.name)
+            self.assertEqual(
+                set(result.valid_software.values_list("id", flat=True)),
+                set(ValidatedSoftwareLCM.objects.get_for_object(device).values_list("id", flat=True)),
+                device.name,
+            )
+            self.assertEqual(
+                set(device_software.validated_software),
+                set(ValidatedSoftwareLCM.objects.get_for_object(device)),
+                device.name,
+            )
+
+    def test_results_match_per_device_path(self):
+        counts = DeviceSoftwareValidationEngine().run()
+
+        self.assertEqual(counts["processed"], 4)
+        self.assertEqual(counts["new"], 4)
+        self.assertEqual(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated, True)
+        self.assertEqual(DeviceSoftwareValidationResult.objects.get(device=self.device_2).is_validated, False)
+        self.assertEqual(DeviceSoftwareValidationResult.objects.get(device=self.device_4).software, None)
+        self.assertMatchesPerDevicePath()
+
+    def test_rerun_updates_existing_results(self):
+        DeviceSoftwareValidationEngine().run()
+        ValidatedSoftwareLCM.objects.filter(software=self.software_1).update(start=date.today() + timedelta(days=1))
+
+        counts = DeviceSoftwareValidationEngine().run()
+
+        self.assertEqual(counts["new"], 0)
+        # Only device_1 was validated by a rule for software_1
+        self.assertEqual(counts["changed"], 1)
+        self.assertEqual(counts["unchanged"], 3)
+        self.assertEqual(DeviceSoftwareValidationResult.objects.count(), 4)
+        self.assertEqual(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated, False)
+        self.assertMatchesPerDevicePath()
+
+    def test_rerun_skips_unchanged_results(self):
+        DeviceSoftwareValidationEngine().run()
+        last_updated = dict(DeviceSoftwareValidationResult.objects.values_list("device_id", "last_updated"))
+        RelationshipAssociation.objects.filter(destination_id=self.device_2.pk).delete()
+        job_run_time = datetime.now() + timedelta(minutes=1)
+
+        counts = DeviceSoftwareValidationEngine(job_run_time=job_run_time).run()
+
+        self.assertEqual(counts, {"processed": 4, "new": 0, "changed": 1, "unchanged": 3, "software_removed": 1})
+        for result in DeviceSoftwareValidationResult.objects.exclude(device=self.device_2):
+            self.assertEqual(result.last_updated, last_updated[result.device_id])
+        self.assertEqual(
+            DeviceSoftwareValidationResult.objects.filter(last_run=timezone.make_aware(job_run_time)).count(), 4
+        )
+        self.assertMatchesPerDevicePath()
+
+    def test_create_compliance_snapshot(self):
+        engine = DeviceSoftwareValidationEngine()
+        engine.run()
+        ValidationComplianceSnapshot.objects.create(
+            snapshot_time=timezone.now() - timedelta(days=91),
+            object_type=choices.ComplianceSnapshotObjectTypeChoices.DEVICE,
+            run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+            group_by=choices.ComplianceSnapshotGroupChoices.TOTAL,
+        )
+
+        snapshots = engine.create_compliance_snapshot()
+
+        self.assertEqual(ValidationComplianceSnapshot.objects.count(), len(snapshots))
+        total = ValidationComplianceSnapshot.objects.get(group_by=choices.ComplianceSnapshotGroupChoices.TOTAL)
+        self.assertEqual((total.total, total.valid, total.invalid, total.no_software), (4, 1, 2, 1))
+        device_type = ValidationComplianceSnapshot.objects.get(
+            group_by=choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE, group_id=self.device_1.device_type.pk
+        )
+        self.assertEqual(device_type.group_name, self.device_1.device_type.model)
+        self.assertEqual(
+            device_type.total,
+            DeviceSoftwareValidationResult.objects.filter(device__device_type=device_type.group_id).count(),
+        )
+        for group_by in choices.ComplianceSnapshotGroupChoices.values():
+            self.assertEqual(
+                sum(ValidationComplianceSnapshot.objects.filter(group_by=group_by).values_list("total", flat=True)), 4
+            )
+
+    def test_valid_on_evaluates_validity_on_date(self):
+        outcomes = DeviceSoftwareValidationEngine(valid_on=date.today() + timedelta(days=10)).compute()
+
+        self.assertTrue(outcomes[self.device_3.pk][1])
+        self.assertFalse(DeviceSoftwareValidationEngine().compute()[self.device_3.pk][1])
+
+    def test_project_matches_compute_on_each_date(self):  # pylint: disable=too-many-locals
+        today = date.today()
+        dates = [today - timedelta(days=20), today - timedelta(days=3), today, today + timedelta(days=10)]
+        engine = DeviceSoftwareValidationEngine()
+        engine.chunk_size = 3
+
+        projection = engine.project(reversed(dates))
+
+        for group_by, lookup in (
+            (choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE, "device_type__model"),
+            (choices.ComplianceSnapshotGroupChoices.PLATFORM, "platform__name"),
+        ):
+            item_groups = dict(Device.objects.values_list("pk", lookup))
+            for index, on_date in enumerate(dates):
+                expected = defaultdict(lambda: {"total": 0, "valid": 0, "no_software": 0})
+                for item_pk, (software_id, is_validated, _) in (
+                    DeviceSoftwareValidationEngine(valid_on=on_date).compute().items()
+                ):
+                    counts = expected[item_groups[item_pk] or ""]
+                    counts["total"] += 1
+                    counts["valid"] += is_validated
+                    counts["no_software"] += not software_id
+                for group_name, counts in expected.items():
+                    projected = projection[group_by][group_name][index]
+                    self.assertEqual(projected["date"], on_date)
+                    self.assertEqual(
+                        {key: projected[key] for key in counts}, counts, f"{group_by} {group_name} {on_date}"
+                    )
+        total = projection[choices.ComplianceSnapshotGroupChoices.TOTAL][""]
+        self.assertEqual([counts["valid"] for counts in total], [0, 2, 1, 2])
+        self.assertEqual(total[0]["invalid"], 3)
+        self.assertEqual(DeviceSoftwareValidationResult.objects.count(), 0)
+
+    def test_result_queryset_valid_on(self):
+        DeviceSoftwareValidationEngine().run()
+
+        self.assertEqual(
+            set(DeviceSoftwareValidationResult.objects.valid_on(date.today()).values_list("device", flat=True)),
+            set(DeviceSoftwareValidationResult.objects.filter(is_validated=True).values_list("device", flat=True)),
+        )
+        self.assertEqual(
+            set(
+                DeviceSoftwareValidationResult.objects.valid_on(date.today() + timedelta(days=10)).values_list(
+                    "device", flat=True
+                )
+            ),
+            {self.device_1.pk, self.device_3.pk},
+        )
+
+    def test_incremental_run_only_revalidates_changed_devices(self):
+        DeviceSoftwareValidationEngine().run()
+        engine = DeviceSoftwareValidationEngine(run_type=choices.ReportRunTypeChoices.REPORT_INCREMENTAL_RUN)
+        since = engine.get_last_run()
+        self.assertEqual(engine.get_changed_pks(since), set())
+
+        RelationshipAssociation.objects.filter(destination_id=self.device_2.pk).delete()
+        counts = engine.run(since=since)
+
+        self.assertEqual(counts["processed"], 1)
+        result = DeviceSoftwareValidationResult.objects.get(device=self.device_2)
+        self.assertIsNone(result.software)
+        self.assertEqual(result.run_type, choices.ReportRunTypeChoices.REPORT_INCREMENTAL_RUN)
+        self.assertMatchesPerDevicePath()
+
+    def test_incremental_run_detects_validity_window_crossing(self):
+        DeviceSoftwareValidationEngine().run()
+        engine = DeviceSoftwareValidationEngine()
+        since = engine.get_last_run()
+        # Tag rule assigned to device_3 becomes valid in 5 days
+        engine.today = date.today() + timedelta(days=5)
+
+        changed = engine.get_changed_pks(since)
+
+        self.assertEqual(changed, {self.device_3.pk})
+
+    def test_changed_pks_limited_to_queryset(self):
+        DeviceSoftwareValidationEngine().run()
+        since = DeviceSoftwareValidationEngine().get_last_run()
+        RelationshipAssociation.objects.filter(destination_id__in=[self.device_1.pk, self.device_2.pk]).delete()
+        DeviceSoftwareValidationResult.objects.filter(device=self.device_3).update(is_validated=True, software=None)
+
+        # Stored results of devices outside the shard are not compared
+        engine = DeviceSoftwareValidationEngine(queryset=Device.objects.filter(pk=self.device_2.pk))
+
+        self.assertEqual(engine.get_changed_pks(since), {self.device_2.pk})
+
+
+class InventoryItemSoftwareValidationEngineTestCase(TestCase):
+    """Tests for InventoryItemSoftwareValidationEngine."""
+
+    def setUp(self):
+        self.inventory_item_1, self.inventory_item_2, _ = create_inventory_items()
+        platform = Platform.objects.get(name="cisco_ios")
+        software = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        inventory_item_soft_rel = Relationship.objects.get(key="inventory_item_soft")
+        for inventory_item in (self.inventory_item_1, self.inventory_item_2):
+            RelationshipAssociation.objects.create(
+                source=software, destination=inventory_item, relationship=inventory_item_soft_rel
+            )
+        validated_software = ValidatedSoftwareLCM(software=software, start=date.today())
+        validated_software.save()
+        validated_software.inventory_items.set([self.inventory_item_1])
+
+    def test_chunked_run_matches_per_item_path(self):
+        engine = InventoryItemSoftwareValidationEngine()
+        engine.chunk_size = 2
+
+        counts = engine.run()
+
+        self.assertEqual(counts, {"processed": 3, "new": 3, "changed": 0, "unchanged": 0, "software_removed": 0})
+        self.assertTrue(
+            InventoryItemSoftwareValidationResult.objects.get(inventory_item=self.inventory_item_1).is_validated
+        )
+        for inventory_item in InventoryItem.objects.all():
+            item_software = InventoryItemSoftware(inventory_item)
+            result = InventoryItemSoftwareValidationResult.objects.get(inventory_item=inventory_item)
+            self.assertEqual(result.is_validated, item_software.validate_software(), inventory_item.name)
+            self.assertEqual(result.software, item_software.software, inventory_item.name)
+            self.assertEqual(
+                set(result.valid_software.all()),
+                set(ValidatedSoftwareLCM.objects.get_for_object(inventory_item)),
+                inventory_item.name,
+            )
+
+    def test_iter_chunks(self):
+        engine = InventoryItemSoftwareValidationEngine()
+        engine.chunk_size = 2
+
+        chunks = [
+            (last_pk, list(chunk.order_by("pk").values_list("pk", flat=True)))
+            for last_pk, chunk in engine.iter_chunks(engine.queryset)
+        ]
+
+        self.assertEqual([len(chunk) for _, chunk in chunks], [2, 1])
+        self.assertEqual([last_pk for last_pk, _ in chunks], [chunk[-1] for _, chunk in chunks])
+        self.assertEqual(
+            sorted(sum((chunk for _, chunk in chunks), [])), sorted(InventoryItem.objects.values_list("pk", flat=True))
+        )
+
+    def test_resume_interrupted_run(self):
+        engine = InventoryItemSoftwareValidationEngine()
+        engine.chunk_size = 2
+        checkpoint = engine.start_checkpoint()
+        first_pks = list(InventoryItem.objects.order_by("pk").values_list("pk", flat=True)[:2])
+
+        write = engine.write
+
+        def interrupted_write(outcomes):
+            if set(outcomes) != set(first_pks):
+                raise RuntimeError("Worker lost")
+            return write(outcomes)
+
+        with mock.patch.object(engine, "write", side_effect=interrupted_write):
+            with self.assertRaises(RuntimeError):
+                engine.run(checkpoint=checkpoint)
+
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.cursor, first_pks[-1])
+        self.assertEqual(checkpoint.counts["processed"], 2)
+
+        resumed_engine = InventoryItemSoftwareValidationEngine()
+        resumed_engine.chunk_size = 2
+        resumed_checkpoint = resumed_engine.resume_checkpoint()
+        self.assertEqual(resumed_checkpoint.run_id, checkpoint.run_id)
+        self.assertEqual(resumed_engine.job_run_time, checkpoint.job_run_time)
+
+        counts = resumed_engine.run(checkpoint=resumed_checkpoint)
+
+        self.assertEqual(counts, {"processed": 3, "new": 3, "changed": 0, "unchanged": 0, "software_removed": 0})
+        self.assertFalse(ValidationCheckpoint.objects.exists())
+        self.assertEqual(
+            set(InventoryItemSoftwareValidationResult.objects.values_list("last_run", flat=True)),
+            {checkpoint.job_run_time},
+        )
+        self.assertTrue(
+            InventoryItemSoftwareValidationResult.objects.get(inventory_item=self.inventory_item_1).is_validated
+        )
+
+    def test_superseded_checkpoint_is_not_overwritten(self):
+        engine = InventoryItemSoftwareValidationEngine()
+        engine.chunk_size = 2
+        checkpoint = engine.start_checkpoint()
+        new_checkpoint = InventoryItemSoftwareValidationEngine().start_checkpoint()
+
+        engine.run(checkpoint=checkpoint)
+
+        new_checkpoint.refresh_from_db()
+        self.assertIsNone(new_checkpoint.cursor)
+        self.assertEqual(new_checkpoint.counts, {})
+
+
+@mock.patch.dict("nautobot_device_lifecycle_mgmt.tasks.PLUGIN_CFG", event_driven_validation=True)
+@mock.patch.object(
+    validate_pending_software, "apply_async", side_effect=lambda args, countdown: validate_pending_software.apply(args)
+)
+class EventDrivenValidationTestCase(TestCase):
+    """Tests for revalidation triggered by signals."""
+
+    def setUp(self):
+        for kind in ("device", "inventory_item"):
+            cache.delete_many(_validation_cache_keys(kind))
+        # Software assignments also queue vulnerability generation, which is covered by its own tests
+        patcher = mock.patch.object(generate_pending_vulnerabilities, "apply_async")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.device_1, self.device_2, _ = create_devices()
+        platform = Platform.objects.get(name="cisco_ios")
+        self.software = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        self.device_soft_rel = Relationship.objects.get(key="device_soft")
+        DeviceSoftwareValidationEngine().run()
+
+    def test_software_assignment_revalidates_device(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            RelationshipAssociation.objects.create(
+                source=self.software, destination=self.device_1, relationship=self.device_soft_rel
+            )
+
+        result = DeviceSoftwareValidationResult.objects.get(device=self.device_1)
+        self.assertEqual(result.software, self.software)
+        self.assertFalse(result.is_validated)
+        self.assertEqual(result.run_type, choices.ReportRunTypeChoices.REPORT_EVENT_RUN)
+        self.assertEqual(
+            DeviceSoftwareValidationResult.objects.get(device=self.device_2).run_type,
+            choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+        )
+        # Snapshots are only recorded by the validation jobs, not by event-driven revalidations
+        self.assertFalse(ValidationComplianceSnapshot.objects.exists())
+
+    def test_disabled_setting_skips_revalidation(self, mock_apply_async):
+        validated_software = ValidatedSoftwareLCM(software=self.software, start=date.today())
+        with mock.patch.dict("nautobot_device_lifecycle_mgmt.tasks.PLUGIN_CFG", event_driven_validation=False):
+            with self.captureOnCommitCallbacks(execute=True):
+                RelationshipAssociation.objects.create(
+                    source=self.software, destination=self.device_1, relationship=self.device_soft_rel
+                )
+                validated_software.save()
+                validated_software.devices.set([self.device_1])
+
+        mock_apply_async.assert_not_called()
+        self.assertIsNone(DeviceSoftwareValidationResult.objects.get(device=self.device_1).software)
+
+    def test_validated_software_changes_revalidate_devices(self, _):
+        RelationshipAssociation.objects.create(
+            source=self.software, destination=self.device_1, relationship=self.device_soft_rel
+        )
+        validated_software = ValidatedSoftwareLCM(software=self.software, start=date.today() - timedelta(days=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            validated_software.save()
+            validated_software.device_types.set([self.device_1.device_type])
+
+        self.assertTrue(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            validated_software.delete()
+
+        self.assertFalse(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated)
+
+    def test_tag_change_revalidates_device(self, _):
+        RelationshipAssociation.objects.create(
+            source=self.software, destination=self.device_1, relationship=self.device_soft_rel
+        )
+        tag, _ = Tag.objects.get_or_create(name="lcm-validation")
+        tag.content_types.add(ContentType.objects.get_for_model(Device))
+        validated_software = ValidatedSoftwareLCM(software=self.software, start=date.today())
+        validated_software.save()
+        validated_software.object_tags.set([tag])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.device_1.tags.add(tag)
+
+        self.assertTrue(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated)
+
+    def test_device_save_revalidates_only_on_validation_field_change(self, _):
+        with mock.patch("nautobot_device_lifecycle_mgmt.signals.queue_software_validation") as mock_queue:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.device_1.serial = "FOC123"
+                self.device_1.save()
+            mock_queue.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.device_1.role = Role.objects.get(name="router")
+                self.device_1.save()
+            mock_queue.assert_called_once_with("device", {self.device_1.pk})
+
+    def test_assignment_changes_revalidate_devices(self, _):
+        RelationshipAssociation.objects.create(
+            source=self.software, destination=self.device_1, relationship=self.device_soft_rel
+        )
+        validated_software = ValidatedSoftwareLCM(software=self.software, start=date.today())
+        validated_software.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            validated_software.devices.add(self.device_1)
+
+        self.assertTrue(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            validated_software.devices.clear()
+
+        self.assertFalse(DeviceSoftwareValidationResult.objects.get(device=self.device_1).is_validated)
+
+    def test_get_rule_item_pks(self, _):
+        validated_software = ValidatedSoftwareLCM(software=self.software, start=date.today())
+        validated_software.save()
+        validated_software.device_roles.set([self.device_2.role])
+
+        self.assertEqual(
+            DeviceSoftwareValidationEngine().get_rule_item_pks(validated_software),
+            set(Device.objects.filter(role=self.device_2.role).values_list("pk", flat=True)),
+        )
+        self.assertEqual(InventoryItemSoftwareValidationEngine().get_rule_item_pks(validated_software), set())
+
+
+class ParallelValidationTestCase(TestCase):
+    """Tests for validation split into shards processed by parallel tasks."""
+
+    def setUp(self):
+        create_devices()
+        self.run_type = choices.ReportRunTypeChoices.REPORT_FULL_RUN
+
+    def test_get_validation_shards(self):
+        pks = sorted(str(pk) for pk in Device.objects.values_list("pk", flat=True))
+
+        shards = get_validation_shards(Device.objects.all(), 2)
+
+        self.assertEqual(shards, [(None, pks[2]), (pks[2], None)])
+        self.assertEqual(get_validation_shards(Device.objects.all(), 10), [(None, None)])
+
+    def test_shards_cover_all_devices(self):
+        counts = None
+        for shard in get_validation_shards(Device.objects.all(), 2):
+            counts = validate_software_shard(
+                counts,
+                shard,
+                {
+                    "kind": "device",
+                    "run_type": self.run_type,
+                    "job_run_time": datetime.now().isoformat(),
+                    "since": None,
+                },
+            )
+        job_result = JobResult.objects.create(name="Device Software Validation Report")
+        cache.delete(JOB_INSTRUMENTATION_CACHE_KEY)
+
+        with mock.patch.object(JobResult, "log") as mock_log, mock.patch.dict(
+            "nautobot_device_lifecycle_mgmt.instrumentation.PLUGIN_CFG", enabled_metrics=[JOB_INSTRUMENTATION_METRIC]
+        ):
+            totals = aggregate_software_validation(
+                [counts], "device", str(job_result.pk), "DeviceSoftwareValidationFullReport"
+            )
+
+        self.assertEqual(totals["processed"], Device.objects.count())
+        self.assertEqual(totals["shards"], 2)
+        self.assertEqual(totals["failed"], [])
+        self.assertEqual(DeviceSoftwareValidationResult.objects.count(), Device.objects.count())
+        self.assertEqual(mock_log.call_args_list[0].args[0], "Performed validation on: 3 devices in 2 shards.")
+        self.assertEqual(
+            mock_log.call_args_list[1].args[0],
+            "Validation results: 3 new, 0 changed, 0 unchanged, 0 with software removed.",
+        )
+        # Parallel runs are instrumented under the job name, like serial runs
+        job_stats = cache.get(JOB_INSTRUMENTATION_CACHE_KEY)["DeviceSoftwareValidationFullReport"]
+        self.assertEqual(set(job_stats["phases"]), {"load", "compute", "write"})
+        self.assertEqual(sum(job_stats["phases"]["load"]["buckets"]), 1)
+        self.assertGreater(job_stats["queries"], 0)
+        self.assertGreater(job_stats["objects_per_second"], 0)
+
+    @mock.patch("nautobot_device_lifecycle_mgmt.tasks.chord")
+    def test_dispatch_limits_concurrency(self, mock_chord):
+        with mock.patch.dict(
+            "nautobot_device_lifecycle_mgmt.tasks.PLUGIN_CFG", validation_shard_size=1, validation_max_concurrency=2
+        ):
+            shard_count, lane_count = dispatch_parallel_validation(
+                "device",
+                "00000000-0000-0000-0000-000000000000",
+                "DeviceSoftwareValidationFullReport",
+                self.run_type,
+                datetime.now(),
+            )
+
+        self.assertEqual((shard_count, lane_count), (3, 2))
+        self.assertEqual(len(list(mock_chord.call_args.args[0])), 2)
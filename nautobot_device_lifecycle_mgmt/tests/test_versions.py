@@ -0,0 +1,142 @@
+# pylint: disable=no-member
+"""nautobot_device_lifecycle_mgmt test class for the version parsers."""
+
+from importlib import import_module
+
+from django.test import TestCase
+from nautobot.dcim.models import Platform
+
+from nautobot_device_lifecycle_mgmt.models import SoftwareLCM
+from nautobot_device_lifecycle_mgmt.versions import (
+    AristaEOSVersionParser,
+    CiscoIOSVersionParser,
+    CiscoIOSXEVersionParser,
+    CiscoNXOSVersionParser,
+    JuniperJunosVersionParser,
+    VersionParser,
+    get_version_parser,
+    get_version_sort_key,
+)
+
+
+class VersionParserTestCase(TestCase):
+    """Tests for the version parsers."""
+
+    def assertSortsInOrder(self, parser, versions):  # pylint: disable=invalid-name
+        """Assert sort keys of versions, listed in ascending order, sort in the same order."""
+        self.assertEqual(sorted(versions, key=parser.sort_key), versions)
+        self.assertEqual(len({parser.sort_key(version) for version in versions}), len(versions))
+
+    def test_parse(self):
+        self.assertEqual(CiscoIOSVersionParser().parse("15.2(4)M7"), (15, 2, 4, "m", 7))
+        self.assertEqual(CiscoIOSXEVersionParser().parse("Amsterdam-17.03.04a"), (17, 3, 4, "a"))
+        self.assertEqual(CiscoNXOSVersionParser().parse("7.0(3)I7(9)"), (7, 0, 3, "i", 7, 9))
+        self.assertEqual(JuniperJunosVersionParser().parse("18.4R3-S2"), (18, 4, "r", 3, "s", 2))
+        self.assertEqual(AristaEOSVersionParser().parse("4.22.9M"), (4, 22, 9))
+
+    def test_matches(self):
+        self.assertTrue(CiscoIOSVersionParser().matches("12.2(55)SE12"))
+        self.assertFalse(CiscoIOSVersionParser().matches("17.3.4"))
+        self.assertTrue(CiscoNXOSVersionParser().matches("9.3(8)"))
+        self.assertTrue(JuniperJunosVersionParser().matches("15.1X49-D200.3"))
+        self.assertTrue(AristaEOSVersionParser().matches("4.21.1.1F"))
+        self.assertTrue(VersionParser().matches("anything"))
+
+    def test_sort_keys_order_versions(self):
+        self.assertSortsInOrder(CiscoIOSVersionParser(), ["12.2(55)SE12", "15.2(4)M7", "15.2(4)M10", "15.2(5)M1"])
+        self.assertSortsInOrder(CiscoIOSXEVersionParser(), ["16.9.4", "16.12.1", "17.3.4", "17.3.4a", "17.10.1"])
+        self.assertSortsInOrder(CiscoNXOSVersionParser(), ["7.0(3)I7(9)", "9.3(8)", "9.3(10)", "10.2(3)"])
+        self.assertSortsInOrder(JuniperJunosVersionParser(), ["18.4R2", "18.4R2-S1", "18.4R2-S10", "18.4R3", "20.1R1"])
+        self.assertSortsInOrder(AristaEOSVersionParser(), ["4.21.1.1F", "4.22.9M", "4.22.10M", "4.28.0F"])
+
+    def test_eos_release_type_is_ignored(self):
+        parser = AristaEOSVersionParser()
+
+        self.assertEqual(parser.sort_key("4.22.9M"), parser.sort_key("4.22.9F"))
+
+    def test_sort_key_is_case_insensitive(self):
+        self.assertEqual(CiscoIOSVersionParser().sort_key("15.2(4)M7"), CiscoIOSVersionParser().sort_key("15.2(4)m7"))
+
+    def test_get_version_parser(self):
+        self.assertIsInstance(get_version_parser("cisco_ios", "Cisco IOS"), CiscoIOSVersionParser)
+        self.assertIsInstance(get_version_parser(None, "arista_eos"), AristaEOSVersionParser)
+        self.assertIs(type(get_version_parser("", "unknown")), VersionParser)
+
+    def test_migration_sort_keys_match(self):
+        migration = import_module("nautobot_device_lifecycle_mgmt.migrations.0025_softwarelcm_version_sort_key")
+        versions = ["15.2(4)M7", "Amsterdam-17.03.04a", "7.0(3)I7(9)", "18.4R3-S2", "4.22.9M", " 2.0-beta1 "]
+        for network_driver in ("cisco_ios", "cisco_xe", "cisco_nxos", "juniper_junos", "arista_eos", ""):
+            platform = Platform(name="Generic", network_driver=network_driver)
+            for version in versions:
+                self.assertEqual(
+                    migration.get_version_sort_key(platform, version), get_version_sort_key(platform, version)
+                )
+
+
+class SoftwareVersionRangeTestCase(TestCase):
+    """Tests for the stored version sort keys and version range matching."""
+
+    def setUp(self):
+        self.platform_ios, _ = Platform.objects.get_or_create(name="cisco_ios")
+        self.platform_junos, _ = Platform.objects.get_or_create(name="Junos", network_driver="juniper_junos")
+        self.ios = {
+            version: SoftwareLCM.objects.create(device_platform=self.platform_ios, version=version)
+            for version in ("15.2(4)M7", "15.2(4)M10", "15.2(5)M1", "15.3(1)T")
+        }
+        self.junos = {
+            version: SoftwareLCM.objects.create(device_platform=self.platform_junos, version=version)
+            for version in ("18.4R2", "18.4R2-S1", "18.4R3", "20.1R1")
+        }
+
+    def test_version_sort_key_is_stored(self):
+        software = self.ios["15.2(4)M7"]
+
+        self.assertEqual(software.version_sort_key, CiscoIOSVersionParser().sort_key("15.2(4)M7"))
+        self.assertEqual(
+            list(
+                SoftwareLCM.objects.filter(device_platform=self.platform_ios)
+                .order_by("version_sort_key")
+                .values_list("version", flat=True)
+            ),
+            ["15.2(4)M7", "15.2(4)M10", "15.2(5)M1", "15.3(1)T"],
+        )
+
+    def test_match_version_ranges(self):
+        software_ids = SoftwareLCM.objects.match_version_ranges(
+            [
+                {"platform": self.platform_ios, "start": "15.2(4)M8", "end": "15.2(5)M1"},
+                {"platform": self.platform_junos, "start": "18.4R2", "end": "18.4R3", "end_inclusive": False},
+            ]
+        )
+
+        self.assertEqual(
+            software_ids,
+            {
+                self.ios["15.2(4)M10"].pk,
+                self.ios["15.2(5)M1"].pk,
+                self.junos["18.4R2"].pk,
+                self.junos["18.4R2-S1"].pk,
+            },
+        )
+
+    def test_match_version_ranges_unbounded(self):
+        self.assertEqual(
+            SoftwareLCM.objects.match_version_ranges(
+                [{"platform": self.platform_ios, "start": "15.2(5)M1", "start_inclusive": False}]
+            ),
+            {self.ios["15.3(1)T"].pk},
+        )
+        self.assertEqual(
+            SoftwareLCM.objects.match_version_ranges([{"platform": self.platform_junos}]),
+            {software.pk for software in self.junos.values()},
+        )
+
+    def test_platform_change_updates_version_sort_keys(self):
+        SoftwareLCM.objects.filter(pk=self.junos["18.4R2"].pk).update(version_sort_key="")
+
+        self.platform_junos.save()
+
+        self.assertEqual(
+            SoftwareLCM.objects.get(pk=self.junos["18.4R2"].pk).version_sort_key,
+            JuniperJunosVersionParser().sort_key("18.4R2"),
+        )
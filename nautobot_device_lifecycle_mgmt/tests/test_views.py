@@ -2,24 +2,32 @@
 """Unit tests for views."""
 
 import datetime
-from unittest import skip
+from unittest import mock, skip
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.urls import reverse
-from nautobot.apps.testing import ViewTestCases
+from nautobot.apps.testing import TestCase, ViewTestCases
+from nautobot.core.testing.utils import extract_page_body
 from nautobot.dcim.models import DeviceType, Manufacturer
-from nautobot.extras.models import Status
+from nautobot.extras.models import Relationship, RelationshipAssociation, Status
 from nautobot.users.models import ObjectPermission
 
+from nautobot_device_lifecycle_mgmt import choices
 from nautobot_device_lifecycle_mgmt.models import (
     CVELCM,
     DeviceSoftwareValidationResult,
     HardwareLCM,
     InventoryItemSoftwareValidationResult,
     SoftwareImageLCM,
+    SoftwareLCM,
+    ValidatedSoftwareLCM,
+    ValidationComplianceSnapshot,
+    VulnerabilityExposure,
     VulnerabilityLCM,
 )
+from nautobot_device_lifecycle_mgmt.tasks import compute_compliance_projection
+from nautobot_device_lifecycle_mgmt.validation import DeviceSoftwareValidationEngine
 
 from .conftest import create_cves, create_devices, create_inventory_items, create_softwares
 
@@ -525,3 +533,173 @@ class InventoryItemSoftwareValidationResultListViewTest(ViewTestCases.ListObject
     @skip("Not implemented")
     def test_list_objects_filtered(self):
         pass
+
+
+class VulnerabilityExposureListViewTest(ViewTestCases.ListObjectsViewTestCase):
+    """Test VulnerabilityExposureListView"""
+
+    model = VulnerabilityExposure
+
+    def _get_base_url(self):
+        return "plugins:nautobot_device_lifecycle_mgmt:vulnerabilityexposure_list"
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=invalid-name
+        """Set up test objects."""
+        item_1, item_2, _ = create_inventory_items()
+        VulnerabilityExposure.objects.create(device=item_1.device, critical_count=1, total_count=1, max_cvss_v3=9.8)
+        VulnerabilityExposure.objects.create(device=item_2.device, low_count=2, total_count=2)
+        VulnerabilityExposure.objects.create(inventory_item=item_1, high_count=1, total_count=1)
+
+    @skip("Not implemented")
+    def test_list_objects_with_constrained_permission(self):
+        pass
+
+    @skip("Not implemented")
+    def test_list_objects_unknown_filter_no_strict_filtering(self):
+        pass
+
+    @skip("Not implemented")
+    def test_list_objects_filtered(self):
+        pass
+
+
+class ComplianceTrendViewTest(TestCase):
+    """Test ComplianceTrendView."""
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=invalid-name
+        """Set up test objects."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for days, valid in ((2, 1), (1, 3)):
+            for group_by, group_name in (
+                (choices.ComplianceSnapshotGroupChoices.TOTAL, ""),
+                (choices.ComplianceSnapshotGroupChoices.PLATFORM, "cisco_ios"),
+            ):
+                ValidationComplianceSnapshot.objects.create(
+                    snapshot_time=now - datetime.timedelta(days=days),
+                    object_type=choices.ComplianceSnapshotObjectTypeChoices.DEVICE,
+                    run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+                    group_by=group_by,
+                    group_name=group_name,
+                    total=4,
+                    valid=valid,
+                    invalid=4 - valid,
+                )
+
+    def test_compliance_trend_view_without_permission(self):
+        self.assertHttpStatus(self.client.get(reverse("plugins:nautobot_device_lifecycle_mgmt:compliance_trend")), 403)
+
+    def test_compliance_trend_view_with_permission(self):
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_validationcompliancesnapshot")
+
+        response = self.client.get(
+            reverse("plugins:nautobot_device_lifecycle_mgmt:compliance_trend"), {"group_by": "platform"}
+        )
+
+        self.assertHttpStatus(response, 200)
+        body = extract_page_body(response.content.decode(response.charset))
+        self.assertIn("75.0 %", body)
+        self.assertIn("25.0 %", body)
+        self.assertIn("Compliance Trend Chart", body)
+        self.assertEqual(len(response.context["snapshots"]), 2)
+        self.assertEqual(response.context["group_name"], "cisco_ios")
+
+    def test_device_report_reads_latest_snapshot(self):
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+
+        response = self.client.get(reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report"))
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.context["device_aggr"]["valid"], 3)
+        self.assertEqual(response.context["device_aggr"]["valid_percent"], 75.0)
+
+    def test_device_report_table_reads_latest_snapshot(self):
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+        ValidationComplianceSnapshot.objects.create(
+            snapshot_time=ValidationComplianceSnapshot.objects.latest("snapshot_time").snapshot_time,
+            object_type=choices.ComplianceSnapshotObjectTypeChoices.DEVICE,
+            run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN,
+            group_by=choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE,
+            group_name="ASR-1000",
+            total=4,
+            valid=1,
+            invalid=3,
+        )
+
+        response = self.client.get(reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report"))
+
+        self.assertHttpStatus(response, 200)
+        [row] = response.context["table"].data
+        self.assertEqual(row["device__device_type__model"], "ASR-1000")
+        self.assertEqual(row["valid_percent"], 25.0)
+
+    def test_device_report_ignores_stale_snapshot(self):
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+        create_devices()
+        DeviceSoftwareValidationEngine(run_type=choices.ReportRunTypeChoices.REPORT_EVENT_RUN).run()
+
+        response = self.client.get(reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report"))
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.context["device_aggr"]["total"], 3)
+        self.assertEqual(response.context["device_aggr"]["no_software"], 3)
+
+
+class ComplianceProjectionViewTest(TestCase):
+    """Test ComplianceProjectionView and the valid_on parameter of the report views."""
+
+    @classmethod
+    def setUpTestData(cls):  # pylint: disable=invalid-name
+        """Set up test objects."""
+        cls.device_1, cls.device_2, _ = create_devices()
+        software = SoftwareLCM.objects.create(device_platform=cls.device_1.platform, version="17.3.3 MD")
+        device_soft_rel = Relationship.objects.get(key="device_soft")
+        for device in (cls.device_1, cls.device_2):
+            RelationshipAssociation.objects.create(source=software, destination=device, relationship=device_soft_rel)
+        cls.today = datetime.date.today()
+        validated_software = ValidatedSoftwareLCM.objects.create(
+            software=software,
+            start=cls.today - datetime.timedelta(days=10),
+            end=cls.today + datetime.timedelta(days=20),
+        )
+        validated_software.devices.set([cls.device_1])
+        DeviceSoftwareValidationEngine().run()
+
+    def test_compliance_projection_view_without_permission(self):
+        self.assertHttpStatus(
+            self.client.get(reverse("plugins:nautobot_device_lifecycle_mgmt:compliance_projection")), 403
+        )
+
+    def test_compliance_projection_view_with_permission(self):
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_validatedsoftwarelcm")
+        url = reverse("plugins:nautobot_device_lifecycle_mgmt:compliance_projection")
+        params = {"group_by": "platform", "start": self.today.isoformat(), "interval": 30, "end": "invalid"}
+
+        with mock.patch.object(compute_compliance_projection, "apply_async") as apply_async:
+            response = self.client.get(url, params)
+            self.assertTrue(response.context["computing"])
+            self.client.get(url, params)
+            apply_async.assert_called_once()
+            compute_compliance_projection.apply(**apply_async.call_args.kwargs)
+            response = self.client.get(url, params)
+
+        self.assertHttpStatus(response, 200)
+        self.assertFalse(response.context["computing"])
+        self.assertEqual(len(response.context["dates"]), 13)
+        [(group_name, counts)] = response.context["rows"]
+        self.assertEqual(group_name, self.device_1.platform.name)
+        self.assertEqual([row["valid"] for row in counts[:2]], [1, 0])
+        self.assertIn("Compliance Projection Chart", extract_page_body(response.content.decode(response.charset)))
+
+    def test_device_report_valid_on(self):
+        self.add_permissions("nautobot_device_lifecycle_mgmt.view_devicesoftwarevalidationresult")
+        url = reverse("plugins:nautobot_device_lifecycle_mgmt:validatedsoftware_device_report")
+
+        response = self.client.get(url, {"valid_on": (self.today + datetime.timedelta(days=30)).isoformat()})
+
+        self.assertHttpStatus(response, 200)
+        self.assertEqual(response.context["device_aggr"]["valid"], 0)
+        self.assertEqual(response.context["device_aggr"]["invalid"], 2)
+        self.assertEqual(response.context["device_aggr"]["total"], 3)
+        self.assertEqual(self.client.get(url).context["device_aggr"]["valid"], 1)
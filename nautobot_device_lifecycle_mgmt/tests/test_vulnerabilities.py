@@ -0,0 +1,400 @@
+# pylint: disable=no-member
+"""nautobot_device_lifecycle_mgmt test class for the bulk vulnerability generation engine."""
+
+from datetime import date
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase
+from nautobot.dcim.models import Platform
+from nautobot.extras.models import JobResult, Relationship, RelationshipAssociation, Status
+
+from nautobot_device_lifecycle_mgmt.instrumentation import JOB_INSTRUMENTATION_CACHE_KEY, JOB_INSTRUMENTATION_METRIC
+from nautobot_device_lifecycle_mgmt.models import CVELCM, SoftwareLCM, VulnerabilityExposure, VulnerabilityLCM
+from nautobot_device_lifecycle_mgmt.tasks import (
+    _vulnerability_cache_keys,
+    aggregate_vulnerability_generation,
+    dispatch_parallel_vulnerabilities,
+    generate_pending_vulnerabilities,
+    generate_vulnerabilities_partition,
+    get_cve_partitions,
+)
+from nautobot_device_lifecycle_mgmt.vulnerabilities import VulnerabilityGenerationEngine
+
+from .conftest import create_cves, create_inventory_items
+
+
+class VulnerabilityGenerationEngineTestCase(TestCase):  # pylint: disable=too-many-instance-attributes
+    """Tests for VulnerabilityGenerationEngine."""
+
+    def setUp(self):
+        self.item_1, self.item_2, _ = create_inventory_items()
+        self.device_1, self.device_2 = self.item_1.device, self.item_2.device
+        platform = Platform.objects.get(name="cisco_ios")
+        self.software_1 = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        self.software_2 = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M8")
+        self.cve_1, self.cve_2, self.cve_3 = create_cves()
+        self.cve_1.affected_softwares.set([self.software_1, self.software_2])
+        self.cve_2.affected_softwares.set([self.software_1])
+
+        device_soft_rel = Relationship.objects.get(key="device_soft")
+        item_soft_rel = Relationship.objects.get(key="inventory_item_soft")
+        for software, obj, relationship in (
+            (self.software_1, self.device_1, device_soft_rel),
+            (self.software_2, self.device_2, device_soft_rel),
+            (self.software_1, self.item_1, item_soft_rel),
+        ):
+            RelationshipAssociation.objects.create(source=software, destination=obj, relationship=relationship)
+
+    def get_vulnerability_keys(self):
+        """Return (cve, software, device, inventory item) names of all vulnerabilities."""
+        return {
+            (
+                vulnerability.cve.name,
+                vulnerability.software.version,
+                getattr(vulnerability.device, "name", None),
+                getattr(vulnerability.inventory_item, "name", None),
+            )
+            for vulnerability in VulnerabilityLCM.objects.all()
+        }
+
+    def test_run_creates_exposed_vulnerabilities(self):
+        counts = VulnerabilityGenerationEngine().run()
+
+        self.assertEqual(
+            counts, {"processed": 3, "created": 5, "skipped": 0, "resolved": 0, "reopened": 0, "refreshed": 3}
+        )
+        self.assertEqual(
+            self.get_vulnerability_keys(),
+            {
+                (self.cve_1.name, "15.2(4)M7", self.device_1.name, None),
+                (self.cve_1.name, "15.2(4)M8", self.device_2.name, None),
+                (self.cve_1.name, "15.2(4)M7", None, self.item_1.name),
+                (self.cve_2.name, "15.2(4)M7", self.device_1.name, None),
+                (self.cve_2.name, "15.2(4)M7", None, self.item_1.name),
+            },
+        )
+
+    def test_run_creates_missing_vulnerabilities_only(self):
+        existing = VulnerabilityLCM.objects.create(cve=self.cve_1, software=self.software_1, device=self.device_1)
+
+        counts = VulnerabilityGenerationEngine().run()
+
+        self.assertEqual((counts["created"], counts["skipped"]), (4, 1))
+        self.assertEqual(VulnerabilityLCM.objects.count(), 5)
+        self.assertTrue(VulnerabilityLCM.objects.filter(pk=existing.pk).exists())
+        self.assertEqual(VulnerabilityGenerationEngine().run()["created"], 0)
+
+    def test_run_limited_to_cves(self):
+        engine = VulnerabilityGenerationEngine(cves=CVELCM.objects.filter(pk=self.cve_2.pk))
+        engine.chunk_size = 1
+
+        self.assertEqual(
+            engine.run(), {"processed": 1, "created": 2, "skipped": 0, "resolved": 0, "reopened": 0, "refreshed": 2}
+        )
+        self.assertEqual(set(VulnerabilityLCM.objects.values_list("cve", flat=True)), {self.cve_2.pk})
+
+    def test_run_in_chunks(self):
+        engine = VulnerabilityGenerationEngine()
+        engine.chunk_size = 1
+        engine.batch_size = 1
+
+        self.assertEqual(
+            engine.run(), {"processed": 3, "created": 5, "skipped": 0, "resolved": 0, "reopened": 0, "refreshed": 3}
+        )
+
+    def test_reconcile_resolves_stale_vulnerabilities(self):
+        VulnerabilityGenerationEngine().run()
+        status, _ = Status.objects.get_or_create(name="Resolved")
+        status.content_types.add(ContentType.objects.get_for_model(VulnerabilityLCM))
+        # Device upgraded off the affected software and software no longer listed by the CVE
+        RelationshipAssociation.objects.filter(destination_id=self.device_2.pk).delete()
+        self.cve_2.affected_softwares.remove(self.software_1)
+
+        counts = VulnerabilityGenerationEngine().run(reconcile=True, resolved_status=status)
+
+        self.assertEqual(
+            counts, {"processed": 3, "created": 0, "skipped": 2, "resolved": 3, "reopened": 0, "refreshed": 0}
+        )
+        self.assertEqual(VulnerabilityLCM.objects.count(), 5)
+        self.assertEqual(
+            set(VulnerabilityLCM.objects.filter(status=status).values_list("cve", "software", "device")),
+            {
+                (self.cve_1.pk, self.software_2.pk, self.device_2.pk),
+                (self.cve_2.pk, self.software_1.pk, self.device_1.pk),
+                (self.cve_2.pk, self.software_1.pk, None),
+            },
+        )
+        self.assertEqual(VulnerabilityGenerationEngine().run(reconcile=True, resolved_status=status)["resolved"], 0)
+
+    def test_reconcile_reopens_resolved_vulnerabilities(self):
+        VulnerabilityGenerationEngine().run()
+        status, _ = Status.objects.get_or_create(name="Resolved")
+        status.content_types.add(ContentType.objects.get_for_model(VulnerabilityLCM))
+        device_2_software = RelationshipAssociation.objects.filter(destination_id=self.device_2.pk)
+        associations = list(device_2_software)
+        device_2_software.delete()
+        self.assertEqual(VulnerabilityGenerationEngine().run(reconcile=True, resolved_status=status)["resolved"], 1)
+        # Device downgraded back to the affected software
+        for association in associations:
+            association.validated_save()
+
+        counts = VulnerabilityGenerationEngine().run(reconcile=True, resolved_status=status)
+
+        self.assertEqual((counts["created"], counts["resolved"], counts["reopened"]), (0, 0, 1))
+        self.assertFalse(VulnerabilityLCM.objects.filter(status=status).exists())
+        self.assertEqual(VulnerabilityGenerationEngine().run(reconcile=True, resolved_status=status)["reopened"], 0)
+
+    def test_reconcile_deletes_stale_vulnerabilities(self):
+        VulnerabilityGenerationEngine().run()
+        self.cve_1.affected_softwares.remove(self.software_2)
+
+        counts = VulnerabilityGenerationEngine().run(reconcile=True)
+
+        self.assertEqual(counts["resolved"], 1)
+        self.assertFalse(VulnerabilityLCM.objects.filter(software=self.software_2).exists())
+        self.assertEqual(VulnerabilityLCM.objects.count(), 4)
+
+    def test_generate_for_cve_software_pairs(self):
+        engine = VulnerabilityGenerationEngine()
+        created = engine.generate_for_pairs(
+            "cve_software",
+            [(self.cve_2.pk, self.software_1.pk), (self.cve_2.pk, self.software_2.pk)],
+        )
+
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            self.get_vulnerability_keys(),
+            {
+                (self.cve_2.name, "15.2(4)M7", self.device_1.name, None),
+                (self.cve_2.name, "15.2(4)M7", None, self.item_1.name),
+            },
+        )
+
+    def test_generate_for_assignment_pairs(self):
+        engine = VulnerabilityGenerationEngine()
+        created = engine.generate_for_pairs(
+            "device",
+            [(self.software_1.pk, self.device_1.pk), (self.software_1.pk, self.device_2.pk)],
+        )
+
+        self.assertEqual(created, 2)
+        self.assertEqual(
+            self.get_vulnerability_keys(),
+            {
+                (self.cve_1.name, "15.2(4)M7", self.device_1.name, None),
+                (self.cve_2.name, "15.2(4)M7", self.device_1.name, None),
+            },
+        )
+        self.assertEqual(engine.generate_for_pairs("device", [(self.software_1.pk, self.device_1.pk)]), 0)
+
+    def test_run_refreshes_exposure(self):
+        CVELCM.objects.filter(pk=self.cve_1.pk).update(severity="Critical", cvss_v3=9.8)
+        CVELCM.objects.filter(pk=self.cve_2.pk).update(severity="High", cvss_v3=7.5)
+
+        VulnerabilityGenerationEngine().run()
+
+        exposure = VulnerabilityExposure.objects.get(device=self.device_1)
+        self.assertEqual(
+            (exposure.critical_count, exposure.high_count, exposure.medium_count, exposure.total_count),
+            (1, 1, 0, 2),
+        )
+        self.assertEqual((exposure.max_cvss_v3, exposure.oldest_published_date), (9.8, date(2021, 3, 24)))
+        self.assertEqual(VulnerabilityExposure.objects.get(inventory_item=self.item_1).total_count, 2)
+        self.assertEqual(VulnerabilityExposure.objects.get(device=self.device_2).critical_count, 1)
+        self.assertEqual(VulnerabilityExposure.objects.count(), 3)
+
+    def test_refresh_exposure_excludes_closed_vulnerabilities(self):
+        VulnerabilityGenerationEngine().run()
+        status, _ = Status.objects.get_or_create(name="Resolved")
+        status.content_types.add(ContentType.objects.get_for_model(VulnerabilityLCM))
+        VulnerabilityLCM.objects.filter(cve=self.cve_2).update(status=status)
+        VulnerabilityLCM.objects.filter(device=self.device_2).delete()
+        engine = VulnerabilityGenerationEngine(closed_statuses=["Resolved"])
+
+        refreshed = engine.refresh_exposure("device", [self.device_1.pk, self.device_2.pk])
+
+        self.assertEqual(refreshed, 2)
+        exposure = VulnerabilityExposure.objects.get(device=self.device_1)
+        self.assertEqual((exposure.total_count, exposure.oldest_published_date), (1, date(2021, 3, 24)))
+        self.assertFalse(VulnerabilityExposure.objects.filter(device=self.device_2).exists())
+        self.assertEqual(engine.refresh_exposure("device", [self.device_1.pk, self.device_2.pk]), 0)
+
+    def test_reconcile_refreshes_exposure(self):
+        VulnerabilityGenerationEngine().run()
+        self.cve_1.affected_softwares.remove(self.software_2)
+
+        counts = VulnerabilityGenerationEngine().run(reconcile=True)
+
+        self.assertEqual(counts["refreshed"], 1)
+        self.assertFalse(VulnerabilityExposure.objects.filter(device=self.device_2).exists())
+
+    def test_generate_for_pairs_collects_changed_objects(self):
+        engine = VulnerabilityGenerationEngine()
+        engine.generate_for_pairs("device", [(self.software_1.pk, self.device_1.pk)])
+
+        self.assertEqual(engine.changed, {"device": {self.device_1.pk}, "inventory_item": set()})
+        self.assertEqual(engine.refresh_changed(), 1)
+        self.assertEqual(engine.changed, {"device": set(), "inventory_item": set()})
+        self.assertEqual(VulnerabilityExposure.objects.get(device=self.device_1).total_count, 2)
+
+
+class ParallelVulnerabilitiesTestCase(TestCase):
+    """Tests for vulnerability generation split into CVE partitions processed by parallel tasks."""
+
+    def setUp(self):
+        self.item, _, _ = create_inventory_items()
+        platform = Platform.objects.get(name="cisco_ios")
+        software = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        for cve in create_cves():
+            cve.affected_softwares.add(software)
+        RelationshipAssociation.objects.create(
+            source=software, destination=self.item.device, relationship=Relationship.objects.get(key="device_soft")
+        )
+        RelationshipAssociation.objects.create(
+            source=software, destination=self.item, relationship=Relationship.objects.get(key="inventory_item_soft")
+        )
+        self.options = {
+            "published_after": "1970-01-01",
+            "reconcile": False,
+            "resolved_status": None,
+            "closed_statuses": [],
+        }
+
+    def test_get_cve_partitions(self):
+        self.assertEqual(
+            get_cve_partitions(CVELCM.objects.all(), 1),
+            [(None, "2021-03-24"), ("2021-03-24", "2021-12-10"), ("2021-12-10", None)],
+        )
+        self.assertEqual(get_cve_partitions(CVELCM.objects.all(), 2), [(None, "2021-12-10"), ("2021-12-10", None)])
+        self.assertEqual(get_cve_partitions(CVELCM.objects.all(), 10), [(None, None)])
+
+    def test_get_cve_partitions_keeps_same_day_together(self):
+        CVELCM.objects.update(published_date="2021-01-01")
+
+        self.assertEqual(get_cve_partitions(CVELCM.objects.all(), 1), [(None, None)])
+
+    def test_partitions_cover_all_cves(self):
+        VulnerabilityLCM.objects.create(cve=CVELCM.objects.get(name="CVE-2021-1391"), device=self.item.device)
+        counts = None
+        for partition in get_cve_partitions(CVELCM.objects.all(), 1):
+            counts = generate_vulnerabilities_partition(counts, partition, self.options)
+        job_result = JobResult.objects.create(name="Generate Vulnerabilities")
+        cache.delete(JOB_INSTRUMENTATION_CACHE_KEY)
+
+        with mock.patch.object(JobResult, "log") as mock_log, mock.patch.dict(
+            "nautobot_device_lifecycle_mgmt.instrumentation.PLUGIN_CFG", enabled_metrics=[JOB_INSTRUMENTATION_METRIC]
+        ):
+            totals = aggregate_vulnerability_generation([counts], str(job_result.pk), "GenerateVulnerabilities")
+
+        self.assertEqual(
+            {
+                key: totals[key]
+                for key in ("processed", "created", "skipped", "resolved", "reopened", "partitions", "refreshed")
+            },
+            {"processed": 3, "created": 6, "skipped": 0, "resolved": 0, "reopened": 0, "partitions": 3, "refreshed": 2},
+        )
+        self.assertEqual(totals["failed"], [])
+        self.assertEqual(VulnerabilityLCM.objects.exclude(software=None).count(), 6)
+        self.assertEqual(VulnerabilityExposure.objects.get(device=self.item.device).total_count, 3)
+        self.assertEqual(
+            mock_log.call_args_list[0].args[0],
+            "Processed 3 CVEs in 3 partitions: 6 Vulnerabilities created, 0 already existing, 0 resolved, 0 reopened.",
+        )
+        # Parallel runs are instrumented under the job name, like serial runs
+        job_stats = cache.get(JOB_INSTRUMENTATION_CACHE_KEY)["GenerateVulnerabilities"]
+        self.assertEqual(set(job_stats["phases"]), {"load", "compute", "write"})
+        self.assertGreater(job_stats["queries"], 0)
+
+    def test_partitions_are_idempotent(self):
+        counts = generate_vulnerabilities_partition(None, (None, None), self.options)
+        counts = generate_vulnerabilities_partition(counts, (None, None), self.options)
+
+        self.assertEqual((counts["created"], counts["skipped"]), (6, 6))
+        self.assertEqual(VulnerabilityLCM.objects.count(), 6)
+
+    @mock.patch("nautobot_device_lifecycle_mgmt.tasks.chord")
+    def test_dispatch_limits_concurrency(self, mock_chord):
+        with mock.patch.dict(
+            "nautobot_device_lifecycle_mgmt.tasks.PLUGIN_CFG",
+            vulnerability_partition_size=1,
+            vulnerability_max_concurrency=2,
+        ):
+            partition_count, lane_count = dispatch_parallel_vulnerabilities(
+                "00000000-0000-0000-0000-000000000000", "GenerateVulnerabilities", date(1970, 1, 1)
+            )
+
+        self.assertEqual((partition_count, lane_count), (3, 2))
+        self.assertEqual(len(list(mock_chord.call_args.args[0])), 2)
+
+
+@mock.patch.dict("nautobot_device_lifecycle_mgmt.tasks.PLUGIN_CFG", event_driven_vulnerabilities=True)
+@mock.patch.object(
+    generate_pending_vulnerabilities,
+    "apply_async",
+    side_effect=lambda args, countdown: generate_pending_vulnerabilities.apply(args),
+)
+class EventDrivenVulnerabilitiesTestCase(TestCase):
+    """Tests for vulnerability generation triggered by signals."""
+
+    def setUp(self):
+        for kind in ("cve_software", "device", "inventory_item"):
+            cache.delete_many(_vulnerability_cache_keys(kind))
+        # Software assignments also queue software validation, which is covered by its own tests
+        patcher = mock.patch("nautobot_device_lifecycle_mgmt.signals.queue_software_validation")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.item, _, _ = create_inventory_items()
+        self.device = self.item.device
+        platform = Platform.objects.get(name="cisco_ios")
+        self.software = SoftwareLCM.objects.create(device_platform=platform, version="15.2(4)M7")
+        self.cve, _, _ = create_cves()
+        self.device_soft_rel = Relationship.objects.get(key="device_soft")
+
+    def test_software_assignment_generates_vulnerability(self, _):
+        self.cve.affected_softwares.add(self.software)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RelationshipAssociation.objects.create(
+                source=self.software, destination=self.device, relationship=self.device_soft_rel
+            )
+
+        self.assertTrue(
+            VulnerabilityLCM.objects.filter(cve=self.cve, software=self.software, device=self.device).exists()
+        )
+
+    def test_cve_affected_software_generates_vulnerabilities(self, _):
+        RelationshipAssociation.objects.create(
+            source=self.software,
+            destination=self.item,
+            relationship=Relationship.objects.get(key="inventory_item_soft"),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.software.corresponding_cves.add(self.cve)
+
+        self.assertTrue(
+            VulnerabilityLCM.objects.filter(cve=self.cve, software=self.software, inventory_item=self.item).exists()
+        )
+
+    def test_removed_pairs_are_ignored(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            RelationshipAssociation.objects.create(
+                source=self.software, destination=self.device, relationship=self.device_soft_rel
+            ).delete()
+            self.cve.affected_softwares.add(self.software)
+
+        self.assertFalse(VulnerabilityLCM.objects.exists())
+
+    def test_disabled_setting_skips_generation(self, mock_apply_async):
+        self.cve.affected_softwares.add(self.software)
+
+        with mock.patch.dict("nautobot_device_lifecycle_mgmt.tasks.PLUGIN_CFG", event_driven_vulnerabilities=False):
+            with self.captureOnCommitCallbacks(execute=True):
+                RelationshipAssociation.objects.create(
+                    source=self.software, destination=self.device, relationship=self.device_soft_rel
+                )
+
+        mock_apply_async.assert_not_called()
+        self.assertFalse(VulnerabilityLCM.objects.exists())
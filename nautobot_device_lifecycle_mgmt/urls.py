@@ -36,6 +36,16 @@ urlpatterns += [
         views.ValidatedSoftwareInventoryItemReportView.as_view(),
         name="validatedsoftware_inventoryitem_report",
     ),
+    path(
+        "compliance-trend/",
+        views.ComplianceTrendView.as_view(),
+        name="compliance_trend",
+    ),
+    path(
+        "compliance-projection/",
+        views.ComplianceProjectionView.as_view(),
+        name="compliance_projection",
+    ),
     # DeviceValidatedSoftwareResult
     path(
         "device-validated-software-result/",
@@ -48,6 +58,11 @@ urlpatterns += [
         views.InventoryItemSoftwareValidationResultListView.as_view(),
         name="inventoryitemsoftwarevalidationresult_list",
     ),
+    path(
+        "vulnerability-exposure/",
+        views.VulnerabilityExposureListView.as_view(),
+        name="vulnerabilityexposure_list",
+    ),
     path(
         "docs/",
         RedirectView.as_view(url=static("nautobot_device_lifecycle_mgmt/docs/index.html")),
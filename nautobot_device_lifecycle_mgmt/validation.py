@@ -0,0 +1,656 @@
+"""Set-based software validation engine for Device and InventoryItem objects."""
+
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+from nautobot.dcim.models import Device, InventoryItem
+from nautobot.extras.models import RelationshipAssociation, TaggedItem
+
+from nautobot_device_lifecycle_mgmt import choices
+from nautobot_device_lifecycle_mgmt.instrumentation import PhaseTimerMixin
+from nautobot_device_lifecycle_mgmt.models import (
+    DeviceSoftwareValidationResult,
+    InventoryItemSoftwareValidationResult,
+    SoftwareLCM,
+    ValidatedSoftwareLCM,
+    ValidationCheckpoint,
+    ValidationComplianceSnapshot,
+)
+from nautobot_device_lifecycle_mgmt.software_filters import ValidatedSoftwareRuleIndex, ValidityWindowIndex
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+
+# Run types of the validation job runs, event-driven revalidations excluded
+JOB_RUN_TYPES = (choices.ReportRunTypeChoices.REPORT_FULL_RUN, choices.ReportRunTypeChoices.REPORT_INCREMENTAL_RUN)
+
+
+class ItemSoftwareValidationEngine(PhaseTimerMixin):
+    """Base class computing software validation results for many objects at once.
+
+    All inputs (software assignments, ValidatedSoftwareLCM assignments, existing results) are loaded with a
+    handful of queries, outcomes are computed in memory and results are written back with bulk operations.
+    Outcomes match the per-object computation done by `ItemSoftware`.
+    """
+
+    soft_obj_model = None
+    soft_relation_name = None
+    result_model = None
+    result_obj_field = None
+    result_related_name = None
+    # group => (lookup of the group pk, lookup of the group name) on the result model
+    snapshot_groups = {}
+    # group => lookup of the group name on the validated model
+    projection_groups = {}
+    batch_size = 1000
+    chunk_size = 10000
+
+    def __init__(
+        self, queryset=None, run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN, job_run_time=None, valid_on=None
+    ):
+        """Initialize ItemSoftwareValidationEngine.
+
+        Args:
+            queryset (QuerySet): objects to validate, all objects when None
+            run_type (str): run type recorded on the results
+            job_run_time (datetime): run time recorded on the results, now when None
+            valid_on (date): date validity of ValidatedSoftwareLCM is evaluated on, today when None
+        """
+        self.queryset = queryset if queryset is not None else self.soft_obj_model.objects.all()
+        if hasattr(self.queryset, "without_tree_fields"):
+            self.queryset = self.queryset.without_tree_fields()
+        self.run_type = run_type
+        self.job_run_time = job_run_time or datetime.now()
+        self.today = valid_on or date.today()
+        self.content_type = ContentType.objects.get_for_model(self.soft_obj_model)
+        self._software_ids = None
+        self.phase_seconds = defaultdict(float)
+
+    @property
+    def result_obj_attname(self):
+        """Name of the result model column referencing the validated object."""
+        return f"{self.result_obj_field}_id"
+
+    def _limit_to_queryset(self, queryset, field_name):
+        """Limit queryset to rows related to the objects being validated, if these are a subset of all objects."""
+        if not self.queryset.query.has_filters():
+            return queryset
+
+        return queryset.filter(**{f"{field_name}__in": self.queryset.order_by().values("pk")})
+
+    def get_items(self):
+        """Return list of `(pk, attrs)` tuples for the objects to validate."""
+        raise NotImplementedError
+
+    def get_item_tags(self):
+        """Return mapping of object pk to set of assigned tag pks."""
+        item_tags = defaultdict(set)
+        tagged_items = self._limit_to_queryset(TaggedItem.objects.filter(content_type=self.content_type), "object_id")
+        for object_id, tag_id in tagged_items.values_list("object_id", "tag_id"):
+            item_tags[object_id].add(tag_id)
+
+        return item_tags
+
+    def get_item_software(self):
+        """Return mapping of object pk to pk of the SoftwareLCM assigned to it."""
+        soft_rels = self._limit_to_queryset(
+            RelationshipAssociation.objects.filter(
+                relationship__key=self.soft_relation_name,
+                destination_type=self.content_type,
+            ),
+            "destination_id",
+        ).values_list("destination_id", "source_id")
+        if self._software_ids is None:
+            self._software_ids = set(SoftwareLCM.objects.values_list("id", flat=True))
+
+        return {dest_id: soft_id for dest_id, soft_id in soft_rels if soft_id in self._software_ids}
+
+    def match_rules(self, rule_index, item_pk, attrs, tags):
+        """Return set of ValidatedSoftwareLCM pks applicable to the object."""
+        raise NotImplementedError
+
+    def load(self):
+        """Load the objects to validate with their tags and software.
+
+        Returns:
+            tuple: list of `(pk, attrs)` tuples as returned by `get_items`, mapping of object pk to set of tag pks
+                and mapping of object pk to SoftwareLCM pk
+        """
+        return self.get_items(), self.get_item_tags(), self.get_item_software()
+
+    def compute(self, rule_index=None, loaded=None):
+        """Compute validation outcome for every object.
+
+        Args:
+            rule_index (ValidatedSoftwareRuleIndex): index of all ValidatedSoftwareLCM, built when not given
+            loaded (tuple): objects, tags and software as returned by `load`, loaded when not given
+
+        Returns:
+            dict: object pk => (software pk, is_validated, set of ValidatedSoftwareLCM pks)
+        """
+        items, item_tags, item_software = loaded if loaded is not None else self.load()
+        if rule_index is None:
+            rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+
+        outcomes = {}
+        for item_pk, attrs in items:
+            matched = self.match_rules(rule_index, item_pk, attrs, item_tags.get(item_pk, set()))
+            software_id = item_software.get(item_pk)
+            is_validated = bool(software_id) and any(
+                rule_index.rules[rule_id].software_id == software_id
+                and rule_index.is_valid(rule_index.rules[rule_id], self.today)
+                for rule_id in matched
+            )
+            outcomes[item_pk] = (software_id, is_validated, matched)
+
+        return outcomes
+
+    def get_existing_results(self):
+        """Return mapping of object pk to (result pk, software pk, is_validated, set of ValidatedSoftwareLCM pks)."""
+        obj_field_attname = self.result_obj_attname
+        existing = {
+            item_pk: (result_id, software_id, is_validated, set())
+            for item_pk, result_id, software_id, is_validated in self._limit_to_queryset(
+                self.result_model.objects.all(), obj_field_attname
+            ).values_list(obj_field_attname, "id", "software_id", "is_validated")
+        }
+        through, result_column, rule_column = self._get_valid_software_through()
+        result_rule_ids = {result_id: rule_ids for result_id, _, _, rule_ids in existing.values()}
+        result_ids = list(result_rule_ids)
+        for offset in range(0, len(result_ids), self.batch_size):
+            for result_id, rule_id in through.objects.filter(
+                **{f"{result_column}__in": result_ids[offset : offset + self.batch_size]}
+            ).values_list(result_column, rule_column):
+                result_rule_ids[result_id].add(rule_id)
+
+        return existing
+
+    def write(self, outcomes):  # pylint: disable=too-many-locals
+        """Write validation outcomes back with bulk operations.
+
+        Results whose software, validation status and valid software are unchanged are not rewritten, only their
+        `last_run` and `run_type` are bumped with a single update query per batch.
+
+        Returns:
+            dict: number of new, changed and unchanged result rows, and of changed rows whose software was removed
+        """
+        obj_field_attname = self.result_obj_attname
+        existing = self.get_existing_results()
+        now = timezone.now()
+
+        to_create, to_update, unchanged_ids, valid_software_ids = [], [], [], {}
+        software_removed = 0
+        for item_pk, (software_id, is_validated, matched) in outcomes.items():
+            fields = {
+                "software_id": software_id,
+                "is_validated": is_validated,
+                "last_run": self.job_run_time,
+                "run_type": self.run_type,
+            }
+            if item_pk not in existing:
+                to_create.append(self.result_model(**{obj_field_attname: item_pk}, **fields))  # pylint: disable=not-callable
+                continue
+
+            result_id, old_software_id, old_is_validated, old_matched = existing[item_pk]
+            if (old_software_id, old_is_validated, old_matched) == (software_id, is_validated, matched):
+                unchanged_ids.append(result_id)
+                continue
+
+            to_update.append(self.result_model(id=result_id, last_updated=now, **fields))  # pylint: disable=not-callable
+            if old_matched != matched:
+                valid_software_ids[item_pk] = result_id
+            if old_software_id and not software_id:
+                software_removed += 1
+
+        with transaction.atomic():
+            self.result_model.objects.bulk_create(to_create, batch_size=self.batch_size)
+            self.result_model.objects.bulk_update(
+                to_update,
+                fields=["software", "is_validated", "last_run", "run_type", "last_updated"],
+                batch_size=self.batch_size,
+            )
+            for offset in range(0, len(unchanged_ids), self.batch_size):
+                self.result_model.objects.filter(id__in=unchanged_ids[offset : offset + self.batch_size]).update(
+                    last_run=self.job_run_time, run_type=self.run_type
+                )
+            self._delete_valid_software(list(valid_software_ids.values()))
+            valid_software_ids.update({getattr(result, obj_field_attname): result.id for result in to_create})
+            self._create_valid_software(outcomes, valid_software_ids)
+
+        return {
+            "new": len(to_create),
+            "changed": len(to_update),
+            "unchanged": len(unchanged_ids),
+            "software_removed": software_removed,
+        }
+
+    def _get_valid_software_through(self):
+        """Return `valid_software` through model and the names of its result and ValidatedSoftwareLCM columns."""
+        m2m_field = self.result_model._meta.get_field("valid_software")
+        return m2m_field.remote_field.through, m2m_field.m2m_column_name(), m2m_field.m2m_reverse_name()
+
+    def _delete_valid_software(self, result_ids):
+        """Delete `valid_software` through rows of the given results."""
+        through, result_column, _ = self._get_valid_software_through()
+        for offset in range(0, len(result_ids), self.batch_size):
+            through.objects.filter(**{f"{result_column}__in": result_ids[offset : offset + self.batch_size]}).delete()
+
+    def _create_valid_software(self, outcomes, result_ids):
+        """Create `valid_software` through rows for results in `result_ids` (object pk => result pk)."""
+        through, result_column, rule_column = self._get_valid_software_through()
+        through.objects.bulk_create(
+            [
+                through(**{result_column: result_id, rule_column: rule_id})
+                for item_pk, result_id in result_ids.items()
+                for rule_id in outcomes[item_pk][2]
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def get_last_run(self, run_types=JOB_RUN_TYPES):
+        """Return time of the most recent validation run of the run types, None if objects were never validated.
+
+        Args:
+            run_types (iterable): run types to consider, the validation job runs by default, None for any run
+        """
+        results = self.result_model.objects.all()
+        if run_types is not None:
+            results = results.filter(run_type__in=run_types)
+
+        return results.aggregate(last_run=Max("last_run"))["last_run"]
+
+    def get_rule_q(self, rule):
+        """Return Q object selecting the objects the given ValidatedSoftwareLCM is assigned to."""
+        raise NotImplementedError
+
+    def get_rule_item_pks(self, rule):
+        """Return pks of objects whose validation outcome depends on the given ValidatedSoftwareLCM."""
+        item_pks = set(
+            self.result_model.objects.filter(valid_software=rule).values_list(self.result_obj_attname, flat=True)
+        )
+        item_pks.update(self.queryset.filter(self.get_rule_q(rule)).values_list("pk", flat=True))
+
+        return item_pks
+
+    def get_changed_pks(self, since):
+        """Return pks of objects whose validation outcome may have changed since the given time.
+
+        An object is considered changed when:
+            - the object itself was updated since the last run
+            - the object has no validation result, or its software assignment differs from the stored result
+            - a ValidatedSoftwareLCM applicable to it now or at the last run was updated since the last run
+            - a ValidatedSoftwareLCM applicable to it became valid or expired since the last run
+            - its result is valid, but the ValidatedSoftwareLCM backing the result was deleted
+        """
+        obj_attname = self.result_obj_attname
+        since_date = timezone.localtime(since).date() if timezone.is_aware(since) else since.date()
+
+        changed = set(self.queryset.filter(last_updated__gte=since).values_list("pk", flat=True))
+        changed.update(
+            self.queryset.filter(**{f"{self.result_related_name}__isnull": True}).values_list("pk", flat=True)
+        )
+        # Stored results are limited to the objects being validated, e.g. the shard of a parallel run
+        results = self._limit_to_queryset(self.result_model.objects.all(), obj_attname)
+        # RelationshipAssociation has no timestamps, compare current software assignments with stored results
+        item_software = self.get_item_software()
+        changed.update(
+            item_pk
+            for item_pk, software_id in results.values_list(obj_attname, "software_id")
+            if item_software.get(item_pk) != software_id
+        )
+
+        changed_rules = set(
+            ValidatedSoftwareLCM.objects.filter(
+                Q(last_updated__gte=since)
+                | Q(start__gt=since_date, start__lte=self.today)
+                | Q(end__gte=since_date, end__lt=self.today)
+            ).values_list("pk", flat=True)
+        )
+        if changed_rules:
+            changed.update(results.filter(valid_software__in=changed_rules).values_list(obj_attname, flat=True))
+            rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+            item_tags = self.get_item_tags()
+            changed.update(
+                item_pk
+                for item_pk, attrs in self.get_items()
+                if self.match_rules(rule_index, item_pk, attrs, item_tags.get(item_pk, set())) & changed_rules
+            )
+
+        changed.update(
+            results.filter(is_validated=True)
+            .exclude(valid_software__software=F("software"))
+            .values_list(obj_attname, flat=True)
+        )
+
+        return changed
+
+    def iter_chunks(self, queryset, after=None):
+        """Yield chunks of at most `chunk_size` objects from queryset, walking the objects in pk order.
+
+        Args:
+            queryset (QuerySet): objects to walk
+            after (UUID): pk of the object to start after, None to start from the first object
+
+        Yields:
+            tuple: pk of the last object in the chunk and queryset of the chunk
+        """
+        last_pk = after
+        while True:
+            chunk_queryset = queryset.order_by("pk")
+            if last_pk is not None:
+                chunk_queryset = chunk_queryset.filter(pk__gt=last_pk)
+            chunk_pks = list(chunk_queryset.values_list("pk", flat=True)[: self.chunk_size])
+            if not chunk_pks:
+                return
+            last_pk = chunk_pks[-1]
+            yield last_pk, queryset.filter(pk__in=chunk_pks)
+
+    def start_checkpoint(self, since=None):
+        """Create the checkpoint progress of this run is saved into, replacing the checkpoint of a previous run."""
+        job_run_time = self.job_run_time
+        if timezone.is_naive(job_run_time):
+            job_run_time = timezone.make_aware(job_run_time)
+        checkpoint, _ = ValidationCheckpoint.objects.update_or_create(
+            object_type=self.result_obj_field,
+            defaults={
+                "run_id": uuid.uuid4(),
+                "run_type": self.run_type,
+                "job_run_time": job_run_time,
+                "since": since,
+                "cursor": None,
+                "counts": {},
+            },
+        )
+
+        return checkpoint
+
+    def resume_checkpoint(self):
+        """Return the checkpoint of an interrupted run and take over its run type and run time.
+
+        Returns:
+            ValidationCheckpoint: checkpoint to pass to `run`, None if there is no interrupted run
+        """
+        checkpoint = ValidationCheckpoint.objects.filter(object_type=self.result_obj_field).first()
+        if checkpoint is not None:
+            self.run_type = checkpoint.run_type
+            self.job_run_time = checkpoint.job_run_time
+
+        return checkpoint
+
+    def run(self, since=None, checkpoint=None):
+        """Validate objects and store the results.
+
+        Objects are processed in chunks of `chunk_size` objects, each chunk is loaded, computed and written
+        before moving on to the next one, keeping memory use independent of the number of objects. Time spent in
+        each of these phases is accumulated into `phase_seconds`.
+
+        Args:
+            since (datetime): when given, only objects that changed since that time are revalidated
+            checkpoint (ValidationCheckpoint): when given, validation continues after its cursor, the cursor and
+                counts are saved into it in the same transaction as each chunk and it is deleted once the run
+                completes. Saving stops if another run took over the checkpoint.
+
+        Returns:
+            dict: counts of processed objects and new/changed/unchanged result rows and of changed rows whose software was removed, see `write`
+        """
+        if since is not None:
+            self.queryset = self.queryset.filter(pk__in=self.get_changed_pks(since))
+
+        with self.timed("load"):
+            rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        counts = {"processed": 0, "new": 0, "changed": 0, "unchanged": 0, "software_removed": 0}
+        if checkpoint is not None:
+            counts.update(checkpoint.counts)
+        queryset = self.queryset
+        try:
+            for last_pk, chunk in self.iter_chunks(queryset, after=checkpoint.cursor if checkpoint else None):
+                self.queryset = chunk
+                with self.timed("load"):
+                    loaded = self.load()
+                with self.timed("compute"):
+                    outcomes = self.compute(rule_index, loaded)
+                with self.timed("write"), transaction.atomic():
+                    for key, value in self.write(outcomes).items():
+                        counts[key] += value
+                    counts["processed"] += len(outcomes)
+                    if checkpoint is not None and not ValidationCheckpoint.objects.filter(
+                        pk=checkpoint.pk, run_id=checkpoint.run_id
+                    ).update(cursor=last_pk, counts=counts, last_updated=timezone.now()):
+                        checkpoint = None
+        finally:
+            self.queryset = queryset
+
+        if checkpoint is not None:
+            ValidationCheckpoint.objects.filter(pk=checkpoint.pk, run_id=checkpoint.run_id).delete()
+
+        return counts
+
+    def project(self, dates):  # pylint: disable=too-many-locals
+        """Compute compliance of the objects on each of the given dates in a single pass.
+
+        Software assignments and ValidatedSoftwareLCM matches are computed once per object, validity on all the
+        dates is then resolved from a `ValidityWindowIndex`. Nothing is written back.
+
+        Args:
+            dates (iterable): dates to evaluate compliance on
+
+        Returns:
+            dict: group => group name => list of report dicts with total/valid/invalid/no_software counts, one per
+                date in ascending order; the `total` group holds a single group named ""
+        """
+        dates = sorted(set(dates))
+        rule_index = ValidatedSoftwareRuleIndex(ValidatedSoftwareLCM.objects.all())
+        window_index = ValidityWindowIndex(rule_index.rules.values(), dates)
+        group_lookups = list(self.projection_groups.values())
+        # group => group name => [objects, objects without software, valid counts delta per date index]
+        projection = defaultdict(lambda: defaultdict(lambda: [0, 0, [0] * (len(dates) + 1)]))
+
+        queryset = self.queryset
+        try:
+            for _, chunk in self.iter_chunks(queryset):
+                self.queryset = chunk
+                item_tags = self.get_item_tags()
+                item_software = self.get_item_software()
+                item_groups = {pk: names for pk, *names in chunk.order_by().values_list("pk", *group_lookups)}
+                for item_pk, attrs in self.get_items():
+                    software_id = item_software.get(item_pk)
+                    valid_ranges = []
+                    if software_id:
+                        matched = self.match_rules(rule_index, item_pk, attrs, item_tags.get(item_pk, set()))
+                        valid_ranges = window_index.valid_ranges(
+                            rule_id for rule_id in matched if rule_index.rules[rule_id].software_id == software_id
+                        )
+                    groups = [(choices.ComplianceSnapshotGroupChoices.TOTAL, "")]
+                    groups.extend(zip(self.projection_groups, (name or "" for name in item_groups[item_pk])))
+                    for group_by, group_name in groups:
+                        counts = projection[group_by][group_name]
+                        counts[0] += 1
+                        counts[1] += not software_id
+                        for lower, upper in valid_ranges:
+                            counts[2][lower] += 1
+                            counts[2][upper] -= 1
+        finally:
+            self.queryset = queryset
+
+        return {
+            group_by: {
+                group_name: self._projection_counts(dates, *counts) for group_name, counts in sorted(groups.items())
+            }
+            for group_by, groups in projection.items()
+        }
+
+    @staticmethod
+    def _projection_counts(dates, total, no_software, valid_deltas):
+        """Return report dicts of a projection group, one per date."""
+        counts = []
+        valid = 0
+        for on_date, delta in zip(dates, valid_deltas):
+            valid += delta
+            counts.append(
+                {
+                    "date": on_date,
+                    "total": total,
+                    "valid": valid,
+                    "invalid": total - valid - no_software,
+                    "no_software": no_software,
+                    "valid_percent": round(valid / total * 100, 2) if total else 0,
+                }
+            )
+
+        return counts
+
+    def create_compliance_snapshot(self, snapshot_time=None):
+        """Record counts of valid, invalid and no software results, in total and per group.
+
+        Snapshots older than `compliance_snapshot_retention_days` are deleted.
+
+        Returns:
+            list: created ValidationComplianceSnapshot objects
+        """
+        snapshot_time = snapshot_time or timezone.now()
+        counts = {
+            "total": Count("id"),
+            "valid": Count("id", filter=Q(is_validated=True)),
+            "invalid": Count("id", filter=Q(is_validated=False) & ~Q(software=None)),
+            "no_software": Count("id", filter=Q(software=None)),
+        }
+        results = self.result_model.objects.order_by()
+        snapshot_attrs = {
+            "snapshot_time": snapshot_time,
+            "object_type": self.result_obj_field,
+            "run_type": self.run_type,
+        }
+
+        snapshots = [
+            ValidationComplianceSnapshot(
+                group_by=choices.ComplianceSnapshotGroupChoices.TOTAL, **snapshot_attrs, **results.aggregate(**counts)
+            )
+        ]
+        for group_by, (id_lookup, name_lookup) in self.snapshot_groups.items():
+            for row in results.values(snapshot_group_id=F(id_lookup), snapshot_group_name=F(name_lookup)).annotate(
+                **counts
+            ):
+                snapshots.append(
+                    ValidationComplianceSnapshot(
+                        group_by=group_by,
+                        group_id=row.pop("snapshot_group_id"),
+                        group_name=row.pop("snapshot_group_name") or "",
+                        **snapshot_attrs,
+                        **row,
+                    )
+                )
+
+        retention_days = PLUGIN_CFG.get("compliance_snapshot_retention_days", 90)
+        with transaction.atomic():
+            ValidationComplianceSnapshot.objects.bulk_create(snapshots, batch_size=self.batch_size)
+            if retention_days:
+                ValidationComplianceSnapshot.objects.filter(
+                    object_type=self.result_obj_field, snapshot_time__lt=snapshot_time - timedelta(days=retention_days)
+                ).delete()
+
+        return snapshots
+
+
+class DeviceSoftwareValidationEngine(ItemSoftwareValidationEngine):
+    """Computes software validation results for Device objects."""
+
+    soft_obj_model = Device
+    soft_relation_name = "device_soft"
+    result_model = DeviceSoftwareValidationResult
+    result_obj_field = "device"
+    result_related_name = "device_software_validation"
+    snapshot_groups = {
+        choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE: ("device__device_type", "device__device_type__model"),
+        choices.ComplianceSnapshotGroupChoices.PLATFORM: ("device__platform", "device__platform__name"),
+        choices.ComplianceSnapshotGroupChoices.LOCATION: ("device__location", "device__location__name"),
+        choices.ComplianceSnapshotGroupChoices.MANUFACTURER: (
+            "device__device_type__manufacturer",
+            "device__device_type__manufacturer__name",
+        ),
+    }
+    projection_groups = {
+        choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE: "device_type__model",
+        choices.ComplianceSnapshotGroupChoices.PLATFORM: "platform__name",
+    }
+
+    def get_items(self):
+        """Return list of `(pk, (device_type pk, role pk))` tuples for the devices to validate."""
+        return [
+            (pk, (device_type_id, role_id))
+            for pk, device_type_id, role_id in self.queryset.order_by().values_list("id", "device_type_id", "role_id")
+        ]
+
+    def match_rules(self, rule_index, item_pk, attrs, tags):
+        """Return ValidatedSoftwareLCM pks matching the same criteria as `DeviceValidatedSoftwareFilter`."""
+        device_type_id, role_id = attrs
+        return rule_index.device_rule_ids(item_pk, device_type_id, role_id, tags)
+
+    def get_rule_q(self, rule):
+        """Return Q object selecting devices matched by the ValidatedSoftwareLCM, see `DeviceValidatedSoftwareFilter`."""
+        device_type_ids = list(rule.device_types.values_list("pk", flat=True))
+        role_ids = list(rule.device_roles.values_list("pk", flat=True))
+        rule_q = Q(pk__in=rule.devices.values("pk")) | Q(tags__in=rule.object_tags.values("pk"))
+        if device_type_ids and role_ids:
+            rule_q |= Q(device_type__in=device_type_ids, role__in=role_ids)
+        elif device_type_ids:
+            rule_q |= Q(device_type__in=device_type_ids)
+        elif role_ids:
+            rule_q |= Q(role__in=role_ids)
+
+        return rule_q
+
+
+class InventoryItemSoftwareValidationEngine(ItemSoftwareValidationEngine):
+    """Computes software validation results for InventoryItem objects."""
+
+    soft_obj_model = InventoryItem
+    soft_relation_name = "inventory_item_soft"
+    result_model = InventoryItemSoftwareValidationResult
+    result_obj_field = "inventory_item"
+    result_related_name = "inventoryitem_software_validation"
+    snapshot_groups = {
+        choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE: (
+            "inventory_item__device__device_type",
+            "inventory_item__device__device_type__model",
+        ),
+        choices.ComplianceSnapshotGroupChoices.PLATFORM: (
+            "inventory_item__device__platform",
+            "inventory_item__device__platform__name",
+        ),
+        choices.ComplianceSnapshotGroupChoices.LOCATION: (
+            "inventory_item__device__location",
+            "inventory_item__device__location__name",
+        ),
+        choices.ComplianceSnapshotGroupChoices.MANUFACTURER: (
+            "inventory_item__manufacturer",
+            "inventory_item__manufacturer__name",
+        ),
+    }
+    projection_groups = {
+        choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE: "device__device_type__model",
+        choices.ComplianceSnapshotGroupChoices.PLATFORM: "device__platform__name",
+    }
+
+    def get_items(self):
+        """Return list of `(pk, None)` tuples for the inventory items to validate."""
+        return [(pk, None) for pk in self.queryset.order_by().values_list("id", flat=True)]
+
+    def match_rules(self, rule_index, item_pk, attrs, tags):
+        """Return ValidatedSoftwareLCM pks matching the same criteria as `InventoryItemValidatedSoftwareFilter`."""
+        return rule_index.inventory_item_rule_ids(item_pk, tags)
+
+    def get_rule_q(self, rule):
+        """Return Q object selecting inventory items matched by the ValidatedSoftwareLCM."""
+        return Q(pk__in=rule.inventory_items.values("pk")) | Q(tags__in=rule.object_tags.values("pk"))
+
+
+VALIDATION_ENGINES = {
+    engine.result_obj_field: engine
+    for engine in (DeviceSoftwareValidationEngine, InventoryItemSoftwareValidationEngine)
+}
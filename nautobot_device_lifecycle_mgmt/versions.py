@@ -0,0 +1,148 @@
+"""Vendor-aware parsing of software versions into sortable keys."""
+
+import re
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+SORT_KEY_MAX_LENGTH = 255
+NUMBER_WIDTH = 10
+
+
+class VersionParser:
+    """Split versions into numeric and alphabetic components and encode these into sortable keys.
+
+    Numbers are compared numerically, letters alphabetically and case-insensitively, a version sorts before the
+    versions it is a prefix of (`18.4R2` < `18.4R2-S1`). Subclasses describe the formats of a network OS.
+    """
+
+    # Versions the parser understands, other versions are parsed as generic versions
+    pattern = None
+    # Parts of the version not relevant for ordering, removed before splitting
+    ignore_pattern = None
+    component_pattern = re.compile(r"\d+|[a-z]+")
+
+    def matches(self, version):
+        """Return True if version has a format the parser understands."""
+        return self.pattern is None or bool(self.pattern.match(version))
+
+    def parse(self, version):
+        """Return the components of version.
+
+        Returns:
+            tuple: int for numeric components, lowercase str for alphabetic components
+        """
+        version = version.strip()
+        if self.ignore_pattern is not None and self.matches(version):
+            version = self.ignore_pattern.sub("", version)
+
+        return tuple(
+            int(component) if component.isdigit() else component
+            for component in self.component_pattern.findall(version.lower())
+        )
+
+    def sort_key(self, version):
+        """Return a string ordering like version when compared as a string.
+
+        Numbers are zero padded and keys hold only digits and lowercase letters, so that they order the same in
+        Python and in database collations.
+        """
+        key = "".join(
+            f"{component:0{NUMBER_WIDTH}d}" if isinstance(component, int) else component
+            for component in self.parse(version)
+        )
+
+        return key[:SORT_KEY_MAX_LENGTH]
+
+
+class CiscoIOSVersionParser(VersionParser):
+    """Cisco IOS versions such as `15.2(4)M7` or `12.2(55)SE12`: release, rebuild in parentheses and train."""
+
+    pattern = re.compile(r"^\d+\.\d+\(\d+[a-z]?\)[A-Z]*\d*[a-z]?$")
+
+
+class CiscoIOSXEVersionParser(VersionParser):
+    """Cisco IOS-XE versions such as `17.3.4a`, `16.09.04` or `03.16.05.S`, release code names are ignored."""
+
+    pattern = re.compile(r"^([A-Za-z]+-)?\d+\.\d+\.\d+")
+    ignore_pattern = re.compile(r"^[A-Za-z]+-")
+
+
+class CiscoNXOSVersionParser(VersionParser):
+    """Cisco NX-OS versions such as `9.3(8)` or `7.0(3)I7(9)`."""
+
+    pattern = re.compile(r"^\d+\.\d+\(\d+[a-z]?\)([A-Z]+\d+\(\d+[a-z]?\))?$")
+
+
+class JuniperJunosVersionParser(VersionParser):
+    """Juniper Junos versions such as `18.4R3-S2` or `15.1X49-D200.3`."""
+
+    pattern = re.compile(r"^\d+\.\d+[A-Z]\d+")
+
+
+class AristaEOSVersionParser(VersionParser):
+    """Arista EOS versions such as `4.22.9M`, the release type suffix (`F`, `M`, `INT`) is ignored."""
+
+    pattern = re.compile(r"^\d+\.\d+\.\d+(\.\d+)*[A-Z]*$")
+    ignore_pattern = re.compile(r"[A-Z]+$")
+
+
+# Platform network driver or name => version parser, extended by the `version_parsers` setting
+VERSION_PARSERS = {
+    "cisco_ios": CiscoIOSVersionParser(),
+    "cisco_xe": CiscoIOSXEVersionParser(),
+    "cisco_nxos": CiscoNXOSVersionParser(),
+    "juniper_junos": JuniperJunosVersionParser(),
+    "arista_eos": AristaEOSVersionParser(),
+}
+DEFAULT_VERSION_PARSER = VersionParser()
+
+
+def get_version_parser(network_driver=None, platform_name=None):
+    """Return the version parser of the platform, looked up by network driver first and then by name.
+
+    Parsers configured with the `version_parsers` setting, a mapping of platform network driver or name to the
+    dotted path of a `VersionParser` subclass, take precedence over the built-in parsers.
+    """
+    for platform in (network_driver, platform_name):
+        if not platform:
+            continue
+        if platform in PLUGIN_CFG.get("version_parsers", {}):
+            return import_string(PLUGIN_CFG["version_parsers"][platform])()
+        if platform in VERSION_PARSERS:
+            return VERSION_PARSERS[platform]
+
+    return DEFAULT_VERSION_PARSER
+
+
+def get_version_sort_key(platform, version):
+    """Return the sort key of version on platform, as stored in `SoftwareLCM.version_sort_key`."""
+    return get_version_parser(platform.network_driver, platform.name).sort_key(version)
+
+
+def version_range_q(platform, start=None, end=None, start_inclusive=True, end_inclusive=True):
+    """Return Q matching SoftwareLCM of platform with versions in the range, None meaning unbounded.
+
+    Args:
+        platform (Platform): platform of the software, its version parser builds the sort keys of the bounds
+        start (str): lower version bound
+        end (str): upper version bound
+        start_inclusive (bool): versions equal to start match
+        end_inclusive (bool): versions equal to end match
+    """
+    if start is None and end is None:
+        return Q(pk__isnull=False)
+
+    parser = get_version_parser(platform.network_driver, platform.name)
+    version_q = Q()
+    if start is not None:
+        lookup = "gte" if start_inclusive else "gt"
+        version_q &= Q(**{f"version_sort_key__{lookup}": parser.sort_key(start)})
+    if end is not None:
+        lookup = "lte" if end_inclusive else "lt"
+        version_q &= Q(**{f"version_sort_key__{lookup}": parser.sort_key(end)})
+
+    return version_q
@@ -4,11 +4,15 @@ import base64
 import io
 import logging
 import urllib
+from collections import defaultdict
+from datetime import date, timedelta
 
 import matplotlib.pyplot as plt
 import numpy as np
 from django.conf import settings
 from django.db.models import Count, ExpressionWrapper, F, FloatField, Q
+from django.shortcuts import render
+from django.utils.dateparse import parse_date
 from django_tables2 import RequestConfig
 from matplotlib.ticker import MaxNLocator
 from nautobot.apps.views import NautobotUIViewSet
@@ -20,7 +24,9 @@ from nautobot.dcim.models import Device
 
 from nautobot_device_lifecycle_mgmt import choices, filters, forms, models, tables
 from nautobot_device_lifecycle_mgmt.api import serializers
+from nautobot_device_lifecycle_mgmt.tasks import get_compliance_projection
 from nautobot_device_lifecycle_mgmt.utils import count_related_m2m
+from nautobot_device_lifecycle_mgmt.validation import VALIDATION_ENGINES
 
 PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
 
@@ -343,6 +349,86 @@ class ReportOverviewHelper(ContentTypePermissionRequiredMixin, generic.View):
 
         return ReportOverviewHelper.url_encode_figure(fig)
 
+    @staticmethod
+    def plot_linechart_visual(times, valid_percents, chart_attrs):
+        """Plot compliance percentage over time."""
+        if not times:
+            return None
+
+        fig, axis = plt.subplots(figsize=(PLUGIN_CFG["barchart_width"], PLUGIN_CFG["barchart_height"]))
+        axis.plot(times, valid_percents, marker="o", color=chart_attrs["color"])
+        axis.set_ylabel("Compliance (%)")
+        axis.set_ylim(0, 105)
+        axis.set_title(chart_attrs["title"])
+        fig.autofmt_xdate()
+        fig.tight_layout()
+
+        return ReportOverviewHelper.url_encode_figure(fig)
+
+    @staticmethod
+    def get_latest_snapshot(object_type, last_run=None):
+        """Return the most recent compliance snapshot rows of the given object type, grouped by `group_by`.
+
+        Args:
+            object_type (str): type of the validated objects
+            last_run (datetime): time of the last validation run, snapshots recorded before it are stale and ignored
+        """
+        snapshot_time = (
+            models.ValidationComplianceSnapshot.objects.filter(object_type=object_type)
+            .order_by("-snapshot_time")
+            .values_list("snapshot_time", flat=True)
+            .first()
+        )
+        snapshot = defaultdict(list)
+        if snapshot_time is not None and (last_run is None or snapshot_time >= last_run):
+            for row in models.ValidationComplianceSnapshot.objects.filter(
+                object_type=object_type, snapshot_time=snapshot_time
+            ).order_by("-total"):
+                snapshot[row.group_by].append(row)
+
+        return snapshot
+
+    @staticmethod
+    def snapshot_aggr(row, name=None):
+        """Return report dict built from a snapshot row."""
+        aggr = {"total": row.total, "valid": row.valid, "invalid": row.invalid, "no_software": row.no_software}
+        if name is not None:
+            aggr["name"] = name
+
+        return ReportOverviewHelper.calculate_aggr_percentage(aggr)
+
+    @staticmethod
+    def count_annotations(field, valid_q=None):
+        """Return total, valid, invalid and no software counts of field.
+
+        Args:
+            field (str): field to count
+            valid_q (Q): matches valid results, results are valid as recorded by the last run when None
+        """
+        if valid_q is None:
+            valid_q, invalid_q = Q(is_validated=True), Q(is_validated=False)
+        else:
+            invalid_q = ~valid_q
+        return {
+            "total": Count(field),
+            "valid": Count(field, filter=valid_q),
+            "invalid": Count(field, filter=invalid_q & ~Q(software=None)),
+            "no_software": Count(field, filter=Q(software=None)),
+        }
+
+    @staticmethod
+    def parse_date_param(request, name):
+        """Return date of the query parameter, None if not given or invalid."""
+        try:
+            return parse_date(request.GET.get(name) or "")
+        except ValueError:
+            return None
+
+    @staticmethod
+    def is_filtered(request, filterset):
+        """Return True when the request applies any filter of the filterset."""
+        return any(key in filterset.get_filters() for key in request.GET)
+
     @staticmethod
     def calculate_aggr_percentage(aggr):
         """Calculate percentage of validated given aggregation fields.
@@ -369,45 +455,61 @@ class ValidatedSoftwareDeviceReportView(generic.ObjectListView):
         models.DeviceSoftwareValidationResult.objects.values("device__device_type__model", "device__device_type__pk")
         .distinct()
         .annotate(
-            total=Count("device__device_type__model"),
-            valid=Count("device__device_type__model", filter=Q(is_validated=True)),
-            invalid=Count("device__device_type__model", filter=Q(is_validated=False) & ~Q(software=None)),
-            no_software=Count("device__device_type__model", filter=Q(software=None)),
+            **ReportOverviewHelper.count_annotations("device__device_type__model"),
             valid_percent=ExpressionWrapper(100 * F("valid") / (F("total")), output_field=FloatField()),
         )
         .order_by("-valid_percent")
     )
     action_buttons = ("export",)
+    # valid_on changes how results are counted instead of filtering them
+    non_filter_params = (*generic.ObjectListView.non_filter_params, "valid_on")
     # extra content dict to be returned by self.extra_context() method
     extra_content = {}
+    # time of the compliance snapshot the unfiltered report is read from, None when computed from the results
+    snapshot_time = None
 
     def setup(self, request, *args, **kwargs):
         """Using request object to perform filtering based on query params."""
         super().setup(request, *args, **kwargs)
-        try:
-            report_last_run = (
-                models.DeviceSoftwareValidationResult.objects.filter(
-                    run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN
-                )
-                .latest("last_updated")
-                .last_run
+        # Unchanged results only get their last_run bumped, last_updated doesn't reflect the last run
+        engine = VALIDATION_ENGINES["device"]()
+        report_last_run = engine.get_last_run()
+
+        valid_on = ReportOverviewHelper.parse_date_param(request, "valid_on")
+        valid_q = None
+        if valid_on is not None:
+            valid_q = models.DeviceSoftwareValidationResult.objects.valid_on_q(valid_on)
+            self.queryset = self.queryset.annotate(
+                **ReportOverviewHelper.count_annotations("device__device_type__model", valid_q),
+                valid_percent=ExpressionWrapper(100 * F("valid") / (F("total")), output_field=FloatField()),
             )
-        except models.DeviceSoftwareValidationResult.DoesNotExist:  # pylint: disable=no-member
-            report_last_run = None
 
-        device_aggr = self.get_global_aggr(request)
-        _platform_qs = (
-            models.DeviceSoftwareValidationResult.objects.values("device__platform__name")
-            .distinct()
-            .annotate(
-                total=Count("device__platform__name"),
-                valid=Count("device__platform__name", filter=Q(is_validated=True)),
-                invalid=Count("device__platform__name", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("device__platform__name", filter=Q(software=None)),
+        # Unfiltered summaries are read from the compliance snapshot recorded by the last job run
+        snapshot = {}
+        if valid_on is None and not ReportOverviewHelper.is_filtered(request, self.filterset):
+            # Snapshots recorded before event-driven revalidations are stale
+            snapshot = ReportOverviewHelper.get_latest_snapshot(
+                choices.ComplianceSnapshotObjectTypeChoices.DEVICE, engine.get_last_run(run_types=None)
             )
-            .order_by("-total")
-        )
-        platform_qs = self.filterset(request.GET, _platform_qs).qs
+        self.snapshot_time = None
+        if snapshot.get(choices.ComplianceSnapshotGroupChoices.TOTAL):
+            self.snapshot_time = snapshot[choices.ComplianceSnapshotGroupChoices.TOTAL][0].snapshot_time
+            device_aggr = ReportOverviewHelper.snapshot_aggr(
+                snapshot[choices.ComplianceSnapshotGroupChoices.TOTAL][0], "Devices"
+            )
+            platform_qs = [
+                {"device__platform__name": row.group_name or None, **ReportOverviewHelper.snapshot_aggr(row)}
+                for row in snapshot[choices.ComplianceSnapshotGroupChoices.PLATFORM]
+            ]
+        else:
+            device_aggr = self.get_global_aggr(request, valid_q)
+            _platform_qs = (
+                models.DeviceSoftwareValidationResult.objects.values("device__platform__name")
+                .distinct()
+                .annotate(**ReportOverviewHelper.count_annotations("device__platform__name", valid_q))
+                .order_by("-total")
+            )
+            platform_qs = self.filterset(self.get_filter_params(request), _platform_qs).qs
         pie_chart_attrs = {
             "aggr_labels": ["valid", "invalid", "no_software"],
             "chart_labels": ["Valid", "Invalid", "No Software"],
@@ -427,9 +529,30 @@ class ValidatedSoftwareDeviceReportView(generic.ObjectListView):
             "device_aggr": device_aggr,
             "device_visual": ReportOverviewHelper.plot_piechart_visual(device_aggr, pie_chart_attrs),
             "report_last_run": report_last_run,
+            "valid_on": valid_on,
         }
 
-    def get_global_aggr(self, request):
+    def alter_queryset(self, request):
+        """Read the per device type rows of the unfiltered report from the compliance snapshot."""
+        if self.snapshot_time is None:
+            return super().alter_queryset(request)
+
+        return (
+            models.ValidationComplianceSnapshot.objects.filter(
+                object_type=choices.ComplianceSnapshotObjectTypeChoices.DEVICE,
+                group_by=choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE,
+                snapshot_time=self.snapshot_time,
+            )
+            .values("total", "valid", "invalid", "no_software")
+            .annotate(
+                device__device_type__model=F("group_name"),
+                device__device_type__pk=F("group_id"),
+                valid_percent=ExpressionWrapper(100 * F("valid") / (F("total")), output_field=FloatField()),
+            )
+            .order_by("-valid_percent")
+        )
+
+    def get_global_aggr(self, request, valid_q=None):
         """Get device and inventory global reports.
 
         Returns:
@@ -439,11 +562,8 @@ class ValidatedSoftwareDeviceReportView(generic.ObjectListView):
 
         device_aggr = {}
         if self.filterset is not None:
-            device_aggr = self.filterset(request.GET, device_qs).qs.aggregate(
-                total=Count("device"),
-                valid=Count("device", filter=Q(is_validated=True)),
-                invalid=Count("device", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("device", filter=Q(software=None)),
+            device_aggr = self.filterset(self.get_filter_params(request), device_qs).qs.aggregate(
+                **ReportOverviewHelper.count_annotations("device", valid_q)
             )
 
             device_aggr["name"] = "Devices"
@@ -503,6 +623,16 @@ class DeviceSoftwareValidationResultListView(generic.ObjectListView):
     template_name = "nautobot_device_lifecycle_mgmt/devicesoftwarevalidationresult_list.html"
 
 
+class VulnerabilityExposureListView(generic.ObjectListView):
+    """VulnerabilityExposure List view."""
+
+    queryset = models.VulnerabilityExposure.objects.select_related("device", "inventory_item")
+    filterset = filters.VulnerabilityExposureFilterSet
+    filterset_form = forms.VulnerabilityExposureFilterForm
+    table = tables.VulnerabilityExposureTable
+    action_buttons = ("export",)
+
+
 class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
     """View for executive report on inventory item software validation."""
 
@@ -520,45 +650,60 @@ class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
         )
         .distinct()
         .annotate(
-            total=Count("inventory_item__part_id"),
-            valid=Count("inventory_item__part_id", filter=Q(is_validated=True)),
-            invalid=Count("inventory_item__part_id", filter=Q(is_validated=False) & ~Q(software=None)),
-            no_software=Count("inventory_item__part_id", filter=Q(software=None)),
+            **ReportOverviewHelper.count_annotations("inventory_item__part_id"),
             valid_percent=ExpressionWrapper(100 * F("valid") / (F("total")), output_field=FloatField()),
         )
         .order_by("-valid_percent")
     )
     action_buttons = ("export",)
+    # valid_on changes how results are counted instead of filtering them
+    non_filter_params = (*generic.ObjectListView.non_filter_params, "valid_on")
     # extra content dict to be returned by self.extra_context() method
     extra_content = {}
 
     def setup(self, request, *args, **kwargs):
         """Using request object to perform filtering based on query params."""
         super().setup(request, *args, **kwargs)
-        try:
-            report_last_run = (
-                models.InventoryItemSoftwareValidationResult.objects.filter(
-                    run_type=choices.ReportRunTypeChoices.REPORT_FULL_RUN
-                )
-                .latest("last_updated")
-                .last_run
+        # Unchanged results only get their last_run bumped, last_updated doesn't reflect the last run
+        engine = VALIDATION_ENGINES["inventory_item"]()
+        report_last_run = engine.get_last_run()
+
+        valid_on = ReportOverviewHelper.parse_date_param(request, "valid_on")
+        valid_q = None
+        if valid_on is not None:
+            valid_q = models.InventoryItemSoftwareValidationResult.objects.valid_on_q(valid_on)
+            self.queryset = self.queryset.annotate(
+                **ReportOverviewHelper.count_annotations("inventory_item__part_id", valid_q),
+                valid_percent=ExpressionWrapper(100 * F("valid") / (F("total")), output_field=FloatField()),
             )
-        except models.InventoryItemSoftwareValidationResult.DoesNotExist:  # pylint: disable=no-member
-            report_last_run = None
 
-        inventory_aggr = self.get_global_aggr(request)
-        _platform_qs = (
-            models.InventoryItemSoftwareValidationResult.objects.values("inventory_item__manufacturer__name")
-            .distinct()
-            .annotate(
-                total=Count("inventory_item__manufacturer__name"),
-                valid=Count("inventory_item__manufacturer__name", filter=Q(is_validated=True)),
-                invalid=Count("inventory_item__manufacturer__name", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("inventory_item__manufacturer__name", filter=Q(software=None)),
+        # Unfiltered summaries are read from the compliance snapshot recorded by the last job run
+        snapshot = {}
+        if valid_on is None and not ReportOverviewHelper.is_filtered(request, self.filterset):
+            # Snapshots recorded before event-driven revalidations are stale
+            snapshot = ReportOverviewHelper.get_latest_snapshot(
+                choices.ComplianceSnapshotObjectTypeChoices.INVENTORY_ITEM, engine.get_last_run(run_types=None)
             )
-            .order_by("-total")
-        )
-        platform_qs = self.filterset(request.GET, _platform_qs).qs
+        if snapshot.get(choices.ComplianceSnapshotGroupChoices.TOTAL):
+            inventory_aggr = ReportOverviewHelper.snapshot_aggr(
+                snapshot[choices.ComplianceSnapshotGroupChoices.TOTAL][0], "Inventory Items"
+            )
+            platform_qs = [
+                {
+                    "inventory_item__manufacturer__name": row.group_name or None,
+                    **ReportOverviewHelper.snapshot_aggr(row),
+                }
+                for row in snapshot[choices.ComplianceSnapshotGroupChoices.MANUFACTURER]
+            ]
+        else:
+            inventory_aggr = self.get_global_aggr(request, valid_q)
+            _platform_qs = (
+                models.InventoryItemSoftwareValidationResult.objects.values("inventory_item__manufacturer__name")
+                .distinct()
+                .annotate(**ReportOverviewHelper.count_annotations("inventory_item__manufacturer__name", valid_q))
+                .order_by("-total")
+            )
+            platform_qs = self.filterset(self.get_filter_params(request), _platform_qs).qs
 
         pie_chart_attrs = {
             "aggr_labels": ["valid", "invalid", "no_software"],
@@ -580,9 +725,10 @@ class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
             "inventory_aggr": inventory_aggr,
             "inventory_visual": ReportOverviewHelper.plot_piechart_visual(inventory_aggr, pie_chart_attrs),
             "report_last_run": report_last_run,
+            "valid_on": valid_on,
         }
 
-    def get_global_aggr(self, request):
+    def get_global_aggr(self, request, valid_q=None):
         """Get device and inventory global reports.
 
         Returns:
@@ -592,11 +738,8 @@ class ValidatedSoftwareInventoryItemReportView(generic.ObjectListView):
 
         inventory_aggr = {}
         if self.filterset is not None:
-            inventory_aggr = self.filterset(request.GET, inventory_item_qs).qs.aggregate(
-                total=Count("inventory_item"),
-                valid=Count("inventory_item", filter=Q(is_validated=True)),
-                invalid=Count("inventory_item", filter=Q(is_validated=False) & ~Q(software=None)),
-                no_software=Count("inventory_item", filter=Q(software=None)),
+            inventory_aggr = self.filterset(self.get_filter_params(request), inventory_item_qs).qs.aggregate(
+                **ReportOverviewHelper.count_annotations("inventory_item", valid_q)
             )
             inventory_aggr["name"] = "Inventory Items"
 
@@ -661,3 +804,116 @@ class InventoryItemSoftwareValidationResultListView(generic.ObjectListView):
     table = tables.InventoryItemSoftwareValidationResultListTable
     action_buttons = ("export",)
     template_name = "nautobot_device_lifecycle_mgmt/inventoryitemsoftwarevalidationresult_list.html"
+
+
+class ComplianceTrendView(ContentTypePermissionRequiredMixin, generic.View):
+    """Software compliance over time, read from the snapshots recorded by the validation jobs."""
+
+    template_name = "nautobot_device_lifecycle_mgmt/compliance_trend.html"
+
+    def get_required_permission(self):
+        """Permission to view compliance snapshots."""
+        return "nautobot_device_lifecycle_mgmt.view_validationcompliancesnapshot"
+
+    def get(self, request, *args, **kwargs):
+        """Render compliance trend of the selected object type and group."""
+        object_type = request.GET.get("object_type")
+        if object_type not in choices.ComplianceSnapshotObjectTypeChoices.values():
+            object_type = choices.ComplianceSnapshotObjectTypeChoices.DEVICE
+        group_by = request.GET.get("group_by")
+        if group_by not in choices.ComplianceSnapshotGroupChoices.values():
+            group_by = choices.ComplianceSnapshotGroupChoices.TOTAL
+        group_name = request.GET.get("group_name", "")
+
+        snapshots = models.ValidationComplianceSnapshot.objects.filter(object_type=object_type, group_by=group_by)
+        group_names = []
+        if group_by != choices.ComplianceSnapshotGroupChoices.TOTAL:
+            group_names = sorted(set(snapshots.exclude(group_name="").values_list("group_name", flat=True)))
+            if group_name not in group_names:
+                group_name = group_names[0] if group_names else ""
+            snapshots = snapshots.filter(group_name=group_name)
+        snapshots = list(snapshots.order_by("snapshot_time"))
+
+        title = choices.ComplianceSnapshotObjectTypeChoices.as_dict()[object_type]
+        if group_name:
+            title = f"{title} - {group_name}"
+        return render(
+            request,
+            self.template_name,
+            {
+                "object_type": object_type,
+                "object_type_choices": choices.ComplianceSnapshotObjectTypeChoices.CHOICES,
+                "group_by": group_by,
+                "group_by_choices": choices.ComplianceSnapshotGroupChoices.CHOICES,
+                "group_name": group_name,
+                "group_names": group_names,
+                "snapshots": list(reversed(snapshots)),
+                "line_chart": ReportOverviewHelper.plot_linechart_visual(
+                    [snapshot.snapshot_time for snapshot in snapshots],
+                    [snapshot.valid_percent for snapshot in snapshots],
+                    {"title": f"{title} Software Compliance", "color": "#1F77B4"},
+                ),
+            },
+        )
+
+
+class ComplianceProjectionView(ContentTypePermissionRequiredMixin, generic.View):
+    """Software compliance projected on a series of dates from the current Validated Software windows."""
+
+    template_name = "nautobot_device_lifecycle_mgmt/compliance_projection.html"
+    group_by_choices = (
+        (choices.ComplianceSnapshotGroupChoices.TOTAL, "Total"),
+        (choices.ComplianceSnapshotGroupChoices.DEVICE_TYPE, "Device Type"),
+        (choices.ComplianceSnapshotGroupChoices.PLATFORM, "Platform"),
+    )
+    max_dates = 120
+
+    def get_required_permission(self):
+        """Permission to view Validated Software."""
+        return "nautobot_device_lifecycle_mgmt.view_validatedsoftwarelcm"
+
+    def get(self, request, *args, **kwargs):
+        """Render compliance projection of the selected object type, grouped by the selected group."""
+        object_type = request.GET.get("object_type")
+        if object_type not in choices.ComplianceSnapshotObjectTypeChoices.values():
+            object_type = choices.ComplianceSnapshotObjectTypeChoices.DEVICE
+        group_by = request.GET.get("group_by")
+        if group_by not in dict(self.group_by_choices):
+            group_by = choices.ComplianceSnapshotGroupChoices.TOTAL
+        start = ReportOverviewHelper.parse_date_param(request, "start") or date.today()
+        end = ReportOverviewHelper.parse_date_param(request, "end") or start + timedelta(days=365)
+        try:
+            interval = max(int(request.GET.get("interval", 30)), 1)
+        except ValueError:
+            interval = 30
+        dates = [
+            start + timedelta(days=offset) for offset in range(0, (end - start).days + 1, interval)[: self.max_dates]
+        ]
+
+        # Projections are computed by a background task, the page shows them once cached
+        projection = get_compliance_projection(object_type, dates) if dates else {}
+        computing = projection is None
+        projection = projection or {}
+        total = projection.get(choices.ComplianceSnapshotGroupChoices.TOTAL, {}).get("", [])
+        title = choices.ComplianceSnapshotObjectTypeChoices.as_dict()[object_type]
+        return render(
+            request,
+            self.template_name,
+            {
+                "object_type": object_type,
+                "object_type_choices": choices.ComplianceSnapshotObjectTypeChoices.CHOICES,
+                "group_by": group_by,
+                "group_by_choices": self.group_by_choices,
+                "start": start,
+                "end": end,
+                "interval": interval,
+                "dates": dates,
+                "computing": computing,
+                "rows": sorted(projection.get(group_by, {}).items()),
+                "line_chart": ReportOverviewHelper.plot_linechart_visual(
+                    [counts["date"] for counts in total],
+                    [counts["valid_percent"] for counts in total],
+                    {"title": f"{title} Projected Software Compliance", "color": "#1F77B4"},
+                ),
+            },
+        )
@@ -0,0 +1,411 @@
+"""Set-based generation of VulnerabilityLCM objects from CVE affected software and software assignments."""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count, F, Max, Min, Q
+from django.utils import timezone
+from nautobot.extras.models import RelationshipAssociation
+
+from nautobot_device_lifecycle_mgmt.instrumentation import PhaseTimerMixin
+from nautobot_device_lifecycle_mgmt.models import CVELCM, VulnerabilityExposure, VulnerabilityLCM
+
+PLUGIN_CFG = settings.PLUGINS_CONFIG["nautobot_device_lifecycle_mgmt"]
+
+
+class VulnerabilityGenerationEngine(PhaseTimerMixin):
+    """Generate missing VulnerabilityLCM objects for many CVEs at once.
+
+    A vulnerability exists for every CVE, software affected by the CVE and Device or InventoryItem the software
+    is assigned to. CVEs are walked in chunks, for each chunk the CVE to software and software to object
+    assignments are loaded with one query each and joined in memory. Keys of existing vulnerabilities are loaded
+    with one more query and only missing vulnerabilities are inserted with bulk operations. Existing
+    vulnerabilities no longer exposed can be resolved in the same pass.
+
+    Devices and InventoryItems whose vulnerabilities were created or resolved are collected in `changed`, their
+    VulnerabilityExposure rollups are refreshed by `refresh_changed`. Time spent loading assignments, computing
+    stale vulnerabilities and writing vulnerabilities and rollups is accumulated into `phase_seconds`.
+    """
+
+    # VulnerabilityLCM field => key of the Relationship assigning software to the objects
+    targets = {
+        "device": "device_soft",
+        "inventory_item": "inventory_item_soft",
+    }
+    batch_size = 1000
+    chunk_size = 1000
+
+    def __init__(self, cves=None, closed_statuses=None):
+        """Initialize VulnerabilityGenerationEngine.
+
+        Args:
+            cves (QuerySet): CVEs to generate vulnerabilities for, all CVEs when None
+            closed_statuses (iterable): names of the statuses of vulnerabilities left out of the exposure rollups,
+                the `vulnerability_closed_statuses` setting when None
+        """
+        self.cves = cves if cves is not None else CVELCM.objects.all()
+        if closed_statuses is None:
+            closed_statuses = PLUGIN_CFG.get("vulnerability_closed_statuses", [])
+        self.closed_statuses = set(closed_statuses)
+        self.changed = {field_name: set() for field_name in self.targets}
+        self.phase_seconds = defaultdict(float)
+
+    def iter_chunks(self):
+        """Yield lists of at most `chunk_size` CVE pks, walking the CVEs in pk order."""
+        last_pk = None
+        while True:
+            chunk_queryset = self.cves.order_by("pk")
+            if last_pk is not None:
+                chunk_queryset = chunk_queryset.filter(pk__gt=last_pk)
+            chunk_pks = list(chunk_queryset.values_list("pk", flat=True)[: self.chunk_size])
+            if not chunk_pks:
+                return
+            last_pk = chunk_pks[-1]
+            yield chunk_pks
+
+    def _join_assignments(self, software_cves, field_name, associations):
+        """Return keys of the vulnerabilities exposed by CVEs of software and software assignments to objects.
+
+        Args:
+            software_cves (dict): software pk => pks of the CVEs affecting the software
+            field_name (str): VulnerabilityLCM field of the objects, key of `targets`
+            associations (iterable): `(software_id, obj_id)` software assignments
+
+        Returns:
+            set: `(cve_id, software_id, device_id, inventory_item_id)` tuples, one of the last two being None
+        """
+        keys = set()
+        for software_id, obj_id in associations:
+            for cve_id in software_cves.get(software_id, ()):
+                if field_name == "device":
+                    keys.add((cve_id, software_id, obj_id, None))
+                else:
+                    keys.add((cve_id, software_id, None, obj_id))
+
+        return keys
+
+    def get_exposure_keys(self, cve_ids):
+        """Return keys of the vulnerabilities the CVEs expose, in the format of `_join_assignments`.
+
+        Args:
+            cve_ids (list): pks of the CVEs
+        """
+        through = CVELCM.affected_softwares.through
+        software_cves = defaultdict(list)
+        for cve_id, software_id in through.objects.filter(cvelcm_id__in=cve_ids).values_list(
+            "cvelcm_id", "softwarelcm_id"
+        ):
+            software_cves[software_id].append(cve_id)
+        if not software_cves:
+            return set()
+
+        keys = set()
+        for field_name, relationship_key in self.targets.items():
+            associations = RelationshipAssociation.objects.filter(
+                relationship__key=relationship_key,
+                source_id__in=through.objects.filter(cvelcm_id__in=cve_ids).values("softwarelcm_id"),
+            ).values_list("source_id", "destination_id")
+            keys |= self._join_assignments(software_cves, field_name, associations.iterator())
+
+        return keys
+
+    def get_cve_software_exposure_keys(self, pairs):
+        """Return keys of the vulnerabilities exposed by CVE affected software, in the format of `_join_assignments`.
+
+        Args:
+            pairs (set): `(cve_id, software_id)` tuples, pairs no longer assigned are ignored
+        """
+        software_cves = defaultdict(list)
+        for cve_id, software_id in CVELCM.affected_softwares.through.objects.filter(
+            cvelcm_id__in={cve_id for cve_id, _ in pairs},
+            softwarelcm_id__in={software_id for _, software_id in pairs},
+        ).values_list("cvelcm_id", "softwarelcm_id"):
+            if (cve_id, software_id) in pairs:
+                software_cves[software_id].append(cve_id)
+        if not software_cves:
+            return set()
+
+        keys = set()
+        for field_name, relationship_key in self.targets.items():
+            associations = RelationshipAssociation.objects.filter(
+                relationship__key=relationship_key, source_id__in=list(software_cves)
+            ).values_list("source_id", "destination_id")
+            keys |= self._join_assignments(software_cves, field_name, associations.iterator())
+
+        return keys
+
+    def get_assignment_exposure_keys(self, field_name, pairs):
+        """Return keys of the vulnerabilities exposed by software assignments, in the format of `_join_assignments`.
+
+        Args:
+            field_name (str): VulnerabilityLCM field of the objects, key of `targets`
+            pairs (set): `(software_id, obj_id)` tuples, pairs no longer assigned are ignored
+        """
+        associations = [
+            association
+            for association in RelationshipAssociation.objects.filter(
+                relationship__key=self.targets[field_name],
+                source_id__in={software_id for software_id, _ in pairs},
+                destination_id__in={obj_id for _, obj_id in pairs},
+            ).values_list("source_id", "destination_id")
+            if association in pairs
+        ]
+        software_cves = defaultdict(list)
+        for cve_id, software_id in CVELCM.affected_softwares.through.objects.filter(
+            softwarelcm_id__in={software_id for software_id, _ in associations}
+        ).values_list("cvelcm_id", "softwarelcm_id"):
+            software_cves[software_id].append(cve_id)
+
+        return self._join_assignments(software_cves, field_name, associations)
+
+    def get_existing_keys(self, **filters):
+        """Return keys of the existing vulnerabilities matching filters, in the format of `_join_assignments`."""
+        return set(
+            VulnerabilityLCM.objects.filter(**filters).values_list(
+                "cve_id", "software_id", "device_id", "inventory_item_id"
+            )
+        )
+
+    def create_missing(self, keys, existing_keys):
+        """Create vulnerabilities of the keys not found in existing_keys.
+
+        Returns:
+            int: number of created vulnerabilities
+        """
+        missing_keys = [key for key in keys if key not in existing_keys]
+        self.add_changed(missing_keys)
+        VulnerabilityLCM.objects.bulk_create(
+            [
+                VulnerabilityLCM(
+                    cve_id=cve_id, software_id=software_id, device_id=device_id, inventory_item_id=inventory_item_id
+                )
+                for cve_id, software_id, device_id, inventory_item_id in missing_keys
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+        return len(missing_keys)
+
+    def add_changed(self, keys):
+        """Collect the Devices and InventoryItems of the vulnerability keys into `changed`."""
+        for _, _, device_id, inventory_item_id in keys:
+            if device_id is not None:
+                self.changed["device"].add(device_id)
+            if inventory_item_id is not None:
+                self.changed["inventory_item"].add(inventory_item_id)
+
+    def resolve_stale(self, vulnerability_ids, resolved_status=None):
+        """Set the vulnerabilities to resolved_status, or delete them when resolved_status is None.
+
+        Returns:
+            int: number of resolved or deleted vulnerabilities
+        """
+        resolved = 0
+        for offset in range(0, len(vulnerability_ids), self.batch_size):
+            queryset = VulnerabilityLCM.objects.filter(pk__in=vulnerability_ids[offset : offset + self.batch_size])
+            if resolved_status is None:
+                resolved += queryset.delete()[1].get(VulnerabilityLCM._meta.label, 0)
+            else:
+                resolved += queryset.exclude(status=resolved_status).update(status=resolved_status)
+
+        return resolved
+
+    def reopen(self, vulnerability_ids):
+        """Set the vulnerabilities back to the status new vulnerabilities are created with.
+
+        Returns:
+            int: number of reopened vulnerabilities
+        """
+        reopened = 0
+        for offset in range(0, len(vulnerability_ids), self.batch_size):
+            reopened += VulnerabilityLCM.objects.filter(
+                pk__in=vulnerability_ids[offset : offset + self.batch_size]
+            ).update(status=None)
+
+        return reopened
+
+    def process(self, cve_ids, reconcile=False, resolved_status=None):
+        """Create missing vulnerabilities of the CVEs and, when reconciling, resolve the ones no longer exposed.
+
+        Vulnerabilities are no longer exposed when the CVE no longer lists the software as affected or when the
+        software is no longer assigned to the Device or InventoryItem. When reconciling, vulnerabilities in
+        resolved_status exposed again, for example after a Device was downgraded back to the affected software,
+        are reopened.
+
+        Args:
+            cve_ids (list): pks of the CVEs
+            reconcile (bool): resolve vulnerabilities no longer exposed and reopen resolved ones exposed again
+            resolved_status (Status): status resolved vulnerabilities are set to, None to delete them
+
+        Returns:
+            dict: counts of created, skipped (already existing), resolved and reopened vulnerabilities
+        """
+        with self.timed("load"):
+            exposure_keys = self.get_exposure_keys(cve_ids)
+            existing = {}
+            existing_status_ids = {}
+            for vulnerability_id, status_id, *key in VulnerabilityLCM.objects.filter(cve_id__in=cve_ids).values_list(
+                "pk", "status_id", "cve_id", "software_id", "device_id", "inventory_item_id"
+            ):
+                existing[tuple(key)] = vulnerability_id
+                existing_status_ids[vulnerability_id] = status_id
+        with self.timed("compute"):
+            stale_ids = [vulnerability_id for key, vulnerability_id in existing.items() if key not in exposure_keys]
+            reopened_ids = []
+            if resolved_status is not None:
+                reopened_ids = [
+                    vulnerability_id
+                    for key, vulnerability_id in existing.items()
+                    if key in exposure_keys and existing_status_ids[vulnerability_id] == resolved_status.pk
+                ]
+        with self.timed("write"):
+            created = self.create_missing(exposure_keys, existing.keys())
+            counts = {"created": created, "skipped": len(exposure_keys) - created, "resolved": 0, "reopened": 0}
+            if reconcile:
+                # Refresh the rollups of all objects of the CVEs, picking up changed CVE severities and scores
+                self.add_changed(existing)
+                counts["resolved"] = self.resolve_stale(stale_ids, resolved_status)
+                counts["reopened"] = self.reopen(reopened_ids)
+
+        return counts
+
+    def generate_for_pairs(self, kind, pairs):
+        """Create missing vulnerabilities exposed by changed CVE affected software or software assignments.
+
+        Args:
+            kind (str): `cve_software` for CVE affected software pairs, key of `targets` for software assignments
+            pairs (iterable): `(cve_id, software_id)` or `(software_id, obj_id)` tuples
+
+        Returns:
+            int: number of created vulnerabilities
+        """
+        pairs = set(pairs)
+        if kind == "cve_software":
+            keys = self.get_cve_software_exposure_keys(pairs)
+            filters = {"cve_id__in": {cve_id for cve_id, _ in pairs}}
+        else:
+            keys = self.get_assignment_exposure_keys(kind, pairs)
+            filters = {f"{kind}_id__in": {obj_id for _, obj_id in pairs}}
+        if not keys:
+            return 0
+        existing_keys = self.get_existing_keys(software_id__in={key[1] for key in keys}, **filters)
+
+        return self.create_missing(keys, existing_keys)
+
+    def get_exposure_rollups(self, field_name, obj_ids):
+        """Return the exposure rollup values of the objects having open vulnerabilities.
+
+        Counts are numbers of distinct CVEs, vulnerabilities in one of `closed_statuses` are not open.
+
+        Args:
+            field_name (str): VulnerabilityLCM field of the objects, key of `targets`
+            obj_ids (list): pks of the objects
+
+        Returns:
+            dict: object pk => dict of VulnerabilityExposure field values
+        """
+        aggregates = {
+            count_field: Count("cve", distinct=True, filter=Q(cve__severity=severity))
+            for severity, count_field in VulnerabilityExposure.severity_fields.items()
+        }
+        queryset = VulnerabilityLCM.objects.filter(**{f"{field_name}_id__in": obj_ids}, cve__isnull=False)
+        if self.closed_statuses:
+            queryset = queryset.exclude(status__name__in=self.closed_statuses)
+
+        return {
+            values.pop("obj_id"): values
+            for values in queryset.values(obj_id=F(field_name))
+            .order_by()
+            .annotate(
+                **aggregates,
+                total_count=Count("cve", distinct=True),
+                max_cvss_v3=Max("cve__cvss_v3"),
+                oldest_published_date=Min("cve__published_date"),
+            )
+        }
+
+    def refresh_exposure(self, field_name, obj_ids):
+        """Recompute the VulnerabilityExposure rollups of the objects.
+
+        Rollups are created, updated when their values changed and deleted once an object has no open
+        vulnerabilities.
+
+        Args:
+            field_name (str): VulnerabilityLCM field of the objects, key of `targets`
+            obj_ids (iterable): pks of the objects
+
+        Returns:
+            int: number of created, updated or deleted rollups
+        """
+        obj_ids = list(obj_ids)
+        refreshed = 0
+        for offset in range(0, len(obj_ids), self.batch_size):
+            refreshed += self._refresh_exposure_batch(field_name, obj_ids[offset : offset + self.batch_size])
+
+        return refreshed
+
+    def _refresh_exposure_batch(self, field_name, obj_ids):
+        """Recompute the VulnerabilityExposure rollups of at most `batch_size` objects, see `refresh_exposure`."""
+        rollups = self.get_exposure_rollups(field_name, obj_ids)
+        existing = {
+            getattr(exposure, f"{field_name}_id"): exposure
+            for exposure in VulnerabilityExposure.objects.filter(**{f"{field_name}_id__in": obj_ids})
+        }
+        to_create, to_update = [], []
+        now = timezone.now()
+        for obj_id, values in rollups.items():
+            exposure = existing.get(obj_id)
+            if exposure is None:
+                to_create.append(VulnerabilityExposure(**{f"{field_name}_id": obj_id}, **values))
+            elif any(getattr(exposure, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(exposure, field, value)
+                exposure.last_updated = now
+                to_update.append(exposure)
+        VulnerabilityExposure.objects.bulk_create(to_create, batch_size=self.batch_size)
+        VulnerabilityExposure.objects.bulk_update(
+            to_update,
+            [
+                *VulnerabilityExposure.severity_fields.values(),
+                "total_count",
+                "max_cvss_v3",
+                "oldest_published_date",
+                "last_updated",
+            ],
+            batch_size=self.batch_size,
+        )
+        stale_ids = [exposure.pk for obj_id, exposure in existing.items() if obj_id not in rollups]
+        VulnerabilityExposure.objects.filter(pk__in=stale_ids).delete()
+
+        return len(to_create) + len(to_update) + len(stale_ids)
+
+    def refresh_changed(self):
+        """Refresh the VulnerabilityExposure rollups of the objects collected in `changed` and clear it.
+
+        Returns:
+            int: number of created, updated or deleted rollups
+        """
+        refreshed = 0
+        with self.timed("write"):
+            for field_name, obj_ids in self.changed.items():
+                refreshed += self.refresh_exposure(field_name, sorted(obj_ids))
+                obj_ids.clear()
+
+        return refreshed
+
+    def run(self, reconcile=False, resolved_status=None):
+        """Create missing vulnerabilities of all CVEs chunk by chunk, see `process`, and refresh the exposure rollups.
+
+        Returns:
+            dict: counts of processed CVEs, created, skipped, resolved and reopened vulnerabilities and refreshed
+                rollups
+        """
+        counts = {"processed": 0, "created": 0, "skipped": 0, "resolved": 0, "reopened": 0}
+        for cve_ids in self.iter_chunks():
+            for key, value in self.process(cve_ids, reconcile, resolved_status).items():
+                counts[key] += value
+            counts["processed"] += len(cve_ids)
+        counts["refreshed"] = self.refresh_changed()
+
+        return counts